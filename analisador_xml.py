@@ -0,0 +1,141 @@
+#####################################################################
+# Camada única de análise de XML usada por todos os módulos. O backend é
+# escolhido uma vez por processo:
+#
+#   lxml   - usado automaticamente quando instalado (o mais rápido); as
+#            consultas são objetos `etree.XPath` compilados e guardados em
+#            cache por expressão;
+#   etree  - `xml.etree.ElementTree` da biblioteca padrão (sem dependências);
+#   expat  - `xml.parsers.expat` com tratadores em Python, apenas para a
+#            leitura em fluxo (a árvore completa usa o ElementTree).
+#
+# A variável de ambiente LATTES_ANALISADOR força um backend ('lxml', 'etree'
+# ou 'expat'); o backend em uso é informado na saída de erros, fora da
+# saída dos relatórios. As expressões de consulta usam a sintaxe comum ao ElementPath
+# e ao XPath ('.//TAG', 'TAG', './/PAI/TAG', '[@ATRIBUTO="valor"]'), de modo
+# que os resultados são os mesmos em qualquer backend. Na leitura em fluxo,
+# `liberar` descarta cada elemento consumido, mantendo a memória constante
+# mesmo em currículos muito grandes.
+#####################################################################
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+BACKENDS = ('lxml', 'etree', 'expat')
+
+# Erros de XML malformado levantados por qualquer um dos backends
+ErroXML = (ET.ParseError, expat.ExpatError) + ((etree.XMLSyntaxError,) if etree is not None else ())
+
+# Tamanho dos blocos lidos pelo backend expat
+TAMANHO_BLOCO = 64 * 1024
+
+# Expressão -> etree.XPath compilado
+_consultas = {}
+
+# Função para escolher o backend: o pedido em LATTES_ANALISADOR ou o mais rápido disponível
+def _escolher_backend():
+    pedido = os.environ.get('LATTES_ANALISADOR', '').strip().lower()
+    if pedido in BACKENDS and (pedido != 'lxml' or etree is not None):
+        return pedido
+    return 'lxml' if etree is not None else 'etree'
+
+BACKEND = _escolher_backend()
+
+# Função para descrever o backend em uso
+def descrever_backend():
+    return f"Analisador XML: {BACKEND}"
+
+# Função para informar o backend em uso na saída de erros, sem alterar a saída dos scripts
+def exibir_backend():
+    print(descrever_backend(), file=sys.stderr)
+
+# Função para ler um arquivo XML inteiro (binário aberto ou caminho) e devolver a raiz
+def analisar(arquivo):
+    if BACKEND == 'lxml':
+        return etree.parse(arquivo, etree.XMLParser(huge_tree=True)).getroot()
+    return ET.parse(arquivo).getroot()
+
+# Função para percorrer um arquivo XML em fluxo, gerando (evento, elemento) como o iterparse
+def iterar_eventos(arquivo, eventos=('start', 'end')):
+    if BACKEND == 'lxml':
+        return etree.iterparse(arquivo, events=eventos, huge_tree=True)
+    if BACKEND == 'expat':
+        return _iterar_expat(arquivo, eventos)
+    return ET.iterparse(arquivo, events=eventos)
+
+# Função para descartar um elemento já consumido na leitura em fluxo: o conteúdo é apagado e o
+# elemento é retirado do pai, de modo que a árvore parcial não cresce com o tamanho do arquivo
+# (no backend expat os elementos não têm pai nem filhos)
+def liberar(elemento, pai=None):
+    elemento.clear()
+    if pai is not None and BACKEND != 'expat':
+        pai.remove(elemento)
+
+# Função para converter um nome do expat ('uri}nome') para o formato do ElementTree ('{uri}nome')
+def _nome_expat(nome):
+    return '{' + nome if '}' in nome else nome
+
+# Leitura em fluxo com o expat: cada elemento é um ET.Element sem filhos, com tag, atributos e texto
+def _iterar_expat(arquivo, eventos):
+    analisador = expat.ParserCreate(namespace_separator='}')
+    analisador.buffer_text = True
+    pendentes = []
+    pilha = []  # [elemento, partes do texto, texto ainda aberto]
+
+    def inicio(nome, atributos):
+        if pilha and pilha[-1][2]:
+            pai = pilha[-1]
+            pai[0].text = ''.join(pai[1]) if pai[1] else None
+            pai[2] = False
+        elemento = ET.Element(_nome_expat(nome), {_nome_expat(chave): valor for chave, valor in atributos.items()})
+        pilha.append([elemento, [], True])
+        if 'start' in eventos:
+            pendentes.append(('start', elemento))
+
+    def fim(nome):
+        elemento, partes, aberto = pilha.pop()
+        if aberto:
+            elemento.text = ''.join(partes) if partes else None
+        if 'end' in eventos:
+            pendentes.append(('end', elemento))
+
+    def texto(dados):
+        if pilha and pilha[-1][2]:
+            pilha[-1][1].append(dados)
+
+    analisador.StartElementHandler = inicio
+    analisador.EndElementHandler = fim
+    analisador.CharacterDataHandler = texto
+
+    while True:
+        bloco = arquivo.read(TAMANHO_BLOCO)
+        analisador.Parse(bloco, not bloco)
+        yield from pendentes
+        pendentes.clear()
+        if not bloco:
+            break
+
+# Função para obter a consulta compilada (lxml) de uma expressão
+def _consulta(expressao):
+    consulta = _consultas.get(expressao)
+    if consulta is None:
+        consulta = _consultas[expressao] = etree.XPath(expressao)
+    return consulta
+
+# Função para buscar todos os elementos de uma expressão a partir de um elemento
+def buscar(elemento, expressao):
+    if BACKEND == 'lxml':
+        return _consulta(expressao)(elemento)
+    return elemento.findall(expressao)
+
+# Função para buscar o primeiro elemento de uma expressão (None se não houver)
+def buscar_primeiro(elemento, expressao):
+    encontrados = buscar(elemento, expressao)
+    return encontrados[0] if encontrados else None
@@ -0,0 +1,193 @@
+#####################################################################
+# Armazém persistente (SQLite) das métricas extraídas de cada currículo.
+# Cada registro é identificado pelo NUMERO-IDENTIFICADOR do Lattes e pelo
+# hash do conteúdo do arquivo. A cada execução, apenas os arquivos novos ou
+# alterados são extraídos novamente; os demais são lidos do armazém. O hash
+# só é recalculado quando o tamanho ou a data de modificação do arquivo
+# (o CRC, para membros de ZIP) mudaram desde a execução anterior.
+#
+# O caminho do banco pode ser informado por parâmetro ou pela variável de
+# ambiente LATTES_ARMAZEM (padrão: metricas_lattes.sqlite na pasta atual).
+#####################################################################
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+from collections import Counter
+
+import cache_metricas
+from extrator_metricas import extrair_metricas, VERSAO_METRICAS
+from executor_corpus import listar_arquivos_xml, processar_em_paralelo
+from fontes_xml import abrir_xml, estado_xml
+from analisador_xml import ErroXML, exibir_backend
+from perfil_execucao import medir
+
+ARMAZEM_PADRAO = 'metricas_lattes.sqlite'
+
+# Função para abrir (e criar, se necessário) o banco do armazém
+def abrir_armazem(caminho_armazem=None):
+    conexao = sqlite3.connect(caminho_armazem or os.environ.get('LATTES_ARMAZEM', ARMAZEM_PADRAO))
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS metricas (
+            identificador TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            versao INTEGER NOT NULL,
+            caminho TEXT NOT NULL,
+            metricas TEXT NOT NULL,
+            PRIMARY KEY (identificador, hash)
+        )''')
+    conexao.execute('CREATE INDEX IF NOT EXISTS idx_metricas_hash ON metricas (hash)')
+    conexao.execute('CREATE INDEX IF NOT EXISTS idx_metricas_caminho ON metricas (caminho)')
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS arquivos (
+            caminho TEXT PRIMARY KEY,
+            tamanho INTEGER NOT NULL,
+            estado TEXT NOT NULL,
+            hash TEXT NOT NULL,
+            identificador TEXT
+        )''')
+    return conexao
+
+# Função para calcular o hash do conteúdo de um arquivo
+@medir('hash')
+def calcular_hash(caminho):
+    resumo = hashlib.blake2b(digest_size=20)
+    with abrir_xml(caminho) as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b''):
+            resumo.update(bloco)
+    return resumo.hexdigest()
+
+# Função para obter o estado (tamanho, versão em texto) de um arquivo, comparado com o registrado no armazém
+def _estado(caminho):
+    tamanho, versao = estado_xml(caminho)
+    return tamanho, json.dumps(versao)
+
+# Função para converter as métricas em texto JSON
+def serializar_metricas(metricas):
+    return json.dumps({
+        'identificador': metricas['identificador'],
+        'data_atualizacao': metricas['data_atualizacao'],
+        'nome_completo': metricas['nome_completo'],
+        'nomes_citacao': metricas['nomes_citacao'],
+        'tags': metricas['tags'],
+        'caminhos': [[pai, tag, quantidade] for (pai, tag), quantidade in metricas['caminhos'].items()],
+        'naturezas': [[tag, natureza, quantidade] for (tag, natureza), quantidade in metricas['naturezas'].items()],
+        'anos': [[tag, natureza, ano, quantidade] for (tag, natureza, ano), quantidade in metricas['anos'].items()],
+        'disciplinas': list(metricas['disciplinas']),
+        'artigos': metricas['artigos'],
+        'areas': metricas['areas'],
+        'areas_atuacao': metricas['areas_atuacao'],
+        'eventos_por_ano': metricas['eventos_por_ano'],
+        'eventos_sem_dados': metricas['eventos_sem_dados']
+    }, ensure_ascii=False)
+
+# Função para reconstruir uma área (tupla de nomes internados) a partir da lista JSON
+def _area(valores):
+    return tuple(None if valor is None else sys.intern(valor) for valor in valores)
+
+# Função para reconstruir as métricas a partir do texto JSON
+def desserializar_metricas(texto):
+    dados = json.loads(texto)
+    dados['tags'] = Counter(dados['tags'])
+    dados['caminhos'] = Counter({(pai, tag): quantidade for pai, tag, quantidade in dados['caminhos']})
+    dados['naturezas'] = Counter({(tag, natureza): quantidade for tag, natureza, quantidade in dados['naturezas']})
+    dados['anos'] = Counter({(tag, natureza, ano): quantidade for tag, natureza, ano, quantidade in dados['anos']})
+    dados['disciplinas'] = set(dados['disciplinas'])
+    dados['areas'] = {secao: [_area(area) for area in areas] for secao, areas in dados['areas'].items()}
+    dados['areas_atuacao'] = [_area(area) for area in dados['areas_atuacao']]
+    return dados
+
+# Função para extrair as métricas de um arquivo, sem interromper o lote em caso de XML inválido
+def _extrair(caminho):
+    try:
+        return extrair_metricas(caminho)
+    except ErroXML:
+        print(f"Erro ao parsear o arquivo: {caminho}")
+        return None
+
+# Função para obter as métricas de todos os arquivos de uma pasta, extraindo apenas os novos ou alterados
+@medir('armazem')
+def carregar_metricas(diretorio, caminho_armazem=None, processos=None, recursivo=False):
+    return carregar_metricas_arquivos(listar_arquivos_xml(diretorio, recursivo), caminho_armazem, processos)
+
+# Função para obter as métricas de uma lista de arquivos [(caminho, tamanho)], extraindo apenas os novos ou alterados
+@medir('armazem')
+def carregar_metricas_arquivos(arquivos, caminho_armazem=None, processos=None):
+    conexao = abrir_armazem(caminho_armazem)
+
+    # O hash registrado é reaproveitado quando o tamanho e a data de modificação não mudaram
+    estados = {caminho: _estado(caminho) for caminho, _ in arquivos}
+    hashes = {}
+    identificadores = {}
+    sem_hash = []
+    for caminho, tamanho in arquivos:
+        linha = conexao.execute(
+            'SELECT tamanho, estado, hash, identificador FROM arquivos WHERE caminho = ?', (caminho,)).fetchone()
+        if linha and (linha[0], linha[1]) == estados[caminho]:
+            hashes[caminho] = linha[2]
+            identificadores[caminho] = linha[3]
+        else:
+            sem_hash.append((caminho, tamanho))
+    hashes.update(processar_em_paralelo(calcular_hash, sem_hash, processos))
+
+    armazenadas = {}
+    pendentes = []
+    for caminho, tamanho in arquivos:
+        if caminho in identificadores:
+            linha = conexao.execute(
+                'SELECT metricas FROM metricas WHERE identificador = ? AND hash = ? AND versao = ?',
+                (identificadores[caminho], hashes[caminho], VERSAO_METRICAS)).fetchone()
+        else:
+            linha = conexao.execute(
+                'SELECT metricas FROM metricas WHERE hash = ? AND versao = ?',
+                (hashes[caminho], VERSAO_METRICAS)).fetchone()
+        if linha:
+            armazenadas[caminho] = desserializar_metricas(linha[0])
+        else:
+            pendentes.append((caminho, tamanho))
+
+    extraidas = dict(processar_em_paralelo(_extrair, pendentes, processos))
+
+    with conexao:
+        for caminho, metricas in extraidas.items():
+            if metricas is None:
+                continue
+            # Versões anteriores deste arquivo deixam de ser válidas (outros arquivos com o mesmo
+            # identificador são mantidos)
+            conexao.execute('DELETE FROM metricas WHERE caminho = ?', (caminho,))
+            conexao.execute(
+                'INSERT OR REPLACE INTO metricas (identificador, hash, versao, caminho, metricas) VALUES (?, ?, ?, ?, ?)',
+                (metricas['identificador'], hashes[caminho], VERSAO_METRICAS, caminho, serializar_metricas(metricas)))
+        for caminho, _ in arquivos:
+            metricas = armazenadas.get(caminho) or extraidas.get(caminho)
+            if metricas is None:
+                continue
+            tamanho, estado = estados[caminho]
+            conexao.execute(
+                'INSERT OR REPLACE INTO arquivos (caminho, tamanho, estado, hash, identificador) VALUES (?, ?, ?, ?, ?)',
+                (caminho, tamanho, estado, hashes[caminho], metricas['identificador']))
+    conexao.close()
+
+    metricas_por_arquivo = {}
+    for caminho, tamanho in arquivos:
+        metricas = armazenadas.get(caminho) or extraidas.get(caminho)
+        metricas_por_arquivo[caminho] = metricas
+        if metricas is not None:
+            cache_metricas.registrar_metricas(caminho, metricas)
+
+    estatisticas = {
+        'arquivos': len(arquivos),
+        'acertos': len(armazenadas),
+        'extraidos': len(pendentes),
+        'hashes': len(sem_hash)
+    }
+    return metricas_por_arquivo, estatisticas
+
+# Função para exibir quantos arquivos foram reaproveitados do armazém
+def exibir_estatisticas(estatisticas):
+    print(f"Arquivos reaproveitados do armazém: {estatisticas['acertos']} de {estatisticas['arquivos']}")
+    print(f"Arquivos extraídos novamente: {estatisticas['extraidos']}")
+    print(f"Arquivos com hash recalculado: {estatisticas['hashes']}")
+    exibir_backend()
@@ -0,0 +1,237 @@
+#####################################################################
+# Benchmark dos scripts do repositório sobre corpora sintéticos (ver
+# gerador_corpus.py) de 100, 10 mil e 100 mil currículos. Cada script é
+# executado como programa principal, em um processo próprio, com a pasta
+# fixa do código (C:\Users\radim\Desktop\ppgmmc) e o currículo de
+# referência substituídos pelo corpus gerado; a saída no terminal é
+# descartada. Para cada script são medidos o tempo total, a vazão
+# (currículos/s e MB/s) e a memória residente (RSS): o pico da soma do
+# processo e de seus subprocessos, amostrada durante a execução (apenas
+# onde há /proc), e o pico do maior processo isolado (wait4).
+#
+# Cada script roda "frio", com um armazém de métricas vazio, e, se essa
+# execução usou o armazém, também "quente", reaproveitando-o. Os resultados
+# são gravados em JSON (benchmark_resultados.json) e exibidos em tabela.
+#
+# Uso: python benchmark_corpus.py [tamanhos...]
+#####################################################################
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+
+from gerador_corpus import gerar_corpus, nome_arquivo
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+TAMANHOS_PADRAO = (100, 10000, 100000)
+
+# Currículos gigantes gerados a cada mil currículos do corpus (pelo menos um)
+GIGANTES_POR_MIL = 1
+
+# Intervalo entre as amostras de RSS do processo medido e de seus subprocessos (segundos)
+INTERVALO_AMOSTRAGEM = 0.05
+
+# Scripts medidos, relativos à raiz do repositório
+ENTRADAS = (
+    'relatorio_agrupado.py',
+    'numero_eventos.py',
+    'guidance_score/p_engajamento.py',
+    'guidance_score/p_experiencia.py',
+    'guidance_score/p_producao.py',
+    'guidance_score/p_qualidade.py',
+    'guidance_score/p_reputacao.py',
+    'guidance_score/p_similar.py',
+    'guidance_score/pontuacao_geral.py',
+    'relatorios_pdf.py',
+    'grafo_coautoria.py',
+    'guidance_score/ranking_pesos.py',
+    'guidance_score/sensibilidade_pesos.py',
+    'extract_area/areas_formacao.py',
+    'extract_area/areas_linhas.py',
+    'extract_area/areas_percentual.py',
+    'extract_area/areas_todo_lattes.py'
+)
+
+# Caminhos fixos no código dos scripts: a pasta dos currículos e o currículo de referência
+_PASTA_FIXA = re.compile(r"""r?(['"])C:\\{1,2}Users\\{1,2}radim\\{1,2}Desktop\\{1,2}ppgmmc\1""")
+_REFERENCIA_FIXA = re.compile(r"""r?(['"])C:\\{1,2}Users\\{1,2}radim\\{1,2}Desktop\\{1,2}[^'"]*\.xml\1""")
+
+# Referências a __file__ no código dos scripts
+_ARQUIVO_DO_SCRIPT = re.compile(r'\b__file__\b')
+
+# Linhas inseridas no início da cópia de cada script: a pasta do original entra no sys.path (para os imports
+# de módulos vizinhos) e o tempo de execução é gravado ao final do programa principal (apenas no processo
+# principal; sob spawn, os processos do pool importam a cópia como __mp_main__)
+_MEDICAO = ("import sys as _sys; _sys.path.insert(1, {pasta!r})\n"
+            "if __name__ == '__main__': import atexit as _atexit, json as _json, time as _time; "
+            "_inicio_benchmark = _time.perf_counter(); "
+            "_atexit.register(lambda: open({caminho!r}, 'w', encoding='utf-8').write("
+            "_json.dumps({{'segundos': _time.perf_counter() - _inicio_benchmark}})))\n")
+
+# Função para gravar uma cópia do script com os caminhos fixos substituídos na pasta de execução (fora do
+# repositório); as referências a __file__ passam a ser o caminho do original, para que os caminhos relativos
+# a ele continuem válidos. Executada como arquivo, as funções do script são atributos do módulo __main__ e
+# podem ser enviadas aos processos do pool
+def preparar_entrada(script, pasta, referencia, caminho_saida, diretorio_execucao):
+    caminho = os.path.join(RAIZ, script)
+    with open(caminho, encoding='utf-8') as arquivo:
+        codigo = arquivo.read()
+    codigo = _PASTA_FIXA.sub(lambda _: repr(pasta), codigo)
+    codigo = _REFERENCIA_FIXA.sub(lambda _: repr(referencia), codigo)
+    codigo = _ARQUIVO_DO_SCRIPT.sub(lambda _: repr(caminho), codigo)
+
+    caminho_copia = os.path.join(diretorio_execucao, f"_benchmark_{os.path.basename(caminho)}")
+    with open(caminho_copia, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(_MEDICAO.format(pasta=os.path.dirname(caminho), caminho=caminho_saida) + codigo)
+    return caminho_copia
+
+# Função para obter a soma do RSS (bytes) de um processo e de seus descendentes, lida de /proc (None sem /proc)
+def rss_arvore(pid):
+    if not os.path.isdir('/proc'):
+        return None
+    filhos = {}
+    for entrada in os.listdir('/proc'):
+        if entrada.isdigit():
+            try:
+                with open(f'/proc/{entrada}/stat', encoding='ascii', errors='replace') as arquivo:
+                    # O nome do processo pode conter espaços: os campos seguem o último ')'
+                    pai = int(arquivo.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            filhos.setdefault(pai, []).append(int(entrada))
+
+    total = 0
+    pendentes = [pid]
+    while pendentes:
+        atual = pendentes.pop()
+        pendentes.extend(filhos.get(atual, ()))
+        try:
+            with open(f'/proc/{atual}/statm', encoding='ascii') as arquivo:
+                total += int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+# Função para aguardar o processo medido amostrando o RSS da árvore de processos: devolve o código de saída
+# (None se o tempo limite foi atingido), o pico do RSS somado e o pico do maior processo isolado (bytes)
+def aguardar_processo(processo, tempo_limite=None):
+    inicio = time.perf_counter()
+    pico_total = None
+    while True:
+        if hasattr(os, 'wait4'):
+            # wait4 devolve o maior pico de RSS entre o processo e os subprocessos que ele aguardou
+            pid, status, uso = os.wait4(processo.pid, os.WNOHANG)
+            if pid:
+                processo.returncode = os.waitstatus_to_exitcode(status)
+                # ru_maxrss em bytes no macOS e em KB nos demais sistemas
+                return processo.returncode, pico_total, uso.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+        elif processo.poll() is not None:
+            return processo.returncode, pico_total, None
+
+        rss = rss_arvore(processo.pid)
+        if rss is not None:
+            pico_total = max(pico_total or 0, rss)
+        if tempo_limite is not None and time.perf_counter() - inicio > tempo_limite:
+            processo.kill()
+            processo.wait()
+            return None, pico_total, None
+        time.sleep(INTERVALO_AMOSTRAGEM)
+
+# Função para medir um script em um processo separado: tempo, código de saída e picos de RSS (MB)
+def medir_entrada(script, pasta, referencia, diretorio_execucao, caminho_armazem, tempo_limite=None):
+    caminho_saida = os.path.join(diretorio_execucao, 'medicao.json')
+    caminho_erros = os.path.join(diretorio_execucao, 'erros.txt')
+    if os.path.exists(caminho_saida):
+        os.remove(caminho_saida)
+
+    ambiente = dict(os.environ, LATTES_ARMAZEM=caminho_armazem)
+    caminho_copia = preparar_entrada(script, pasta, referencia, caminho_saida, diretorio_execucao)
+    try:
+        inicio = time.perf_counter()
+        with open(caminho_erros, 'w', encoding='utf-8') as erros:
+            processo = subprocess.Popen([sys.executable, caminho_copia], cwd=diretorio_execucao, env=ambiente,
+                                        stdout=subprocess.DEVNULL, stderr=erros)
+            codigo_saida, pico_total, pico_maior = aguardar_processo(processo, tempo_limite)
+        total = time.perf_counter() - inicio
+    finally:
+        os.remove(caminho_copia)
+
+    segundos = total
+    if codigo_saida == 0 and os.path.exists(caminho_saida):
+        with open(caminho_saida, encoding='utf-8') as arquivo:
+            segundos = json.load(arquivo)['segundos']
+    with open(caminho_erros, encoding='utf-8', errors='replace') as arquivo:
+        erro = arquivo.read().strip().splitlines()[-1:] if codigo_saida != 0 else []
+
+    return {
+        'segundos': segundos,
+        'segundos_processo': total,
+        'codigo_saida': codigo_saida,
+        'erro': erro[0] if erro else None,
+        'pico_rss_mb': None if pico_total is None else pico_total / (1024 * 1024),
+        'pico_rss_maior_processo_mb': None if pico_maior is None else pico_maior / (1024 * 1024)
+    }
+
+# Função para medir todos os scripts sobre um corpus de um tamanho
+def medir_tamanho(tamanho, pasta_base, entradas=ENTRADAS, processos=None, tempo_limite=None, quente=True):
+    pasta = os.path.join(pasta_base, f"n{tamanho:06d}")
+    manifesto = gerar_corpus(pasta, tamanho, gigantes=max(1, tamanho * GIGANTES_POR_MIL // 1000), processos=processos)
+    referencia = os.path.join(os.path.abspath(pasta), nome_arquivo(0))
+    megabytes = manifesto['bytes'] / 1e6
+
+    resultados = []
+    for script in entradas:
+        diretorio_execucao = tempfile.mkdtemp(prefix='benchmark_lattes_')
+        caminho_armazem = os.path.join(diretorio_execucao, 'metricas_lattes.sqlite')
+        try:
+            for modo in (('frio', 'quente') if quente else ('frio',)):
+                # Sem armazém gravado na execução fria, a quente repetiria a mesma medição
+                if modo == 'quente' and not os.path.exists(caminho_armazem):
+                    break
+                medicao = medir_entrada(script, os.path.abspath(pasta), referencia,
+                                        diretorio_execucao, caminho_armazem, tempo_limite)
+                medicao.update({
+                    'tamanho': tamanho,
+                    'entrada': script,
+                    'modo': modo,
+                    'megabytes': megabytes,
+                    'curriculos_por_segundo': tamanho / medicao['segundos'] if medicao['segundos'] else None,
+                    'mb_por_segundo': megabytes / medicao['segundos'] if medicao['segundos'] else None
+                })
+                resultados.append(medicao)
+                exibir_medicao(medicao)
+        finally:
+            shutil.rmtree(diretorio_execucao, ignore_errors=True)
+    return resultados
+
+def exibir_medicao(medicao):
+    if medicao['codigo_saida'] != 0:
+        situacao = f"falhou ({medicao['codigo_saida']}): {medicao['erro']}"
+    else:
+        rss = 'n/d' if medicao['pico_rss_mb'] is None else f"{medicao['pico_rss_mb']:.0f} MB"
+        maior = 'n/d' if medicao['pico_rss_maior_processo_mb'] is None else f"{medicao['pico_rss_maior_processo_mb']:.0f} MB"
+        situacao = (f"{medicao['segundos']:9.2f} s  {medicao['curriculos_por_segundo']:10.1f} CV/s  "
+                    f"{medicao['mb_por_segundo']:7.1f} MB/s  RSS total {rss} (maior processo {maior})")
+    print(f"{medicao['tamanho']:>7} {medicao['entrada']:<36} {medicao['modo']:<7} {situacao}")
+
+def main(tamanhos=TAMANHOS_PADRAO, pasta_base='corpus_benchmark', caminho_resultados='benchmark_resultados.json',
+         processos=None, tempo_limite=None):
+    resultados = []
+    for tamanho in tamanhos:
+        print(f"Corpus de {tamanho} currículos")
+        print("=" * 50)
+        resultados.extend(medir_tamanho(tamanho, pasta_base, processos=processos, tempo_limite=tempo_limite))
+        print()
+
+    with open(caminho_resultados, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {caminho_resultados}")
+
+if __name__ == "__main__":
+    main(tuple(int(tamanho) for tamanho in sys.argv[1:]) or TAMANHOS_PADRAO)
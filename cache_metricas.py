@@ -0,0 +1,47 @@
+#####################################################################
+# Cache de métricas por documento, compartilhado pelos critérios de
+# `guidance_score`. Cada arquivo XML é lido uma única vez por processo: a
+# chave é o caminho absoluto, o tamanho e a data de modificação do arquivo
+# (ou o CRC do membro, para currículos dentro de ZIP), de modo que um
+# currículo alterado em disco é lido novamente.
+#####################################################################
+
+import os
+from extrator_metricas import extrair_metricas
+from fontes_xml import estado_xml
+
+# Caminho absoluto -> (tamanho, versão, métricas)
+_documentos = {}
+
+# Contadores de leituras do disco e de acertos no cache
+estatisticas = {
+    'leituras': 0,
+    'acertos': 0
+}
+
+# Função para obter as métricas de um arquivo XML, lendo-o apenas se necessário
+def obter_metricas(xml_file):
+    caminho = os.path.abspath(xml_file)
+    tamanho, versao = estado_xml(caminho)
+
+    entrada = _documentos.get(caminho)
+    if entrada is not None and entrada[0] == tamanho and entrada[1] == versao:
+        estatisticas['acertos'] += 1
+        return entrada[2]
+
+    metricas = extrair_metricas(caminho)
+    estatisticas['leituras'] += 1
+    _documentos[caminho] = (tamanho, versao, metricas)
+    return metricas
+
+# Função para registrar métricas já obtidas por outro meio (por exemplo, do armazém persistente)
+def registrar_metricas(xml_file, metricas):
+    caminho = os.path.abspath(xml_file)
+    tamanho, versao = estado_xml(caminho)
+    _documentos[caminho] = (tamanho, versao, metricas)
+
+# Função para esvaziar o cache (por exemplo, entre pastas diferentes)
+def limpar_cache():
+    _documentos.clear()
+    estatisticas['leituras'] = 0
+    estatisticas['acertos'] = 0
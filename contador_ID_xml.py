@@ -1,11 +1,176 @@
+#####################################################################
+# Contagem e conferência da lista de IDs Lattes (por exemplo, R358737.csv)
+# com os currículos em disco. A lista é lida em fluxo, linha a linha, e os
+# IDs são guardados como inteiros de 64 bits em um array NumPy, de modo que
+# a memória usada é de 8 bytes por ID (e não de uma lista de linhas do CSV).
+#
+# Dos currículos, apenas o início do arquivo é lido: NUMERO-IDENTIFICADOR e
+# DATA-ATUALIZACAO são atributos da raiz CURRICULO-VITAE, no cabeçalho do
+# XML. O relatório indica os IDs sem currículo (ausentes), os currículos sem
+# ID na lista (extras) e os currículos desatualizados: a data do XML é
+# anterior à data da lista (segunda coluna do CSV, quando existir) ou à
+# data limite informada.
+#####################################################################
+
+import re
 import csv
+import numpy as np
+from array import array
+
+from executor_corpus import listar_arquivos_xml, processar_em_paralelo
+from fontes_xml import abrir_xml
+
+# Quantidade máxima de bytes lidos do início de cada XML até encontrar a raiz
+LIMITE_CABECALHO = 64 * 1024
+
+_RAIZ = re.compile(rb'<CURRICULO-VITAE\b[^>]*>')
+_IDENTIFICADOR = re.compile(rb'NUMERO-IDENTIFICADOR="(\d+)"')
+_DATA = re.compile(rb'DATA-ATUALIZACAO="(\d{8})"')
 
 def count_lattes_ids(file_path):
     with open(file_path, 'r') as file:
         reader = csv.reader(file)
-        ids = list(reader)
-        return len(ids)
+        # As linhas são contadas em fluxo, sem guardar a lista inteira
+        return sum(1 for _ in reader)
+
+# Função para converter uma data DDMMAAAA (ou DD/MM/AAAA) em um inteiro AAAAMMDD comparável
+def converter_data(texto):
+    digitos = texto.replace('/', '').replace('-', '').strip()
+    if len(digitos) != 8 or not digitos.isdigit():
+        return 0
+    return int(digitos[4:] + digitos[2:4] + digitos[:2])
+
+# Função para ler a lista de IDs em fluxo: (ids únicos ordenados, datas da lista, estatísticas)
+def ler_manifesto(file_path):
+    ids = array('q')
+    datas = array('q')
+    linhas = 0
+    invalidas = 0
+
+    with open(file_path, 'r', newline='') as file:
+        for linha in csv.reader(file):
+            linhas += 1
+            texto = linha[0].strip() if linha else ''
+            if not texto.isdigit():
+                # Cabeçalho, linha vazia ou ID inválido
+                invalidas += 1
+                continue
+            ids.append(int(texto))
+            datas.append(converter_data(linha[1]) if len(linha) > 1 else 0)
+
+    ids = np.frombuffer(ids, dtype=np.int64)
+    datas = np.frombuffer(datas, dtype=np.int64)
+
+    # Ordenação por (id, data): a última ocorrência de cada id tem a data mais recente
+    ordem = np.lexsort((datas, ids))
+    ids, datas = ids[ordem], datas[ordem]
+    ultimos = np.append(ids[1:] != ids[:-1], True) if len(ids) else np.zeros(0, dtype=bool)
+
+    estatisticas = {
+        'linhas': linhas,
+        'invalidas': invalidas,
+        'ids': len(ids),
+        'unicos': int(ultimos.sum()),
+        'duplicados': len(ids) - int(ultimos.sum())
+    }
+    return ids[ultimos], datas[ultimos], estatisticas
+
+# Função para ler NUMERO-IDENTIFICADOR e DATA-ATUALIZACAO do cabeçalho de um currículo
+def ler_cabecalho(xml_file):
+    with abrir_xml(xml_file) as arquivo:
+        inicio = b''
+        while len(inicio) < LIMITE_CABECALHO:
+            bloco = arquivo.read(4096)
+            if not bloco:
+                break
+            inicio += bloco
+            raiz = _RAIZ.search(inicio)
+            if raiz:
+                identificador = _IDENTIFICADOR.search(raiz.group())
+                data = _DATA.search(raiz.group())
+                return (int(identificador.group(1)) if identificador else None,
+                        converter_data(data.group(1).decode()) if data else 0)
+    return None, 0
+
+# Função para conferir a lista de IDs com os currículos de uma pasta
+def conferir_manifesto(file_path, diretorio, data_limite=None, processos=None, recursivo=True):
+    ids, datas_lista, estatisticas = ler_manifesto(file_path)
+
+    cabecalhos = processar_em_paralelo(ler_cabecalho, listar_arquivos_xml(diretorio, recursivo), processos)
+    sem_identificador = [caminho for caminho, (identificador, _) in cabecalhos if identificador is None]
+    cabecalhos = [(caminho, identificador, data) for caminho, (identificador, data) in cabecalhos if identificador is not None]
+
+    ids_xml = np.array([identificador for _, identificador, _ in cabecalhos], dtype=np.int64)
+    datas_xml = np.array([data for _, _, data in cabecalhos], dtype=np.int64)
+
+    # Junção pela busca binária de cada currículo na lista ordenada
+    posicoes = np.searchsorted(ids, ids_xml)
+    na_lista = posicoes < len(ids)
+    na_lista[na_lista] = ids[posicoes[na_lista]] == ids_xml[na_lista]
+
+    presentes = np.zeros(len(ids), dtype=bool)
+    presentes[posicoes[na_lista]] = True
+
+    # Desatualizado: data do XML anterior à data da lista ou à data limite
+    referencia = np.zeros(len(ids_xml), dtype=np.int64)
+    referencia[na_lista] = datas_lista[posicoes[na_lista]]
+    if data_limite:
+        referencia = np.maximum(referencia, converter_data(data_limite))
+    desatualizados = na_lista & (datas_xml < referencia)
+
+    estatisticas.update({
+        'curriculos': len(cabecalhos) + len(sem_identificador),
+        'sem_identificador': len(sem_identificador),
+        'encontrados': int(presentes.sum())
+    })
+    return {
+        'ausentes': ids[~presentes],
+        'extras': [cabecalhos[i][:2] for i in np.flatnonzero(~na_lista)],
+        'desatualizados': [cabecalhos[i] for i in np.flatnonzero(desatualizados)],
+        'sem_identificador': sem_identificador,
+        'estatisticas': estatisticas
+    }
+
+# Função para gravar o relatório completo em CSV (situacao, id, caminho, data do XML)
+def gravar_relatorio(resultado, caminho_relatorio):
+    with open(caminho_relatorio, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['situacao', 'id', 'caminho', 'data_atualizacao'])
+        for identificador in resultado['ausentes']:
+            writer.writerow(['ausente', int(identificador), '', ''])
+        for caminho, identificador in resultado['extras']:
+            writer.writerow(['extra', identificador, caminho, ''])
+        for caminho, identificador, data in resultado['desatualizados']:
+            writer.writerow(['desatualizado', identificador, caminho, data])
+        for caminho in resultado['sem_identificador']:
+            writer.writerow(['sem_identificador', '', caminho, ''])
+
+def exibir_relatorio(resultado, exemplos=10):
+    estatisticas = resultado['estatisticas']
+    print(f"Linhas na lista de IDs: {estatisticas['linhas']} ({estatisticas['invalidas']} inválidas)")
+    print(f"IDs únicos: {estatisticas['unicos']} ({estatisticas['duplicados']} duplicados)")
+    print(f"Currículos na pasta: {estatisticas['curriculos']} ({estatisticas['sem_identificador']} sem NUMERO-IDENTIFICADOR)")
+    print(f"IDs com currículo: {estatisticas['encontrados']}")
+    print(f"IDs sem currículo (ausentes): {len(resultado['ausentes'])}")
+    for identificador in resultado['ausentes'][:exemplos]:
+        print(f"  - {identificador}")
+    print(f"Currículos fora da lista (extras): {len(resultado['extras'])}")
+    for caminho, identificador in resultado['extras'][:exemplos]:
+        print(f"  - {identificador}: {caminho}")
+    print(f"Currículos desatualizados: {len(resultado['desatualizados'])}")
+    for caminho, identificador, data in resultado['desatualizados'][:exemplos]:
+        print(f"  - {identificador} ({data}): {caminho}")
+
+def main(data_limite=None, caminho_relatorio=None, processos=None):
+    file_path = r'C:\Users\radim\Desktop\R358737.csv'  # caminho do arquivo de IDs
+    diretorio = r'C:\Users\radim\Desktop\ppgmmc'      # pasta com os currículos (XML ou ZIP)
+    total_ids = count_lattes_ids(file_path)
+    print(f"Total de currículos Lattes cadastrados: {total_ids}")
+
+    resultado = conferir_manifesto(file_path, diretorio, data_limite, processos)
+    exibir_relatorio(resultado)
+    if caminho_relatorio:
+        gravar_relatorio(resultado, caminho_relatorio)
 
-file_path = r'C:\Users\radim\Desktop\R358737.csv'  # caminho do arquivo de IDs
-total_ids = count_lattes_ids(file_path)
-print(f"Total de currículos Lattes cadastrados: {total_ids}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#####################################################################
+# Contagem de tags em nível de bytes, sem construir objetos XML. Muitas
+# métricas apenas contam tags (os itens do relatório agrupado, as bancas,
+# as ORIENTACOES-CONCLUIDAS-PARA-*, as atividades de pesquisa e extensão do
+# engajamento); para elas o arquivo é mapeado em memória (mmap) e as
+# aberturas de tag são contadas com uma única expressão regular
+# (b'<(TAG1|TAG2|...)[\s/>]'), o que é bem mais rápido que o analisador.
+#
+# Uma contagem de caminho (PAI, TAG) só é feita em bytes quando o XSD
+# declara PAI como o único pai possível de TAG. As contagens por NATUREZA
+# (orientações) também são feitas em bytes: a abertura dessas tags é
+# reconhecida com os seus atributos, e o valor de NATUREZA é decodificado
+# com a codificação declarada no documento. Os textos das disciplinas
+# (ATIVIDADES-DE-ENSINO/ENSINO/DISCIPLINA, caminho único no XSD) são lidos
+# da mesma forma, quando o conteúdo de cada DISCIPLINA é apenas texto.
+# Outras métricas que dependem de texto precisam do analisador completo:
+# as tags correspondentes são informadas em `exigem_analisador` e, se
+# alguma delas aparecer no arquivo (ou se uma DISCIPLINA tiver conteúdo
+# que não seja apenas texto), as métricas completas do extrator são
+# usadas no lugar da contagem em bytes.
+#
+# Os currículos exportados pelo Lattes não têm comentários nem seções
+# CDATA; em XML editado à mão, uma tag dentro de um comentário também
+# seria contada. A contagem em bytes não valida o documento: apenas um
+# arquivo vazio ou truncado (sem o fechamento da raiz) é recusado, como
+# erro de análise; outros erros de XML passam despercebidos (use
+# LATTES_VERIFICAR_CONTAGEM=1 para conferir com o analisador).
+#
+# LATTES_CONTAGEM=bytes liga o modo nos scripts; LATTES_VERIFICAR_CONTAGEM=1
+# confere cada contagem em bytes com a do analisador completo, exibindo as
+# divergências (e usando, nesse caso, as contagens do analisador).
+#####################################################################
+
+import os
+import re
+import mmap
+import html
+from collections import Counter
+from xml.etree.ElementTree import ParseError
+
+from fontes_xml import abrir_xml, separar_caminho
+from cache_metricas import obter_metricas
+from perfil_execucao import etapa
+
+# Com LATTES_CONTAGEM=bytes, os scripts usam a contagem em bytes nas métricas que apenas contam tags
+CONTAGEM_EM_BYTES = os.environ.get('LATTES_CONTAGEM', '').strip().lower() == 'bytes'
+
+# Com LATTES_VERIFICAR_CONTAGEM=1, cada contagem em bytes é conferida com a do analisador completo
+VERIFICAR_CONTAGEM = os.environ.get('LATTES_VERIFICAR_CONTAGEM', '').strip() == '1'
+
+# Tag raiz, que não entra nas contagens do extrator (apenas as tags abaixo da raiz)
+RAIZ = 'CURRICULO-VITAE'
+
+# Tupla ordenada de tags -> expressão regular compilada
+_padroes = {}
+_padroes_atributos = {}
+
+# Atributos de uma abertura de tag (os valores podem conter '>')
+_ATRIBUTOS = rb'((?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*)'
+
+# Atributo NATUREZA dentro dos atributos de uma tag
+_NATUREZA = re.compile(rb'(?:^|\s)NATUREZA\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+# Codificação declarada no prólogo do documento
+_CODIFICACAO = re.compile(rb'^\s*<\?xml[^>]*\bencoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+
+# Caminho dos textos de disciplinas das métricas do extrator
+CAMINHO_DISCIPLINA = ('ATIVIDADES-DE-ENSINO', 'ENSINO', 'DISCIPLINA')
+
+# DISCIPLINA vazia ou com conteúdo apenas de texto
+_DISCIPLINA = re.compile(rb'<DISCIPLINA' + _ATRIBUTOS + rb'\s*(?:/>|>([^<]*)</DISCIPLINA\s*>)')
+
+# Fechamento da raiz, exigido no fim do documento
+_FIM_DOCUMENTO = b'</' + RAIZ.encode('ascii') + b'>'
+
+# Tag -> conjunto dos pais declarados no XSD (lido na primeira consulta)
+_pais = {}
+
+# Função para obter a expressão que reconhece a abertura de qualquer uma das tags
+def _padrao(tags):
+    chave = tuple(sorted(tags))
+    padrao = _padroes.get(chave)
+    if padrao is None:
+        nomes = b'|'.join(re.escape(tag.encode('ascii')) for tag in chave)
+        padrao = _padroes[chave] = re.compile(rb'<(' + nomes + rb')[\s/>]')
+    return padrao
+
+# Função para obter a expressão que reconhece a abertura das tags com os seus atributos
+def _padrao_atributos(tags):
+    chave = tuple(sorted(tags))
+    padrao = _padroes_atributos.get(chave)
+    if padrao is None:
+        nomes = b'|'.join(re.escape(tag.encode('ascii')) for tag in chave)
+        padrao = _padroes_atributos[chave] = re.compile(rb'<(' + nomes + rb')' + _ATRIBUTOS + rb'\s*/?>')
+    return padrao
+
+# Função para obter o único pai de uma tag declarado no XSD (None se houver mais de um)
+def pai_unico(tag):
+    if not _pais:
+        from import_tags_xml import ler_esquema
+        for nome, elemento in ler_esquema().items():
+            for filho in elemento['filhos']:
+                _pais.setdefault(filho, set()).add(nome)
+    pais = _pais.get(tag, ())
+    return next(iter(pais)) if len(pais) == 1 else None
+
+# Função para verificar que o documento não está vazio nem truncado (sem o fechamento da raiz)
+def _verificar_documento(xml_file, conteudo):
+    if not conteudo[-len(_FIM_DOCUMENTO) - 64:].rstrip().endswith(_FIM_DOCUMENTO):
+        raise ParseError(f"Documento vazio ou truncado: {xml_file}")
+
+# Função para decodificar o valor de um atributo (referências de caracteres e normalização de espaços do XML)
+def _valor_atributo(valor, codificacao):
+    texto = valor.decode(codificacao, 'replace')
+    if '&' in texto:
+        texto = html.unescape(texto)
+    return texto.replace('\t', ' ').replace('\n', ' ').replace('\r', ' ')
+
+# Função para obter a codificação declarada no documento (UTF-8 por padrão)
+def _codificacao(conteudo):
+    declarada = _CODIFICACAO.match(conteudo[:256])
+    return declarada.group(1).decode('ascii') if declarada else 'utf-8'
+
+# Função para ler os textos das disciplinas no conteúdo (None se alguma não tiver apenas texto); o texto vazio
+# vira None, como no analisador
+def _ler_disciplinas(conteudo, aberturas):
+    encontradas = _DISCIPLINA.findall(conteudo)
+    if len(encontradas) != aberturas:
+        return None
+    codificacao = _codificacao(conteudo)
+    disciplinas = set()
+    for _, texto in encontradas:
+        if texto:
+            texto = texto.decode(codificacao, 'replace').replace('\r\n', '\n').replace('\r', '\n')
+            disciplinas.add(html.unescape(texto) if '&' in texto else texto)
+        else:
+            disciplinas.add(None)
+    return disciplinas
+
+# Função para contar as naturezas (tag, NATUREZA) das aberturas das tags encontradas no conteúdo
+def _contar_naturezas(conteudo, tags):
+    codificacao = _codificacao(conteudo)
+    naturezas = Counter()
+    for tag, atributos in _padrao_atributos(tags).findall(conteudo):
+        natureza = _NATUREZA.search(atributos)
+        valor = b'' if natureza is None else (natureza.group(1) if natureza.group(1) is not None else natureza.group(2))
+        naturezas[(tag.decode('ascii'), _valor_atributo(valor, codificacao))] += 1
+    return naturezas
+
+# Função para contar as aberturas de cada tag em um currículo (arquivo XML ou membro de ZIP), para as tags
+# de `naturezas` as ocorrências de cada (tag, NATUREZA) e, com `disciplinas`, os textos das disciplinas;
+# devolve (contagem de tags, contagem de naturezas, disciplinas ou None se exigirem o analisador)
+def contar_tags(xml_file, tags, naturezas=(), disciplinas=False):
+    tags = set(tags) | ({'DISCIPLINA'} if disciplinas else set())
+    padrao = _padrao(tags) if tags else None
+
+    with etapa('contagem_bytes', xml_file) as registro, abrir_xml(xml_file) as arquivo:
+        if separar_caminho(xml_file)[1] is None and os.fstat(arquivo.fileno()).st_size:
+            conteudo = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # Membros de ZIP (e arquivos vazios) não podem ser mapeados: o conteúdo é lido de uma vez
+            conteudo = arquivo.read()
+        try:
+            _verificar_documento(xml_file, conteudo)
+            encontradas = padrao.findall(conteudo) if padrao is not None else []
+            contagem = Counter({tag: 0 for tag in tags})
+            contagem.update(tag.decode('ascii') for tag in encontradas)
+            contagem_naturezas = _contar_naturezas(conteudo, naturezas) if naturezas else Counter()
+            textos = _ler_disciplinas(conteudo, contagem['DISCIPLINA']) if disciplinas else set()
+            registro['bytes'] = len(conteudo)
+        finally:
+            if isinstance(conteudo, mmap.mmap):
+                conteudo.close()
+
+    return contagem, contagem_naturezas, textos
+
+# Função para obter as contagens de tags, de caminhos e de naturezas (e, com `disciplinas`, os textos das
+# disciplinas) de um currículo, no formato das métricas do extrator (as chaves 'tags', 'caminhos', 'naturezas'
+# e 'disciplinas'); recorre ao extrator completo quando uma das tags de `exigem_analisador` aparece no arquivo
+# ou quando um caminho ou uma disciplina não pode ser lido em bytes
+def contar_metricas(xml_file, tags=(), caminhos=(), naturezas=(), disciplinas=False, exigem_analisador=()):
+    if any(pai_unico(tag) != pai for pai, tag in caminhos):
+        return obter_metricas(xml_file)
+    if disciplinas and any(pai_unico(tag) != pai for pai, tag in zip(CAMINHO_DISCIPLINA, CAMINHO_DISCIPLINA[1:])):
+        return obter_metricas(xml_file)
+
+    contagem, contagem_naturezas, textos = contar_tags(
+        xml_file, set(tags) | {tag for _, tag in caminhos} | set(exigem_analisador), naturezas, disciplinas)
+    if textos is None or any(contagem[tag] for tag in exigem_analisador):
+        return obter_metricas(xml_file)
+
+    metricas = {
+        'tags': Counter({tag: contagem[tag] for tag in tags if tag != RAIZ}),
+        'caminhos': Counter({(pai, tag): contagem[tag] for pai, tag in caminhos}),
+        'naturezas': contagem_naturezas,
+        'disciplinas': textos
+    }
+
+    if VERIFICAR_CONTAGEM:
+        metricas = verificar_contagem(xml_file, metricas, naturezas, disciplinas)
+    return metricas
+
+# Função para conferir uma contagem em bytes com as métricas do analisador completo
+# (as naturezas são conferidas para as tags de `naturezas`, nos dois sentidos, e as disciplinas com `disciplinas`)
+def verificar_contagem(xml_file, metricas, naturezas=(), disciplinas=False):
+    completas = obter_metricas(xml_file)
+    divergencias = [
+        (chave, item, quantidade, completas[chave][item])
+        for chave in ('tags', 'caminhos', 'naturezas')
+        for item, quantidade in metricas[chave].items()
+        if completas[chave][item] != quantidade
+    ]
+    divergencias += [
+        ('naturezas', item, 0, quantidade)
+        for item, quantidade in completas['naturezas'].items()
+        if item[0] in naturezas and item not in metricas['naturezas']
+    ]
+    if disciplinas and metricas['disciplinas'] != completas['disciplinas']:
+        divergencias.append(('disciplinas', 'textos', len(metricas['disciplinas']), len(completas['disciplinas'])))
+    if not divergencias:
+        return metricas
+
+    print(f"Contagem em bytes divergente no arquivo {xml_file}:")
+    for chave, item, quantidade, esperado in divergencias:
+        print(f"  {chave} {item}: {quantidade} em bytes, {esperado} pelo analisador")
+    return completas
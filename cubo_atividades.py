@@ -0,0 +1,176 @@
+#####################################################################
+# Cubo de atividades por ano: um array denso orientador x categoria x ano
+# com as contagens de produção, orientações, bancas e congressos de cada
+# ano. As contagens por ano são coletadas na mesma passagem do extrator
+# (métrica 'anos' de `extrator_metricas`, também guardada no armazém), e o
+# cubo é montado a partir das métricas, como a matriz de características.
+#
+# Com o cubo, "últimos 5 anos", tendências por ano e janelas móveis são
+# fatias e somas NumPy, sem ler os currículos de novo. As categorias com o
+# mesmo nome de uma coluna da matriz de características (artigos,
+# orientações, bancas) podem substituir essa coluna por um período
+# (`matriz_do_periodo`), de modo que os critérios que só usam essas colunas
+# (experiência e qualidade) podem ser avaliados apenas sobre aquele período.
+# As colunas sem ano no extrator (disciplinas, pesquisa, extensão, coautores
+# e fator de impacto x percentil) não podem ser recortadas: no período elas
+# ficam NaN, e os critérios que dependem delas (engajamento, produção e
+# reputação) não são avaliados.
+#
+# Itens sem ano válido (ou fora dos anos do cubo) ficam em 'sem_ano', de
+# modo que a soma de todos os anos mais 'sem_ano' é a contagem total.
+#####################################################################
+
+import datetime
+import numpy as np
+
+from perfil_execucao import medir
+
+ANDAMENTO = 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-'
+OUTRAS_CONCLUIDAS = 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'
+
+# Categoria -> (tag de dados básicos, NATUREZA exigida ou None, comparação da NATUREZA em maiúsculas),
+# com as mesmas regras das colunas da matriz de características
+REGRAS = {
+    'artigos': ('DADOS-BASICOS-DO-ARTIGO', None, False),
+    'livros': ('DADOS-BASICOS-DO-LIVRO', None, False),
+    'capitulos': ('DADOS-BASICOS-DO-CAPITULO', None, False),
+    'conc_mestrado': ('DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-MESTRADO', None, False),
+    'conc_doutorado': ('DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO', None, False),
+    'conc_iniciacao': (OUTRAS_CONCLUIDAS, 'INICIACAO_CIENTIFICA', True),
+    'conc_tcc': (OUTRAS_CONCLUIDAS, 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO', True),
+    'and_iniciacao': (ANDAMENTO + 'INICIACAO-CIENTIFICA', 'Iniciação Científica', False),
+    'and_graduacao': (ANDAMENTO + 'GRADUACAO', 'Graduação', False),
+    'and_mestrado': (ANDAMENTO + 'MESTRADO', 'Dissertação de mestrado', False),
+    'and_doutorado': (ANDAMENTO + 'DOUTORADO', 'Tese de doutorado', False),
+    'bancas_graduacao': ('DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO', None, False),
+    'bancas_mestrado': ('DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO', None, False),
+    'bancas_doutorado': ('DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO', None, False),
+    'congressos': ('DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO', None, False)
+}
+
+# Categorias do cubo, na ordem do segundo eixo
+CATEGORIAS = list(REGRAS)
+
+# Colunas da matriz de características sem contagem por ano, que não podem ser recortadas por período
+COLUNAS_SEM_ANO = ('disciplinas', 'pesquisa', 'extensao', 'coautores', 'soma_fi_percentil')
+
+# Função para indexar as regras por tag: tag de dados básicos -> [(posição da categoria, NATUREZA, maiúsculas)]
+def _indexar_regras():
+    por_tag = {}
+    for posicao, (tag, natureza, maiusculas) in enumerate(REGRAS.values()):
+        por_tag.setdefault(tag, []).append((posicao, natureza, maiusculas))
+    return por_tag
+
+_categorias_por_tag = _indexar_regras()
+
+# Função para ler um ano de quatro dígitos (None se ausente ou inválido)
+def ler_ano(texto):
+    texto = texto.strip()
+    return int(texto) if len(texto) == 4 and texto.isdigit() else None
+
+# Função para listar (categoria, ano, quantidade) das contagens por ano de um currículo
+def _contagens_por_categoria(metricas):
+    for (tag, natureza, ano), quantidade in metricas['anos'].items():
+        for posicao, natureza_exigida, maiusculas in _categorias_por_tag.get(tag, ()):
+            if natureza_exigida is None or (natureza.upper() if maiusculas else natureza) == natureza_exigida:
+                yield posicao, ler_ano(ano), quantidade
+
+# Função para montar o cubo a partir de {nome: métricas}; `anos` = (primeiro, último) limita o eixo dos anos
+# (por padrão, do menor ao maior ano encontrado)
+@medir('metrica')
+def construir_cubo(metricas_por_orientador, anos=None):
+    nomes = []
+    orientadores, categorias, anos_itens, quantidades = [], [], [], []
+    for nome, metricas in metricas_por_orientador.items():
+        if metricas is None:
+            continue
+        for posicao, ano, quantidade in _contagens_por_categoria(metricas):
+            orientadores.append(len(nomes))
+            categorias.append(posicao)
+            anos_itens.append(-1 if ano is None else ano)
+            quantidades.append(quantidade)
+        nomes.append(nome)
+
+    orientadores = np.array(orientadores, dtype=np.int64)
+    categorias = np.array(categorias, dtype=np.int64)
+    anos_itens = np.array(anos_itens, dtype=np.int64)
+    quantidades = np.array(quantidades, dtype=np.int32)
+
+    validos = anos_itens >= 0
+    if anos is None:
+        anos = (int(anos_itens[validos].min()), int(anos_itens[validos].max())) if validos.any() else (0, -1)
+    primeiro, ultimo = anos
+    no_cubo = validos & (anos_itens >= primeiro) & (anos_itens <= ultimo)
+
+    valores = np.zeros((len(nomes), len(CATEGORIAS), max(ultimo - primeiro + 1, 0)), dtype=np.int32)
+    np.add.at(valores, (orientadores[no_cubo], categorias[no_cubo], anos_itens[no_cubo] - primeiro), quantidades[no_cubo])
+    sem_ano = np.zeros((len(nomes), len(CATEGORIAS)), dtype=np.int32)
+    np.add.at(sem_ano, (orientadores[~no_cubo], categorias[~no_cubo]), quantidades[~no_cubo])
+
+    return {
+        'nomes': nomes,
+        'categorias': CATEGORIAS,
+        'indice': {categoria: posicao for posicao, categoria in enumerate(CATEGORIAS)},
+        'anos': np.arange(primeiro, ultimo + 1),
+        'valores': valores,
+        'sem_ano': sem_ano
+    }
+
+# Função para obter a fatia dos anos [inicio, fim] do cubo (sem cópia): orientador x categoria x ano
+def fatia_anos(cubo, inicio=None, fim=None):
+    primeiro = int(cubo['anos'][0]) if len(cubo['anos']) else 0
+    inicio = primeiro if inicio is None else inicio
+    fim = primeiro + len(cubo['anos']) - 1 if fim is None else fim
+    return cubo['valores'][:, :, max(inicio - primeiro, 0):max(fim - primeiro + 1, 0)]
+
+# Função para somar as contagens dos anos [inicio, fim]: orientador x categoria
+def somar_periodo(cubo, inicio=None, fim=None):
+    return fatia_anos(cubo, inicio, fim).sum(axis=2, dtype=np.int64)
+
+# Função para somar os últimos `quantidade` anos até `ano_final` (por padrão, o ano atual)
+def ultimos_anos(cubo, quantidade=5, ano_final=None):
+    ano_final = datetime.date.today().year if ano_final is None else ano_final
+    return somar_periodo(cubo, ano_final - quantidade + 1, ano_final)
+
+# Função para obter a série anual de uma categoria: orientador x ano
+def serie(cubo, categoria):
+    return cubo['valores'][:, cubo['indice'][categoria], :]
+
+# Função para calcular a tendência (itens por ano, inclinação da reta de mínimos quadrados) de cada
+# orientador e categoria nos anos [inicio, fim]: orientador x categoria
+def tendencias(cubo, inicio=None, fim=None):
+    valores = fatia_anos(cubo, inicio, fim).astype(np.float64)
+    if valores.shape[2] < 2:
+        return np.zeros(valores.shape[:2])
+    anos = np.arange(valores.shape[2], dtype=np.float64)
+    anos -= anos.mean()
+    return (valores - valores.mean(axis=2, keepdims=True)) @ anos / (anos @ anos)
+
+# Função para somar janelas móveis de `largura` anos: orientador x categoria x janela, e o último ano de cada janela
+# (sem janelas se o período tiver menos de `largura` anos)
+def janelas_moveis(cubo, largura, inicio=None, fim=None):
+    if largura < 1:
+        raise ValueError("A largura das janelas deve ser de pelo menos um ano")
+    valores = fatia_anos(cubo, inicio, fim)
+    quantidade = max(valores.shape[2] - largura + 1, 0)
+    acumulado = np.zeros(valores.shape[:2] + (valores.shape[2] + 1,), dtype=np.int64)
+    np.cumsum(valores, axis=2, out=acumulado[:, :, 1:])
+    janelas = acumulado[:, :, largura:] - acumulado[:, :, :quantidade]
+    primeiro_cubo = int(cubo['anos'][0]) if len(cubo['anos']) else 0
+    primeiro = primeiro_cubo if inicio is None else max(inicio, primeiro_cubo)
+    return janelas, np.arange(primeiro + largura - 1, primeiro + largura - 1 + quantidade)
+
+# Função para obter uma cópia da matriz de características em que as colunas com categoria no cubo
+# (artigos, orientações e bancas) contam apenas os anos [inicio, fim] e as colunas sem ano ficam NaN
+def matriz_do_periodo(matriz, cubo, inicio=None, fim=None):
+    if list(matriz['nomes']) != list(cubo['nomes']):
+        raise ValueError("A matriz e o cubo devem ter os mesmos orientadores, na mesma ordem")
+    periodo = somar_periodo(cubo, inicio, fim)
+    valores = matriz['valores'].copy()
+    for categoria, posicao in cubo['indice'].items():
+        if categoria in matriz['indice']:
+            valores[:, matriz['indice'][categoria]] = periodo[:, posicao]
+    for coluna in COLUNAS_SEM_ANO:
+        if coluna in matriz['indice']:
+            valores[:, matriz['indice'][coluna]] = np.nan
+    return dict(matriz, valores=valores)
@@ -0,0 +1,103 @@
+#####################################################################
+# Esboços de distribuição para os normalizadores do corpus (percentil 90 de
+# publicações em `p_experiencia`, mínimo e máximo em `p_reputacao`).
+#
+# Um esboço guarda centróides (valor -> peso). Enquanto o número de valores
+# distintos não passa de `limite` (o caso das contagens inteiras extraídas
+# dos currículos), o esboço é exato e `calcular_percentil` devolve o mesmo
+# resultado de `np.percentile`. Acima do limite, centróides vizinhos são
+# fundidos pela média ponderada, como em um t-digest, preservando sempre o
+# menor e o maior valor. Esboços podem ser atualizados quando um currículo é
+# adicionado ou substituído e mesclados entre processos.
+#####################################################################
+
+import math
+from collections import Counter
+
+# Função para criar um esboço vazio
+def novo_esboco(limite=2000):
+    return {
+        'centroides': Counter(),
+        'total': 0,
+        'limite': limite
+    }
+
+# Função para adicionar um valor ao esboço
+def adicionar_valor(esboco, valor, peso=1):
+    esboco['centroides'][valor] += peso
+    esboco['total'] += peso
+    if len(esboco['centroides']) > esboco['limite']:
+        _comprimir(esboco)
+
+# Função para remover um valor do esboço (usada quando um currículo é substituído)
+def remover_valor(esboco, valor, peso=1):
+    centroides = esboco['centroides']
+    if valor not in centroides:
+        # Após a compressão, o valor pode ter sido fundido ao centróide mais próximo
+        valor = min(centroides, key=lambda centro: abs(centro - valor))
+    centroides[valor] -= peso
+    if centroides[valor] <= 0:
+        del centroides[valor]
+    esboco['total'] -= peso
+
+# Função para substituir o valor antigo de um currículo pelo novo
+def substituir_valor(esboco, antigo, novo):
+    remover_valor(esboco, antigo)
+    adicionar_valor(esboco, novo)
+
+# Função para mesclar esboços (por exemplo, os produzidos por processos diferentes)
+def mesclar_esbocos(*esbocos):
+    resultado = novo_esboco(max(esboco['limite'] for esboco in esbocos))
+    for esboco in esbocos:
+        resultado['centroides'].update(esboco['centroides'])
+        resultado['total'] += esboco['total']
+    if len(resultado['centroides']) > resultado['limite']:
+        _comprimir(resultado)
+    return resultado
+
+# Função para fundir centróides vizinhos até o esboço voltar a caber no limite
+def _comprimir(esboco):
+    valores = sorted(esboco['centroides'].items())
+    primeiro, ultimo, internos = valores[0], valores[-1], valores[1:-1]
+    tamanho_grupo = math.ceil(len(internos) / max(esboco['limite'] // 2 - 2, 1))
+
+    centroides = Counter({primeiro[0]: primeiro[1], ultimo[0]: ultimo[1]})
+    for inicio in range(0, len(internos), tamanho_grupo):
+        grupo = internos[inicio:inicio + tamanho_grupo]
+        peso = sum(p for _, p in grupo)
+        centroides[sum(v * p for v, p in grupo) / peso] += peso
+    esboco['centroides'] = centroides
+
+# Função para obter o valor na posição `posicao` (0 = menor) da distribuição
+def _valor_na_posicao(valores, posicao):
+    acumulado = 0
+    for valor, peso in valores:
+        acumulado += peso
+        if posicao < acumulado:
+            return valor
+    return valores[-1][0]
+
+# Função para calcular o percentil q (0 a 100), com a mesma interpolação linear de np.percentile
+def calcular_percentil(esboco, q):
+    if esboco['total'] == 0:
+        raise ValueError("Não é possível calcular o percentil de um esboço vazio")
+
+    valores = sorted(esboco['centroides'].items())
+    posicao = (q / 100) * (esboco['total'] - 1)
+    inferior = math.floor(posicao)
+    fracao = posicao - inferior
+
+    a = _valor_na_posicao(valores, inferior)
+    b = _valor_na_posicao(valores, min(inferior + 1, esboco['total'] - 1))
+    diferenca = b - a
+    if fracao >= 0.5:
+        return b - diferenca * (1 - fracao)
+    return a + diferenca * fracao
+
+# Função para obter o menor valor do esboço
+def minimo(esboco):
+    return min(esboco['centroides'])
+
+# Função para obter o maior valor do esboço
+def maximo(esboco):
+    return max(esboco['centroides'])
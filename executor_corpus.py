@@ -0,0 +1,96 @@
+#####################################################################
+# Executor comum para processar uma pasta de currículos Lattes em paralelo.
+# Os arquivos são listados com `os.scandir` (incluindo os currículos dentro
+# de arquivos ZIP, ver `fontes_xml`), distribuídos entre processos
+# do maior para o menor (para equilibrar a carga entre os processos) e os
+# resultados são devolvidos sempre na ordem dos caminhos, independente da
+# ordem em que os processos terminam.
+#
+# O número de processos e o tamanho dos lotes podem ser definidos pelos
+# parâmetros das funções ou pelas variáveis de ambiente LATTES_PROCESSOS e
+# LATTES_TAMANHO_LOTE. Com um único processo, tudo roda no processo atual.
+#####################################################################
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from fontes_xml import listar_membros_zip, eh_zip
+
+# Função para ler um inteiro positivo de uma variável de ambiente
+def _ler_configuracao(nome):
+    valor = os.environ.get(nome)
+    if valor and valor.isdigit() and int(valor) > 0:
+        return int(valor)
+    return None
+
+# Função para listar os arquivos XML de uma pasta (ou de um ZIP), com o tamanho de cada um
+def listar_arquivos_xml(diretorio, recursivo=False):
+    if eh_zip(diretorio) and os.path.isfile(diretorio):
+        return sorted(listar_membros_zip(diretorio))
+
+    arquivos = []
+    pendentes = [diretorio]
+
+    while pendentes:
+        with os.scandir(pendentes.pop()) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    if recursivo:
+                        pendentes.append(entrada.path)
+                elif entrada.name.endswith('.xml') and entrada.is_file():
+                    arquivos.append((entrada.path, entrada.stat().st_size))
+                elif eh_zip(entrada.name) and entrada.is_file():
+                    # Os membros XML do ZIP são lidos diretamente do arquivo compactado
+                    arquivos.extend(listar_membros_zip(entrada.path))
+
+    arquivos.sort()
+    return arquivos
+
+# Função para aplicar `funcao` a cada arquivo, retornando [(caminho, resultado)] na ordem dos caminhos
+def processar_em_paralelo(funcao, arquivos, processos=None, tamanho_lote=None):
+    processos = processos or _ler_configuracao('LATTES_PROCESSOS') or os.cpu_count() or 1
+    processos = min(processos, max(len(arquivos), 1))
+
+    # Os maiores arquivos são agendados primeiro para que os menores preencham o final da fila
+    agenda = [caminho for caminho, tamanho in sorted(arquivos, key=lambda item: (-item[1], item[0]))]
+
+    if processos == 1:
+        resultados = map(funcao, agenda)
+        return sorted(zip(agenda, resultados), key=lambda item: item[0])
+
+    tamanho_lote = tamanho_lote or _ler_configuracao('LATTES_TAMANHO_LOTE') or max(1, len(agenda) // (processos * 16))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        resultados = list(executor.map(funcao, agenda, chunksize=tamanho_lote))
+
+    return sorted(zip(agenda, resultados), key=lambda item: item[0])
+
+# Função para aplicar `funcao` a um lote de itens (executada nos processos do executor)
+def _aplicar_lote(funcao, lote):
+    return [(item, funcao(item)) for item in lote]
+
+# Função para aplicar `funcao` a cada item, gerando (item, resultado) à medida que os processos terminam,
+# para que a etapa seguinte comece sem esperar pelo corpus inteiro (a ordem não é a dos caminhos)
+def processar_conforme_termina(funcao, arquivos, processos=None, tamanho_lote=None):
+    processos = processos or _ler_configuracao('LATTES_PROCESSOS') or os.cpu_count() or 1
+    processos = min(processos, max(len(arquivos), 1))
+    agenda = [caminho for caminho, tamanho in sorted(arquivos, key=lambda item: (-item[1], item[0]))]
+
+    if processos == 1:
+        for item in agenda:
+            yield item, funcao(item)
+        return
+
+    # Lotes menores que os de `processar_em_paralelo`: os primeiros resultados chegam mais cedo
+    tamanho_lote = tamanho_lote or _ler_configuracao('LATTES_TAMANHO_LOTE') or max(1, len(agenda) // (processos * 64))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        pendentes = {executor.submit(_aplicar_lote, funcao, agenda[inicio:inicio + tamanho_lote])
+                     for inicio in range(0, len(agenda), tamanho_lote)}
+        for concluido in as_completed(pendentes):
+            # O lote entregue deixa de ser referenciado, para que os resultados já consumidos sejam liberados
+            pendentes.discard(concluido)
+            yield from concluido.result()
+
+# Função para listar e processar todos os arquivos XML de uma pasta
+def processar_corpus(funcao, diretorio, processos=None, tamanho_lote=None, recursivo=False):
+    arquivos = listar_arquivos_xml(diretorio, recursivo)
+    return processar_em_paralelo(funcao, arquivos, processos, tamanho_lote)
@@ -1,50 +1,29 @@
 import os
-import glob
-import xml.etree.ElementTree as ET
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas, exibir_estatisticas
+import tabela_areas
+from perfil_execucao import medir
+
+@medir('metrica')
 def extract_areas_of_knowledge(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
     
+    # Áreas do conhecimento de cada formação acadêmica e das linhas de pesquisa, como códigos da tabela de áreas
     data = {
         "filename": os.path.basename(xml_file), 
-        "graduacao": [], 
-        "mestrado": [], 
-        "doutorado": [], 
-        "pos_doutorado": [], 
-        "linhas_pesquisa": []
+        "graduacao": tabela_areas.codificar_areas(metricas['areas']['GRADUACAO']), 
+        "mestrado": tabela_areas.codificar_areas(metricas['areas']['MESTRADO']), 
+        "doutorado": tabela_areas.codificar_areas(metricas['areas']['DOUTORADO']), 
+        "pos_doutorado": tabela_areas.codificar_areas(metricas['areas']['POS-DOUTORADO']), 
+        "linhas_pesquisa": tabela_areas.codificar_areas(metricas['areas']['LINHA-DE-PESQUISA'])
     }
-    
-    def get_areas_of_knowledge(element):
-        areas = []
-        for area in element.findall('.//AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1'):
-            area_data = {
-                "grande_area": area.get("NOME-GRANDE-AREA-DO-CONHECIMENTO"),
-                "area": area.get("NOME-DA-AREA-DO-CONHECIMENTO"),
-                "sub_area": area.get("NOME-DA-SUB-AREA-DO-CONHECIMENTO"),
-                "especialidade": area.get("NOME-DA-ESPECIALIDADE")
-            }
-            areas.append(area_data)
-        return areas
-
-    # Extraindo dados de formação acadêmica e linhas de pesquisa
-    for formacao in root.findall(".//GRADUACAO"):
-        data["graduacao"].extend(get_areas_of_knowledge(formacao))
-
-    for formacao in root.findall(".//MESTRADO"):
-        data["mestrado"].extend(get_areas_of_knowledge(formacao))
-
-    for formacao in root.findall(".//DOUTORADO"):
-        data["doutorado"].extend(get_areas_of_knowledge(formacao))
-
-    for formacao in root.findall(".//POS-DOUTORADO"):
-        data["pos_doutorado"].extend(get_areas_of_knowledge(formacao))
-
-    for pesquisa in root.findall(".//LINHA-DE-PESQUISA"):
-        data["linhas_pesquisa"].extend(get_areas_of_knowledge(pesquisa))
 
     return data
 
+@medir('saida')
 def print_data(data):
     for entry in data:
         # Imprimindo título com o nome do arquivo
@@ -54,7 +33,8 @@ def print_data(data):
         def add_section(title, items):
             if items:
                 print(f"{title}")
-                for item in items:
+                for codigo in items:
+                    item = tabela_areas.descrever_area(codigo)
                     # Imprimindo detalhes das áreas de conhecimento
                     print(f"  Grande Área: {item['grande_area']}")
                     print(f"  Área: {item['area']}")
@@ -70,16 +50,18 @@ def print_data(data):
         add_section("Linhas de Pesquisa", entry["linhas_pesquisa"])
         print("-" * 40)
 
-def main(input_folder):
-    # Procurando todos os arquivos XML na pasta especificada
-    xml_files = glob.glob(os.path.join(input_folder, "*.xml"))
+def main(input_folder, processos=None):
+    # Procurando todos os arquivos XML na pasta especificada; só os novos ou alterados são extraídos
+    metricas_por_arquivo, estatisticas = carregar_metricas(input_folder, processos=processos)
     extracted_data = []
 
-    for xml_file in xml_files:
-        extracted_data.append(extract_areas_of_knowledge(xml_file))
+    for xml_file, metricas in metricas_por_arquivo.items():
+        if metricas is not None:
+            extracted_data.append(extract_areas_of_knowledge(xml_file))
 
     # Imprimindo os dados extraídos no terminal
     print_data(extracted_data)
+    exibir_estatisticas(estatisticas)
 
 if __name__ == "__main__":
     input_folder = r"C:\Users\radim\Desktop\ppgmmc"
@@ -1,55 +1,34 @@
 import os
-import glob
-import xml.etree.ElementTree as ET
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+import tabela_areas
+from analisador_xml import ErroXML
+from perfil_execucao import medir
+
+@medir('metrica')
 def extract_areas_of_knowledge(xml_file):
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        
-        data = {
-            "filename": os.path.basename(xml_file), 
-            "graducao": [], 
-            "mestrado": [], 
-            "doutorado": [], 
-            "pos_doutorado": [], 
-            "linhas_pesquisa": []
-        }
-        
-        def get_areas_of_knowledge(element):
-            areas = []
-            for area in element.findall('.//AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1'):
-                area_data = {
-                    "grande_area": area.get("NOME-GRANDE-AREA-DO-CONHECIMENTO"),
-                    "area": area.get("NOME-DA-AREA-DO-CONHECIMENTO"),
-                    "sub_area": area.get("NOME-DA-SUB-AREA-DO-CONHECIMENTO"),
-                    "especialidade": area.get("NOME-DA-ESPECIALIDADE")
-                }
-                areas.append(area_data)
-            return areas
-
-        # Extraindo dados de formação acadêmica e linhas de pesquisa
-        for formacao in root.findall(".//GRADUACAO"):
-            data["graducao"].extend(get_areas_of_knowledge(formacao))
-
-        for formacao in root.findall(".//MESTRADO"):
-            data["mestrado"].extend(get_areas_of_knowledge(formacao))
-
-        for formacao in root.findall(".//DOUTORADO"):
-            data["doutorado"].extend(get_areas_of_knowledge(formacao))
-
-        for formacao in root.findall(".//POS-DOUTORADO"):
-            data["pos_doutorado"].extend(get_areas_of_knowledge(formacao))
-
-        for pesquisa in root.findall(".//LINHA-DE-PESQUISA"):
-            data["linhas_pesquisa"].extend(get_areas_of_knowledge(pesquisa))
-
-        return data
-    
-    except ET.ParseError as e:
+        metricas = obter_metricas(xml_file)
+    except ErroXML as e:
         print(f"Error parsing {xml_file}: {e}")
         return None
 
+    # Áreas do conhecimento como códigos da tabela de áreas
+    data = {
+        "filename": os.path.basename(xml_file), 
+        "graducao": tabela_areas.codificar_areas(metricas['areas']['GRADUACAO']), 
+        "mestrado": tabela_areas.codificar_areas(metricas['areas']['MESTRADO']), 
+        "doutorado": tabela_areas.codificar_areas(metricas['areas']['DOUTORADO']), 
+        "pos_doutorado": tabela_areas.codificar_areas(metricas['areas']['POS-DOUTORADO']), 
+        "linhas_pesquisa": tabela_areas.codificar_areas(metricas['areas']['LINHA-DE-PESQUISA'])
+    }
+
+    return data
+
+@medir('saida')
 def print_individual_summary(entry):
     if not entry:
         print("Nenhum dado encontrado.")
@@ -60,7 +39,8 @@ def print_individual_summary(entry):
     def print_section(title, items):
         if items:
             print(f"{title}:")
-            for item in items:
+            for codigo in items:
+                item = tabela_areas.descrever_area(codigo)
                 print(f"  Grande Área: {item['grande_area']}")
                 print(f"  Área: {item['area']}")
                 print(f"  Sub-área: {item['sub_area']}")
@@ -74,20 +54,20 @@ def print_individual_summary(entry):
     print_section("Linhas de Pesquisa", entry["linhas_pesquisa"])
     print("-----\n")
 
-def main(input_folder):
-    # Procurando todos os arquivos XML na pasta especificada
-    xml_files = glob.glob(os.path.join(input_folder, "*.xml"))
+def main(input_folder, processos=None):
+    # Procurando todos os arquivos XML na pasta especificada; a extração roda em paralelo e só
+    # os arquivos novos ou alterados são lidos novamente
+    metricas_por_arquivo, _ = carregar_metricas(input_folder, processos=processos)
     
-    if not xml_files:
+    if not metricas_por_arquivo:
         print("Nenhum arquivo XML encontrado no diretório especificado.")
         return
 
-    print(f"Arquivos encontrados: {len(xml_files)}")
+    print(f"Arquivos encontrados: {len(metricas_por_arquivo)}")
     
-    for xml_file in xml_files:
+    for xml_file, metricas in metricas_por_arquivo.items():
         print(f"Processando arquivo: {xml_file}")
-        data = extract_areas_of_knowledge(xml_file)
-        print_individual_summary(data)
+        print_individual_summary(extract_areas_of_knowledge(xml_file) if metricas is not None else None)
 
 if __name__ == "__main__":
     input_folder = r"C:\Users\radim\Desktop\ppgmmc"
@@ -1,10 +1,17 @@
 import os
-import xml.etree.ElementTree as ET
+import sys
 from collections import Counter
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+import tabela_areas
+from perfil_execucao import medir
+
+# Função para extrair as áreas de atuação de um arquivo XML, como códigos de nomes da tabela de áreas
+@medir('metrica')
 def extract_areas_from_lattes(file_path):
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+    metricas = obter_metricas(file_path)
     
     data = {
         'grandes_areas_conhecimento': [],
@@ -13,24 +20,15 @@ def extract_areas_from_lattes(file_path):
         'especialidades': []
     }
 
-    # Áreas de Atuação
-    for area in root.findall(".//AREAS-DE-ATUACAO/AREA-DE-ATUACAO"):
-        grandes_area = area.attrib.get('NOME-GRANDE-AREA-DO-CONHECIMENTO')
-        if grandes_area:
-            data['grandes_areas_conhecimento'].append(grandes_area)
-        area_conhecimento = area.attrib.get('NOME-DA-AREA-DO-CONHECIMENTO')
-        if area_conhecimento:
-            data['areas_conhecimento'].append(area_conhecimento)
-        sub_area = area.attrib.get('NOME-DA-SUB-AREA-DO-CONHECIMENTO')
-        if sub_area:
-            data['sub_areas_conhecimento'].append(sub_area)
-        especialidade = area.attrib.get('NOME-DA-ESPECIALIDADE')
-        if especialidade:
-            data['especialidades'].append(especialidade)
+    # Áreas de Atuação (nomes ausentes ou vazios são ignorados)
+    for codigo in tabela_areas.codificar_areas(metricas['areas_atuacao']):
+        for key, campo in zip(data, tabela_areas.campos(codigo)):
+            if tabela_areas.nome(campo):
+                data[key].append(campo)
     
     return data
 
-def process_all_files(directory):
+def process_all_files(directory, processos=None):
     summary = {
         'grandes_areas_conhecimento': Counter(),
         'areas_conhecimento': Counter(),
@@ -38,18 +36,21 @@ def process_all_files(directory):
         'especialidades': Counter()
     }
 
-    for filename in os.listdir(directory):
-        if filename.endswith(".xml"):
-            file_path = os.path.join(directory, filename)
-            print(f"Processing file: {filename}")
-            data = extract_areas_from_lattes(file_path)
-            for key in summary:
-                summary[key].update(data[key])
-            print_individual_summary(data)
-            print("-----\n")
+    # A extração roda em paralelo; as contagens são feitas sobre os códigos neste processo
+    metricas_por_arquivo, _ = carregar_metricas(directory, processos=processos)
+    for file_path, metricas in metricas_por_arquivo.items():
+        if metricas is None:
+            continue
+        data = extract_areas_from_lattes(file_path)
+        print(f"Processing file: {os.path.basename(file_path)}")
+        for key in summary:
+            summary[key].update(data[key])
+        print_individual_summary(data)
+        print("-----\n")
     
     return summary
 
+@medir('saida')
 def print_individual_summary(data):
     for key, items in data.items():
         total_items = len(items)
@@ -57,20 +58,25 @@ def print_individual_summary(data):
         counter = Counter(items)
         for item, count in counter.items():
             percentage = (count / total_items) * 100 if total_items > 0 else 0
-            print(f"  - {item}: {count} vezes ({percentage:.2f}%)")
+            print(f"  - {tabela_areas.nome(item)}: {count} vezes ({percentage:.2f}%)")
 
+@medir('saida')
 def print_summary(summary):
     for key, counter in summary.items():
         total_items = sum(counter.values())
         print(f"{key.replace('_', ' ')}: {total_items} itens")
         for item, count in counter.items():
             percentage = (count / total_items) * 100 if total_items > 0 else 0
-            print(f"  - {item}: {count} vezes ({percentage:.2f}%)")
+            print(f"  - {tabela_areas.nome(item)}: {count} vezes ({percentage:.2f}%)")
+
+def main():
+    # Exemplo de uso
+    directory_path = r'C:\Users\radim\Desktop\ppgmmc'
+    summary_data = process_all_files(directory_path)
 
-# Exemplo de uso
-directory_path = r'C:\Users\radim\Desktop\ppgmmc'
-summary_data = process_all_files(directory_path)
+    # Exibir resultados finais
+    print("Resumo final:\n")
+    print_summary(summary_data)
 
-# Exibir resultados finais
-print("Resumo final:\n")
-print_summary(summary_data)
+if __name__ == "__main__":
+    main()
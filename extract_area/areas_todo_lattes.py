@@ -1,10 +1,20 @@
 import os
-from lxml import etree
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from executor_corpus import listar_arquivos_xml, processar_em_paralelo
+from fontes_xml import abrir_xml, nome_curriculo
+from analisador_xml import analisar, buscar, exibir_backend
+from perfil_execucao import medir, etapa
+
+@medir('metrica')
 def extrair_informacoes_orientador(file_path):
     try:
-        nome_arquivo = os.path.basename(file_path).split(".")[0]  # Obtém o nome do arquivo sem a extensão
-        return nome_arquivo, extrair_areas_conhecimento(etree.parse(file_path).getroot())
+        nome_arquivo = nome_curriculo(file_path).split(".")[0]  # Obtém o nome do arquivo (ou do ZIP) sem a extensão
+        with etapa('analise') as registro, abrir_xml(file_path) as arquivo:
+            root = analisar(arquivo)
+            registro['bytes'] = arquivo.tell()
+        return nome_arquivo, extrair_areas_conhecimento(root)
     except Exception as e:
         print(f"Erro ao processar {file_path}: {e}")
         return "Erro ao processar arquivo", set()
@@ -12,7 +22,7 @@ def extrair_informacoes_orientador(file_path):
 def extrair_areas_conhecimento(root):
     areas_conhecimento = set()
 
-    areas = root.xpath("//AREA-DO-CONHECIMENTO-1")
+    areas = buscar(root, ".//AREA-DO-CONHECIMENTO-1")
     for area in areas:
         nome_area = area.get("NOME-DA-AREA-DO-CONHECIMENTO")
         sub_area = area.get("NOME-DA-SUB-AREA-DO-CONHECIMENTO")
@@ -26,27 +36,30 @@ def extrair_areas_conhecimento(root):
 
     return areas_conhecimento
 
-# Pasta contendo os arquivos XML
-pasta_xml = r"C:\Users\radim\Desktop\ppgmmc"
+def main(processos=None):
+    # Pasta contendo os arquivos XML
+    pasta_xml = r"C:\Users\radim\Desktop\ppgmmc"
 
-# Lista para armazenar informações de orientadores e suas áreas de conhecimento
-orientadores_areas = []
+    # Lista para armazenar informações de orientadores e suas áreas de conhecimento
+    orientadores_areas = []
 
-# Iterar sobre os arquivos XML na pasta
-arquivos_xml = [arq for arq in os.listdir(pasta_xml) if arq.endswith(".xml")]
-print(f"Número de arquivos XML encontrados: {len(arquivos_xml)}")
+    # Iterar sobre os arquivos XML na pasta, distribuindo-os entre processos
+    arquivos_xml = listar_arquivos_xml(pasta_xml)
+    print(f"Número de arquivos XML encontrados: {len(arquivos_xml)}")
 
-for arquivo in arquivos_xml:
-    arquivo_path = os.path.join(pasta_xml, arquivo)
-    primeiro_nome, areas_conhecimento = extrair_informacoes_orientador(arquivo_path)
-    orientadores_areas.append((primeiro_nome, areas_conhecimento))
+    for arquivo_path, (primeiro_nome, areas_conhecimento) in processar_em_paralelo(extrair_informacoes_orientador, arquivos_xml, processos):
+        orientadores_areas.append((primeiro_nome, areas_conhecimento))
 
-# Verificar quantos orientadores foram processados
-print(f"Número de orientadores processados: {len(orientadores_areas)}")
+    # Verificar quantos orientadores foram processados
+    print(f"Número de orientadores processados: {len(orientadores_areas)}")
+    exibir_backend()
 
-# Exibir informações dos orientadores e suas áreas de conhecimento no terminal
-for i, (orientador, areas) in enumerate(orientadores_areas):
-    print(f"Orientador {i+1}: {orientador}")
-    for area in areas:
-        print(f"  - {area}")
-    print("-----\n")
+    # Exibir informações dos orientadores e suas áreas de conhecimento no terminal
+    for i, (orientador, areas) in enumerate(orientadores_areas):
+        print(f"Orientador {i+1}: {orientador}")
+        for area in areas:
+            print(f"  - {area}")
+        print("-----\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#####################################################################
+# Motor de extração em passagem única para currículos Lattes. Em vez de
+# executar um `findall`/`iter` por métrica, o arquivo XML é percorrido uma
+# única vez com `iterparse` e todos os contadores são preenchidos durante a
+# leitura. As funções de cada script derivam suas contagens do dicionário
+# de métricas retornado por `extrair_metricas`.
+#
+# A leitura é feita em memória constante: cada elemento é descartado (e
+# retirado do pai) assim que seus atributos e seu texto são consumidos, de
+# modo que o pico de memória por currículo não depende do tamanho do
+# arquivo, apenas das métricas coletadas.
+#####################################################################
+
+import os
+import sys
+from collections import Counter
+
+from fontes_xml import abrir_xml
+from analisador_xml import iterar_eventos, liberar
+from perfil_execucao import etapa
+
+# Versão do formato das métricas; deve ser incrementada sempre que o conteúdo extraído mudar
+VERSAO_METRICAS = 6
+
+# Com LATTES_ARVORE=1, os scripts que ainda têm a versão com a árvore completa (numero_eventos,
+# numero_artigos) a usam em vez da passagem única em fluxo
+ARVORE_COMPLETA = os.environ.get('LATTES_ARVORE', '').strip() == '1'
+
+# Tags cujas contagens dependem do valor do atributo NATUREZA
+TAGS_COM_NATUREZA = {
+    'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO'
+}
+
+# Dados básicos cuja contagem também é feita por ano (ver cubo_atividades), com o atributo do ano;
+# DADOS-BASICOS-DO-ARTIGO conta apenas dentro de ARTIGO-PUBLICADO (não nos artigos aceitos)
+TAGS_COM_ANO = {
+    'DADOS-BASICOS-DO-ARTIGO': 'ANO-DO-ARTIGO',
+    'DADOS-BASICOS-DO-LIVRO': 'ANO',
+    'DADOS-BASICOS-DO-CAPITULO': 'ANO',
+    'DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-MESTRADO': 'ANO',
+    'DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO': 'ANO',
+    'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS': 'ANO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA': 'ANO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO': 'ANO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO': 'ANO',
+    'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO': 'ANO',
+    'DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO': 'ANO',
+    'DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO': 'ANO',
+    'DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO': 'ANO',
+    'DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO': 'ANO'
+}
+
+# Seções cujas áreas do conhecimento são coletadas (equivalente a findall('.//SECAO') seguido de findall('.//AREA-DO-CONHECIMENTO-1'))
+SECOES_AREAS = ['GRADUACAO', 'MESTRADO', 'DOUTORADO', 'POS-DOUTORADO', 'LINHA-DE-PESQUISA']
+
+# Atributos com os nomes de uma área, na ordem (grande área, área, sub-área, especialidade)
+ATRIBUTOS_AREA = (
+    'NOME-GRANDE-AREA-DO-CONHECIMENTO',
+    'NOME-DA-AREA-DO-CONHECIMENTO',
+    'NOME-DA-SUB-AREA-DO-CONHECIMENTO',
+    'NOME-DA-ESPECIALIDADE'
+)
+
+# Função para ler os nomes de uma área como tupla de textos internados (None quando ausentes)
+def ler_area(elem):
+    return tuple(None if valor is None else sys.intern(valor) for valor in map(elem.get, ATRIBUTOS_AREA))
+
+# Função para percorrer o arquivo XML uma única vez e coletar todas as contagens
+def extrair_metricas(xml_file):
+    with etapa('extracao', xml_file) as registro, abrir_xml(xml_file) as arquivo:
+        metricas = _percorrer(arquivo)
+        registro['bytes'] = arquivo.tell()
+    return metricas
+
+# Função para percorrer os eventos de um arquivo XML aberto (binário)
+def _percorrer(arquivo):
+    tags = Counter()       # Ocorrências de cada tag abaixo da raiz (equivalente a findall('.//TAG'))
+    caminhos = Counter()   # Ocorrências de (pai, tag) abaixo da raiz (equivalente a findall('.//PAI/TAG'))
+    naturezas = Counter()  # Ocorrências de (tag, NATUREZA) para as tags de TAGS_COM_NATUREZA
+    anos = Counter()       # Ocorrências de (tag, NATUREZA ou '', ano) para as tags de TAGS_COM_ANO
+    disciplinas = set()    # Textos de ATIVIDADES-DE-ENSINO/ENSINO/DISCIPLINA
+    artigos = []           # Autores (nome, nome para citação, ID CNPq), fator de impacto e percentil de cada ARTIGO-PUBLICADO
+    areas = {secao: [] for secao in SECOES_AREAS}
+    areas_atuacao = []     # Áreas de AREAS-DE-ATUACAO/AREA-DE-ATUACAO
+    eventos_por_ano = {}   # ANO dos DADOS-BASICOS de cada PARTICIPACAO-EM-CONGRESSO, na ordem do documento
+    eventos_sem_dados = 0  # Participações em congresso sem DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO
+
+    identificador = ''
+    data_atualizacao = ''
+    nome_completo = ''     # NOME-COMPLETO de DADOS-GERAIS
+    nomes_citacao = ''     # NOME-EM-CITACOES-BIBLIOGRAFICAS de DADOS-GERAIS (variações separadas por ';')
+
+    pilha = []
+    elementos = []  # Elementos abertos, para retirar cada elemento consumido do pai
+    artigo_atual = None
+    congressos = []  # Para cada PARTICIPACAO-EM-CONGRESSO aberta: se os dados básicos já foram lidos
+
+    for evento, elem in iterar_eventos(arquivo):
+        tag = elem.tag
+        if evento == 'start':
+            if pilha:
+                tags[tag] += 1
+                if len(pilha) > 1:
+                    caminhos[(pilha[-1], tag)] += 1
+                if tag in TAGS_COM_NATUREZA:
+                    naturezas[(tag, elem.get('NATUREZA', ''))] += 1
+                if tag in TAGS_COM_ANO and (tag != 'DADOS-BASICOS-DO-ARTIGO' or pilha[-1] == 'ARTIGO-PUBLICADO'):
+                    natureza = elem.get('NATUREZA', '') if tag in TAGS_COM_NATUREZA else ''
+                    anos[(tag, natureza, elem.get(TAGS_COM_ANO[tag], ''))] += 1
+
+                if tag == 'DADOS-GERAIS' and len(pilha) == 1:
+                    nome_completo = elem.get('NOME-COMPLETO', '')
+                    nomes_citacao = elem.get('NOME-EM-CITACOES-BIBLIOGRAFICAS', '')
+                elif tag == 'ARTIGO-PUBLICADO':
+                    artigo_atual = {'autores': [], 'citacoes': [], 'ids_cnpq': [], 'fator_impacto': None, 'percentil': None}
+                    artigos.append(artigo_atual)
+                elif tag == 'AUTORES' and artigo_atual is not None:
+                    # Listas paralelas, usadas na resolução dos nomes dos coautores (ver resolucao_autores)
+                    artigo_atual['autores'].append(elem.get('NOME-COMPLETO-DO-AUTOR', 'N/A'))
+                    artigo_atual['citacoes'].append(elem.get('NOME-PARA-CITACAO', ''))
+                    artigo_atual['ids_cnpq'].append(elem.get('NRO-ID-CNPQ', ''))
+                elif tag == 'AREA-DO-CONHECIMENTO-1':
+                    area = ler_area(elem)
+                    # Cada seção ancestral (exceto a raiz) recebe a área, como no findall aninhado
+                    for ancestral in pilha[1:]:
+                        if ancestral in areas:
+                            areas[ancestral].append(area)
+                elif tag == 'AREA-DE-ATUACAO' and pilha[-1] == 'AREAS-DE-ATUACAO':
+                    areas_atuacao.append(ler_area(elem))
+                elif tag == 'PARTICIPACAO-EM-CONGRESSO':
+                    congressos.append(False)
+                elif tag == 'DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO' and pilha[-1] == 'PARTICIPACAO-EM-CONGRESSO' and not congressos[-1]:
+                    # Apenas o primeiro filho com os dados básicos conta, como no find
+                    congressos[-1] = True
+                    ano = elem.get('ANO', 'Ano desconhecido')
+                    eventos_por_ano[ano] = eventos_por_ano.get(ano, 0) + 1
+            else:
+                identificador = elem.get('NUMERO-IDENTIFICADOR', '')
+                data_atualizacao = elem.get('DATA-ATUALIZACAO', '')
+            pilha.append(tag)
+            elementos.append(elem)
+        else:
+            pilha.pop()
+            elementos.pop()
+            if tag == 'ARTIGO-PUBLICADO':
+                artigo_atual = None
+            elif tag == 'PARTICIPACAO-EM-CONGRESSO' and pilha:
+                if not congressos.pop():
+                    eventos_sem_dados += 1
+            elif tag == 'DISCIPLINA' and len(pilha) > 2 and pilha[-1] == 'ENSINO' and pilha[-2] == 'ATIVIDADES-DE-ENSINO':
+                disciplinas.add(elem.text)
+            elif artigo_atual is not None:
+                if tag == 'FACTOR-DE-IMPACTO' and artigo_atual['fator_impacto'] is None:
+                    artigo_atual['fator_impacto'] = elem.text
+                elif tag == 'PERCENTIL' and artigo_atual['percentil'] is None:
+                    artigo_atual['percentil'] = elem.text
+            if elementos:
+                liberar(elem, elementos[-1])
+
+    return {
+        'identificador': identificador,
+        'data_atualizacao': data_atualizacao,
+        'nome_completo': nome_completo,
+        'nomes_citacao': nomes_citacao,
+        'tags': tags,
+        'caminhos': caminhos,
+        'naturezas': naturezas,
+        'anos': anos,
+        'disciplinas': disciplinas,
+        'artigos': artigos,
+        'areas': areas,
+        'areas_atuacao': areas_atuacao,
+        'eventos_por_ano': eventos_por_ano,
+        'eventos_sem_dados': eventos_sem_dados
+    }
+
+# Função para contar as ocorrências de uma tag com determinada NATUREZA
+def contar_por_natureza(metricas, tag, natureza, maiusculas=False):
+    total = 0
+    for (tag_atual, natureza_atual), quantidade in metricas['naturezas'].items():
+        if tag_atual != tag:
+            continue
+        if maiusculas:
+            natureza_atual = natureza_atual.upper()
+        if natureza_atual == natureza:
+            total += quantidade
+    return total
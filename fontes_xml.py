@@ -0,0 +1,101 @@
+#####################################################################
+# Leitura de currículos diretamente de arquivos ZIP, sem extração para o
+# disco. Um currículo dentro de um ZIP é identificado pelo caminho do ZIP,
+# seguido de '!' e do nome do membro, por exemplo:
+#
+#     C:\dados\lattes.zip!CV123.xml
+#
+# Esses caminhos são listados junto com os arquivos XML comuns (pastas com
+# um ZIP por currículo ou ZIPs com muitos currículos) e podem ser passados a
+# qualquer função que receba o caminho de um XML. `abrir_xml` devolve um
+# arquivo binário que descompacta o membro sob demanda, de modo que a
+# memória usada não depende do tamanho do ZIP. Cada processo mantém os ZIPs
+# abertos, e membros diferentes podem ser lidos por processos diferentes.
+#####################################################################
+
+import os
+import zipfile
+
+SEPARADOR_ZIP = '!'
+
+# Caminho do ZIP -> (tamanho, data de modificação, processo, ZipFile aberto)
+_zips = {}
+
+# Caminho do ZIP -> (tamanho, data de modificação, quantidade de membros XML), para `nome_curriculo`
+_quantidades_zip = {}
+
+# Função para separar um caminho em (arquivo no disco, membro do ZIP ou None)
+def separar_caminho(caminho):
+    posicao = caminho.lower().rfind('.zip' + SEPARADOR_ZIP)
+    if posicao < 0:
+        return caminho, None
+    return caminho[:posicao + 4], caminho[posicao + 5:]
+
+# Função para obter o ZIP aberto, reabrindo-o se o arquivo mudou no disco
+# (ou se o processo atual foi criado por fork: a posição no arquivo seria compartilhada)
+def _abrir_zip(caminho_zip):
+    info = os.stat(caminho_zip)
+    chave = (info.st_size, info.st_mtime_ns, os.getpid())
+    entrada = _zips.get(caminho_zip)
+    if entrada is not None and entrada[:3] == chave:
+        return entrada[3]
+    if entrada is not None and entrada[2] == os.getpid():
+        entrada[3].close()
+    arquivo_zip = zipfile.ZipFile(caminho_zip)
+    _zips[caminho_zip] = chave + (arquivo_zip,)
+    return arquivo_zip
+
+# Função para abrir um currículo (arquivo XML ou membro de ZIP) como arquivo binário
+def abrir_xml(caminho):
+    caminho_disco, membro = separar_caminho(caminho)
+    if membro is None:
+        return open(caminho_disco, 'rb')
+    try:
+        return _abrir_zip(caminho_disco).open(membro)
+    except KeyError:
+        raise FileNotFoundError(f"Membro não encontrado no ZIP: {caminho}")
+
+# Função para obter (tamanho, versão) de um currículo, usada para detectar alterações
+def estado_xml(caminho):
+    caminho_disco, membro = separar_caminho(caminho)
+    if membro is None:
+        info = os.stat(caminho_disco)
+        return info.st_size, info.st_mtime_ns
+    try:
+        info_membro = _abrir_zip(caminho_disco).getinfo(membro)
+    except KeyError:
+        raise FileNotFoundError(f"Membro não encontrado no ZIP: {caminho}")
+    return info_membro.file_size, (info_membro.CRC, info_membro.date_time)
+
+# Função para listar os membros XML de um ZIP, com o tamanho descompactado de cada um
+def listar_membros_zip(caminho_zip):
+    try:
+        arquivo_zip = _abrir_zip(caminho_zip)
+    except zipfile.BadZipFile:
+        print(f"Arquivo ZIP inválido: {caminho_zip}")
+        return []
+    return [(caminho_zip + SEPARADOR_ZIP + info.filename, info.file_size)
+            for info in arquivo_zip.infolist()
+            if not info.is_dir() and info.filename.lower().endswith('.xml')]
+
+# Função para obter a quantidade de membros XML de um ZIP, contada uma vez por versão do arquivo
+def _quantidade_membros_xml(caminho_zip):
+    info = os.stat(caminho_zip)
+    chave = (info.st_size, info.st_mtime_ns)
+    entrada = _quantidades_zip.get(caminho_zip)
+    if entrada is None or entrada[:2] != chave:
+        entrada = chave + (len(listar_membros_zip(caminho_zip)),)
+        _quantidades_zip[caminho_zip] = entrada
+    return entrada[2]
+
+# Função para obter o nome de exibição de um currículo: o nome do arquivo XML ou, para um ZIP com
+# um único currículo (o formato de download individual do Lattes), o nome do ZIP
+def nome_curriculo(caminho):
+    caminho_disco, membro = separar_caminho(caminho)
+    if membro is not None and _quantidade_membros_xml(caminho_disco) == 1:
+        return os.path.basename(caminho_disco)
+    return os.path.basename(membro if membro is not None else caminho_disco)
+
+# Função para indicar se um caminho é um arquivo ZIP
+def eh_zip(caminho):
+    return caminho.lower().endswith('.zip')
@@ -0,0 +1,385 @@
+#####################################################################
+# Gerador de corpus sintético de currículos Lattes, guiado pelo XSD
+# distribuído com o repositório. Como currículos reais não podem ser
+# versionados, este gerador produz pastas com qualquer quantidade de XML
+# para medir o desempenho dos scripts (ver benchmark_corpus.py).
+#
+# O XSD define a ordem dos filhos de cada elemento, os atributos emitidos
+# (todos os declarados, como nos currículos exportados pela Plataforma
+# Lattes), os valores das enumerações e o número máximo de ocorrências.
+# CAMINHOS lista os elementos emitidos a partir da raiz; um caminho que não
+# exista no XSD é rejeitado. As quantidades de cada elemento repetido
+# (artigos, autores, orientações, bancas, congressos, áreas...) são
+# sorteadas nas faixas de QUANTIDADES_PADRAO, que podem ser substituídas.
+# Os currículos "gigantes" multiplicam as faixas dos elementos de
+# ESCALA_GIGANTE, imitando pesquisadores seniores com milhares de itens.
+#
+# A geração é determinística: cada currículo usa uma semente derivada da
+# semente do corpus e do seu índice, independente do número de processos.
+#####################################################################
+
+import os
+import json
+import random
+import unicodedata
+from functools import partial
+from xml.sax.saxutils import escape, quoteattr
+
+from executor_corpus import processar_em_paralelo
+from extrator_metricas import ATRIBUTOS_AREA
+from import_tags_xml import CAMINHO_XSD, ler_esquema
+
+# Manifesto gravado na pasta do corpus (permite reaproveitar um corpus já gerado)
+MANIFESTO = 'corpus_sintetico.json'
+
+PRIMEIRO_IDENTIFICADOR = 1000000000000000
+
+# Elementos emitidos, a partir de CURRICULO-VITAE
+CAMINHOS = (
+    'DADOS-GERAIS/FORMACAO-ACADEMICA-TITULACAO/GRADUACAO',
+    'DADOS-GERAIS/FORMACAO-ACADEMICA-TITULACAO/ESPECIALIZACAO',
+    'DADOS-GERAIS/FORMACAO-ACADEMICA-TITULACAO/MESTRADO/AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1',
+    'DADOS-GERAIS/FORMACAO-ACADEMICA-TITULACAO/DOUTORADO/AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1',
+    'DADOS-GERAIS/FORMACAO-ACADEMICA-TITULACAO/POS-DOUTORADO/AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1',
+    'DADOS-GERAIS/ATUACOES-PROFISSIONAIS/ATUACAO-PROFISSIONAL/ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO/PESQUISA-E-DESENVOLVIMENTO/LINHA-DE-PESQUISA/AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1',
+    'DADOS-GERAIS/ATUACOES-PROFISSIONAIS/ATUACAO-PROFISSIONAL/ATIVIDADES-DE-ENSINO/ENSINO/DISCIPLINA',
+    'DADOS-GERAIS/ATUACOES-PROFISSIONAIS/ATUACAO-PROFISSIONAL/ATIVIDADES-DE-SERVICO-TECNICO-ESPECIALIZADO/SERVICO-TECNICO-ESPECIALIZADO',
+    'DADOS-GERAIS/ATUACOES-PROFISSIONAIS/ATUACAO-PROFISSIONAL/ATIVIDADES-DE-EXTENSAO-UNIVERSITARIA/EXTENSAO-UNIVERSITARIA',
+    'DADOS-GERAIS/ATUACOES-PROFISSIONAIS/ATUACAO-PROFISSIONAL/ATIVIDADES-DE-TREINAMENTO-MINISTRADO/TREINAMENTO-MINISTRADO',
+    'DADOS-GERAIS/AREAS-DE-ATUACAO/AREA-DE-ATUACAO',
+    'DADOS-GERAIS/IDIOMAS/IDIOMA',
+    'DADOS-GERAIS/PREMIOS-TITULOS/PREMIO-TITULO',
+    'PRODUCAO-BIBLIOGRAFICA/ARTIGOS-PUBLICADOS/ARTIGO-PUBLICADO/DADOS-BASICOS-DO-ARTIGO',
+    'PRODUCAO-BIBLIOGRAFICA/ARTIGOS-PUBLICADOS/ARTIGO-PUBLICADO/DETALHAMENTO-DO-ARTIGO',
+    'PRODUCAO-BIBLIOGRAFICA/ARTIGOS-PUBLICADOS/ARTIGO-PUBLICADO/AUTORES',
+    'PRODUCAO-BIBLIOGRAFICA/ARTIGOS-PUBLICADOS/ARTIGO-PUBLICADO/AREAS-DO-CONHECIMENTO/AREA-DO-CONHECIMENTO-1',
+    'PRODUCAO-BIBLIOGRAFICA/LIVROS-E-CAPITULOS/LIVROS-PUBLICADOS-OU-ORGANIZADOS/LIVRO-PUBLICADO-OU-ORGANIZADO/DADOS-BASICOS-DO-LIVRO',
+    'PRODUCAO-BIBLIOGRAFICA/LIVROS-E-CAPITULOS/CAPITULOS-DE-LIVROS-PUBLICADOS/CAPITULO-DE-LIVRO-PUBLICADO/DADOS-BASICOS-DO-CAPITULO',
+    'PRODUCAO-TECNICA/SOFTWARE/DADOS-BASICOS-DO-SOFTWARE',
+    'PRODUCAO-TECNICA/PATENTE/DADOS-BASICOS-DA-PATENTE',
+    'PRODUCAO-TECNICA/TRABALHO-TECNICO/DADOS-BASICOS-DO-TRABALHO-TECNICO',
+    'OUTRA-PRODUCAO/ORIENTACOES-CONCLUIDAS/ORIENTACOES-CONCLUIDAS-PARA-MESTRADO/DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-MESTRADO',
+    'OUTRA-PRODUCAO/ORIENTACOES-CONCLUIDAS/ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO/DADOS-BASICOS-DE-ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO',
+    'OUTRA-PRODUCAO/ORIENTACOES-CONCLUIDAS/OUTRAS-ORIENTACOES-CONCLUIDAS/DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS',
+    'DADOS-COMPLEMENTARES/PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO/PARTICIPACAO-EM-BANCA-DE-GRADUACAO/DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO',
+    'DADOS-COMPLEMENTARES/PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO/PARTICIPACAO-EM-BANCA-DE-MESTRADO/DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO',
+    'DADOS-COMPLEMENTARES/PARTICIPACAO-EM-BANCA-TRABALHOS-CONCLUSAO/PARTICIPACAO-EM-BANCA-DE-DOUTORADO/DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO',
+    'DADOS-COMPLEMENTARES/PARTICIPACAO-EM-EVENTOS-CONGRESSOS/PARTICIPACAO-EM-CONGRESSO/DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO',
+    'DADOS-COMPLEMENTARES/ORIENTACOES-EM-ANDAMENTO/ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO/DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO',
+    'DADOS-COMPLEMENTARES/ORIENTACOES-EM-ANDAMENTO/ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO/DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO',
+    'DADOS-COMPLEMENTARES/ORIENTACOES-EM-ANDAMENTO/ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO/DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO',
+    'DADOS-COMPLEMENTARES/ORIENTACOES-EM-ANDAMENTO/ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA/DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'
+)
+
+# Faixa (mínimo, máximo) de ocorrências de cada elemento por elemento pai; os demais ocorrem uma vez
+QUANTIDADES_PADRAO = {
+    'GRADUACAO': (1, 2),
+    'ESPECIALIZACAO': (0, 1),
+    'MESTRADO': (0, 1),
+    'DOUTORADO': (0, 1),
+    'POS-DOUTORADO': (0, 1),
+    'ATUACAO-PROFISSIONAL': (1, 3),
+    'PESQUISA-E-DESENVOLVIMENTO': (0, 3),
+    'LINHA-DE-PESQUISA': (1, 2),
+    'ENSINO': (0, 5),
+    'DISCIPLINA': (1, 3),
+    'SERVICO-TECNICO-ESPECIALIZADO': (0, 2),
+    'EXTENSAO-UNIVERSITARIA': (0, 2),
+    'TREINAMENTO-MINISTRADO': (0, 2),
+    'AREA-DE-ATUACAO': (1, 5),
+    'IDIOMA': (1, 3),
+    'PREMIO-TITULO': (0, 4),
+    'ARTIGO-PUBLICADO': (0, 40),
+    'AUTORES': (1, 6),
+    'LIVRO-PUBLICADO-OU-ORGANIZADO': (0, 2),
+    'CAPITULO-DE-LIVRO-PUBLICADO': (0, 5),
+    'SOFTWARE': (0, 2),
+    'PATENTE': (0, 1),
+    'TRABALHO-TECNICO': (0, 4),
+    'ORIENTACOES-CONCLUIDAS-PARA-MESTRADO': (0, 8),
+    'ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO': (0, 4),
+    'OUTRAS-ORIENTACOES-CONCLUIDAS': (0, 12),
+    'PARTICIPACAO-EM-BANCA-DE-GRADUACAO': (0, 15),
+    'PARTICIPACAO-EM-BANCA-DE-MESTRADO': (0, 10),
+    'PARTICIPACAO-EM-BANCA-DE-DOUTORADO': (0, 5),
+    'PARTICIPACAO-EM-CONGRESSO': (0, 25),
+    'ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO': (0, 3),
+    'ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO': (0, 3),
+    'ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO': (0, 3),
+    'ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA': (0, 3)
+}
+
+# Elementos cujas quantidades são multiplicadas nos currículos gigantes
+ESCALA_GIGANTE = {
+    'ARTIGO-PUBLICADO', 'CAPITULO-DE-LIVRO-PUBLICADO', 'PARTICIPACAO-EM-CONGRESSO', 'ENSINO',
+    'PESQUISA-E-DESENVOLVIMENTO', 'AREA-DE-ATUACAO',
+    'ORIENTACOES-CONCLUIDAS-PARA-MESTRADO', 'ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO', 'OUTRAS-ORIENTACOES-CONCLUIDAS',
+    'PARTICIPACAO-EM-BANCA-DE-GRADUACAO', 'PARTICIPACAO-EM-BANCA-DE-MESTRADO', 'PARTICIPACAO-EM-BANCA-DE-DOUTORADO',
+    'ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO',
+    'ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO', 'ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'
+}
+
+# Valores de atributos de texto livre no XSD que os scripts comparam com valores fixos
+VALORES_ATRIBUTOS = {
+    ('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA', 'NATUREZA'): ('Iniciação Científica',) * 3 + ('Outra',),
+    ('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO', 'NATUREZA'): ('Graduação',) * 3 + ('Outra',),
+    ('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'NATUREZA'): ('Dissertação de mestrado',) * 3 + ('Outra',),
+    ('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO', 'NATUREZA'): ('Tese de doutorado',) * 3 + ('Outra',)
+}
+
+# Elementos fora do XSD lidos pelos scripts (p_producao lê o fator de impacto e o percentil de cada artigo)
+EXTRAS = {
+    'ARTIGO-PUBLICADO': (
+        ('FACTOR-DE-IMPACTO', lambda aleatorio: f"{aleatorio.uniform(0, 8):.3f}"),
+        ('PERCENTIL', lambda aleatorio: str(aleatorio.randint(1, 100)))
+    )
+}
+
+# Elementos com conteúdo de texto
+TEXTOS = {
+    'DISCIPLINA': lambda aleatorio: f"Disciplina {aleatorio.randint(1, 300)}"
+}
+
+# Áreas do conhecimento sorteadas (grande área, área, sub-área, especialidade)
+AREAS = (
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Matemática', 'Matemática Aplicada', 'Análise Numérica'),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Matemática', 'Álgebra', ''),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Matemática', 'Análise', 'Equações Diferenciais'),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Probabilidade e Estatística', 'Estatística', ''),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Ciência da Computação', 'Metodologia e Técnicas da Computação', 'Banco de Dados'),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Ciência da Computação', 'Sistemas de Computação', ''),
+    ('CIENCIAS_EXATAS_E_DA_TERRA', 'Física', 'Física da Matéria Condensada', ''),
+    ('ENGENHARIAS', 'Engenharia Elétrica', 'Telecomunicações', ''),
+    ('ENGENHARIAS', 'Engenharia Mecânica', 'Fenômenos de Transporte', ''),
+    ('CIENCIAS_HUMANAS', 'Educação', 'Ensino-Aprendizagem', ''),
+    ('CIENCIAS_HUMANAS', 'Educação', 'Tópicos Específicos de Educação', 'Educação Matemática'),
+    ('CIENCIAS_AGRARIAS', 'Agronomia', 'Fitotecnia', '')
+)
+
+PRIMEIROS_NOMES = ('João', 'Maria', 'José', 'Ana', 'Pedro', 'Luiza', 'Carlos', 'Fernanda', 'Paulo', 'Márcia',
+                   'Antônio', 'Cláudia', 'Luís', 'Patrícia', 'Gilberto', 'Sônia')
+SOBRENOMES = ('Silva', 'Souza', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Ferreira', 'Gonçalves', 'Müller',
+              'Marchi', 'Ávila', 'Rodrigues', 'Almeida', 'Costa', 'Schmidt', 'Frantz')
+
+# Quantidade de pessoas distintas que podem aparecer como autores
+TOTAL_AUTORES = 20000
+
+PALAVRAS = ('modelagem', 'ensino', 'otimização', 'análise', 'projeto', 'sistemas', 'redes', 'dados',
+            'matemática', 'computação', 'educação', 'simulação', 'controle', 'algoritmos')
+
+# Função para criar um nó do modelo para um filho declarado no XSD
+def _novo_no(esquema, pai, tag):
+    return {'tag': tag, 'minimo': esquema[pai]['minimos'][tag], 'maximo': esquema[pai]['maximos'][tag], 'filhos': {}}
+
+# Função para montar a árvore de elementos emitidos a partir de CAMINHOS, validada e ordenada pelo XSD
+def montar_modelo(esquema, caminhos=CAMINHOS, raiz='CURRICULO-VITAE'):
+    modelo = {'tag': raiz, 'minimo': 1, 'maximo': 1, 'filhos': {}}
+    for caminho in caminhos:
+        no = modelo
+        for tag in caminho.split('/'):
+            if tag not in esquema[no['tag']]['maximos']:
+                raise ValueError(f"Caminho fora do XSD: {caminho} ({no['tag']} não declara {tag})")
+            no = no['filhos'].setdefault(tag, _novo_no(esquema, no['tag'], tag))
+
+    # Os filhos obrigatórios no XSD são incluídos e passam a ser listas na ordem em que o XSD os declara
+    pendentes = [modelo]
+    while pendentes:
+        no = pendentes.pop()
+        for tag, minimo in esquema[no['tag']]['minimos'].items():
+            if minimo > 0 and tag not in no['filhos']:
+                no['filhos'][tag] = _novo_no(esquema, no['tag'], tag)
+        ordem = esquema[no['tag']]['filhos']
+        no['filhos'] = sorted(no['filhos'].values(), key=lambda filho: ordem.index(filho['tag']))
+        no['atributos'] = esquema[no['tag']]['atributos']
+        pendentes.extend(no['filhos'])
+    return modelo
+
+# Função para remover os acentos de um nome
+def _sem_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+# Função para descrever uma pessoa (nome completo, nome para citação, ID CNPq) a partir do seu número
+def descrever_autor(numero):
+    primeiro = PRIMEIROS_NOMES[numero % len(PRIMEIROS_NOMES)]
+    meio = SOBRENOMES[(numero // len(PRIMEIROS_NOMES)) % len(SOBRENOMES)]
+    ultimo = SOBRENOMES[(numero // (len(PRIMEIROS_NOMES) * len(SOBRENOMES))) % len(SOBRENOMES)]
+    nome = f"{primeiro} {meio} {ultimo}"
+    citacao = f"{_sem_acentos(ultimo).upper()}, {primeiro[0]}. {meio[0]}."
+    return nome, citacao, str(PRIMEIRO_IDENTIFICADOR + numero)
+
+# Função para sortear os atributos de AUTORES, com as variações de grafia encontradas nos currículos
+def _autor(aleatorio):
+    # Poucas pessoas concentram a maior parte das coautorias
+    numero = int(aleatorio.paretovariate(1.1)) % TOTAL_AUTORES
+    nome, citacao, identificador = descrever_autor(numero)
+    variacao = aleatorio.random()
+    if variacao < 0.15:
+        nome = _sem_acentos(nome).upper()
+    elif variacao < 0.25:
+        nome = citacao
+    return {
+        'NOME-COMPLETO-DO-AUTOR': nome,
+        'NOME-PARA-CITACAO': citacao,
+        'NRO-ID-CNPQ': identificador if aleatorio.random() < 0.5 else ''
+    }
+
+# Função para sortear uma data DDMMAAAA
+def _data(aleatorio, contexto):
+    return f"{aleatorio.randint(1, 28):02d}{aleatorio.randint(1, 12):02d}{aleatorio.randint(*contexto['anos'])}"
+
+# Função para obter os atributos específicos de um elemento (os demais são sorteados de forma genérica)
+def _atributos_especiais(tag, aleatorio, contexto):
+    if tag in ('AREA-DO-CONHECIMENTO-1', 'AREA-DE-ATUACAO'):
+        # Cada currículo concentra a maior parte das áreas em duas áreas "próprias"
+        area = aleatorio.choice(contexto['areas_proprias'] if aleatorio.random() < 0.8 else AREAS)
+        return dict(zip(ATRIBUTOS_AREA, area))
+    if tag == 'AUTORES':
+        return _autor(aleatorio)
+    if tag == 'CURRICULO-VITAE':
+        return {
+            'SISTEMA-ORIGEM-XML': 'LATTES_OFFLINE',
+            'NUMERO-IDENTIFICADOR': f"{PRIMEIRO_IDENTIFICADOR + contexto['indice']:016d}",
+            'FORMATO-DATA-ATUALIZACAO': 'DDMMAAAA',
+            'DATA-ATUALIZACAO': _data(aleatorio, contexto),
+            'FORMATO-HORA-ATUALIZACAO': 'HHMMSS',
+            'HORA-ATUALIZACAO': f"{aleatorio.randint(0, 23):02d}{aleatorio.randint(0, 59):02d}00"
+        }
+    if tag == 'DADOS-GERAIS':
+        nome, citacao, _ = descrever_autor(contexto['indice'] % TOTAL_AUTORES)
+        return {'NOME-COMPLETO': nome, 'NOME-EM-CITACOES-BIBLIOGRAFICAS': citacao}
+    return None
+
+# Função para sortear o valor de um atributo a partir do seu nome e da sua enumeração no XSD
+def _valor_atributo(tag, atributo, enumeracao, aleatorio, contexto):
+    valores = VALORES_ATRIBUTOS.get((tag, atributo))
+    if valores:
+        return aleatorio.choice(valores)
+    if enumeracao:
+        return aleatorio.choice(enumeracao)
+    if atributo.startswith('ANO'):
+        return str(aleatorio.randint(*contexto['anos']))
+    if atributo.startswith('MES'):
+        return str(aleatorio.randint(1, 12))
+    if atributo.startswith('DATA'):
+        return _data(aleatorio, contexto)
+    if atributo.startswith(('SEQUENCIA', 'ORDEM')):
+        return str(aleatorio.randint(1, 50))
+    # Nos currículos reais, boa parte dos atributos opcionais fica vazia
+    if not contexto['preencher'] or aleatorio.random() < 0.5:
+        return ''
+    return aleatorio.choice(PALAVRAS)
+
+# Função para sortear a quantidade de ocorrências de um elemento
+def _quantidade(no, aleatorio, contexto):
+    faixa = contexto['quantidades'].get(no['tag'])
+    if faixa is None:
+        return 1
+    minimo, maximo = faixa
+    if contexto['gigante'] and no['tag'] in ESCALA_GIGANTE:
+        maximo *= contexto['fator_gigante']
+        minimo = maximo // 2
+    # A quantidade sorteada respeita os limites minOccurs/maxOccurs do XSD
+    quantidade = max(aleatorio.randint(minimo, maximo), no['minimo'])
+    return quantidade if no['maximo'] is None else min(quantidade, no['maximo'])
+
+# Função para emitir um elemento e seus filhos
+def _emitir(no, aleatorio, partes, contexto):
+    tag = no['tag']
+    especiais = _atributos_especiais(tag, aleatorio, contexto) or {}
+    atributos = []
+    for nome, enumeracao in no['atributos']:
+        valor = especiais[nome] if nome in especiais else _valor_atributo(tag, nome, enumeracao, aleatorio, contexto)
+        atributos.append(f' {nome}={quoteattr(valor)}')
+    atributos = ''.join(atributos)
+    extras = EXTRAS.get(tag, ())
+    texto = TEXTOS.get(tag)
+
+    if not no['filhos'] and not extras and texto is None:
+        partes.append(f'<{tag}{atributos}/>')
+        return
+
+    partes.append(f'<{tag}{atributos}>')
+    if texto is not None:
+        partes.append(escape(texto(aleatorio)))
+    for filho in no['filhos']:
+        for _ in range(_quantidade(filho, aleatorio, contexto)):
+            _emitir(filho, aleatorio, partes, contexto)
+    for extra, gerador in extras:
+        partes.append(f'<{extra}>{gerador(aleatorio)}</{extra}>')
+    partes.append(f'</{tag}>')
+
+# Função para gerar o conteúdo (bytes ISO-8859-1) de um currículo
+def gerar_curriculo(indice, modelo, quantidades=None, gigante=False, fator_gigante=50, semente=0,
+                    preencher=True, anos=(1995, 2024)):
+    aleatorio = random.Random(semente * 1000003 + indice)
+    contexto = {
+        'indice': indice,
+        'quantidades': QUANTIDADES_PADRAO if quantidades is None else quantidades,
+        'gigante': gigante,
+        'fator_gigante': fator_gigante,
+        'preencher': preencher,
+        'anos': anos,
+        'areas_proprias': aleatorio.sample(AREAS, 2)
+    }
+    partes = ['<?xml version="1.0" encoding="ISO-8859-1" standalone="no" ?>\n']
+    _emitir(modelo, aleatorio, partes, contexto)
+    return ''.join(partes).encode('iso-8859-1', errors='xmlcharrefreplace')
+
+# Função para o nome do arquivo de um currículo do corpus
+def nome_arquivo(indice):
+    return f"cv{indice:06d}.xml"
+
+# Função para gerar e gravar um currículo (executada nos processos do corpus)
+def _gravar_curriculo(indice, diretorio, modelo, gigantes, configuracao):
+    conteudo = gerar_curriculo(indice, modelo, gigante=indice in gigantes, **configuracao)
+    with open(os.path.join(diretorio, nome_arquivo(indice)), 'wb') as arquivo:
+        arquivo.write(conteudo)
+    return len(conteudo)
+
+# Função para gerar um corpus sintético em uma pasta; um corpus idêntico já gerado é reaproveitado
+def gerar_corpus(diretorio, total, quantidades=None, gigantes=0, fator_gigante=50, semente=0,
+                 preencher=True, processos=None, caminho_xsd=CAMINHO_XSD):
+    configuracao = {
+        'quantidades': QUANTIDADES_PADRAO if quantidades is None else quantidades,
+        'fator_gigante': fator_gigante,
+        'semente': semente,
+        'preencher': preencher
+    }
+    parametros = dict(configuracao, total=total, gigantes=gigantes,
+                      quantidades={tag: list(faixa) for tag, faixa in configuracao['quantidades'].items()})
+
+    caminho_manifesto = os.path.join(diretorio, MANIFESTO)
+    if os.path.exists(caminho_manifesto):
+        with open(caminho_manifesto, encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+        if manifesto['parametros'] == parametros:
+            return manifesto
+
+    os.makedirs(diretorio, exist_ok=True)
+    modelo = montar_modelo(ler_esquema(caminho_xsd))
+
+    # Os gigantes são sorteados pela semente do corpus e agendados primeiro (maior peso)
+    indices_gigantes = frozenset(random.Random(semente).sample(range(total), min(gigantes, total)))
+    tarefas = [(indice, fator_gigante if indice in indices_gigantes else 1) for indice in range(total)]
+    gravar = partial(_gravar_curriculo, diretorio=diretorio, modelo=modelo,
+                     gigantes=indices_gigantes, configuracao=configuracao)
+    tamanhos = processar_em_paralelo(gravar, tarefas, processos)
+
+    manifesto = {
+        'parametros': parametros,
+        'gigantes': sorted(nome_arquivo(indice) for indice in indices_gigantes),
+        'bytes': sum(tamanho for _, tamanho in tamanhos)
+    }
+    with open(caminho_manifesto, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    return manifesto
+
+def main(processos=None):
+    diretorio = 'corpus_sintetico'
+    total = 100
+    manifesto = gerar_corpus(diretorio, total, gigantes=2, processos=processos)
+    print(f"Corpus sintético: {total} currículos em {diretorio} ({manifesto['bytes'] / 1e6:.1f} MB)")
+    print(f"Currículos gigantes: {', '.join(manifesto['gigantes'])}")
+
+if __name__ == "__main__":
+    main()
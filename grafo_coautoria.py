@@ -0,0 +1,349 @@
+#####################################################################
+# Grafo de coautoria de todo o corpus, a partir dos autores de cada
+# ARTIGO-PUBLICADO (métrica 'artigos' do extrator, lida do armazém). Cada
+# autor é um nó com identificador inteiro compacto, identificado pela chave
+# resolvida de resolucao_autores (as grafias do mesmo autor são um único
+# nó); dois autores do mesmo artigo são ligados por uma aresta cujo peso é
+# o número de artigos em comum (um artigo listado em dois currículos conta
+# duas vezes). O dono de cada currículo é o autor com o NRO-ID-CNPQ do
+# próprio currículo ou, sem ele, o compatível com o NOME-COMPLETO ou com
+# os nomes para citação de DADOS-GERAIS.
+#
+# A contribuição de cada currículo (nós e arestas, como códigos inteiros
+# de pares) fica separada, de modo que um currículo alterado substitui
+# apenas a sua contribuição, sem ler os demais (ou quando a resolução dos
+# seus autores muda). A adjacência é montada em
+# formato CSR (indptr, indices, pesos) sob demanda e serve às consultas de
+# grau, de coautores distintos e de centralidade (grau e PageRank, por
+# iteração de potência sobre o CSR).
+#
+# O grafo é gravado em um arquivo .npz, com os nomes dos nós e os dados
+# de cada currículo em um JSON ao lado (como em similaridade_todos).
+#####################################################################
+
+import os
+import json
+import hashlib
+from collections import Counter
+from itertools import combinations
+import numpy as np
+
+from armazem_metricas import carregar_metricas
+from fontes_xml import estado_xml
+from resolucao_autores import resolver_corpus, resolver, autores_artigo, normalizar_nome, bloco, compativeis
+from perfil_execucao import medir
+
+GRAFO_PADRAO = 'grafo_coautoria.npz'
+
+# Os pares (u, v), com u < v, são codificados como u * 2**32 + v
+_DESLOCAMENTO = np.int64(32)
+_MASCARA = np.int64(0xFFFFFFFF)
+
+# Função para criar um grafo vazio
+def novo_grafo():
+    return {
+        'chaves': [],       # Identificador do nó -> chave resolvida do autor (ver resolucao_autores)
+        'nomes': [],        # Identificador do nó -> nome do autor (o primeiro NOME-COMPLETO-DO-AUTOR encontrado)
+        'ids': {},          # Chave resolvida -> identificador do nó
+        'por_nome': {},     # Nome do autor, como aparece nos artigos -> identificador do nó
+        'curriculos': {},   # Caminho do currículo -> contribuição (ver _contribuicao)
+        'csr': None         # Adjacência montada sob demanda (descartada a cada alteração)
+    }
+
+# Função para obter o identificador do nó de um autor (pela chave resolvida), criando o nó se necessário
+def _no(grafo, chave, nome):
+    no = grafo['ids'].get(chave)
+    if no is None:
+        no = grafo['ids'][chave] = len(grafo['chaves'])
+        grafo['chaves'].append(chave)
+        grafo['nomes'].append(nome)
+    grafo['por_nome'].setdefault(nome, no)
+    return no
+
+# Função para resolver os autores de cada artigo de um currículo: [[(chave, nome)] por artigo], com a resolução
+# do corpus (`chaves_autores`) ou, com menções fora dela, no contexto do próprio currículo
+def _autores_resolvidos(metricas, chaves_autores=None):
+    artigos = [list(autores_artigo(artigo)) for artigo in metricas['artigos']]
+    entradas = {entrada for autores in artigos for _, entrada in autores}
+    if chaves_autores is None or not all(entrada in chaves_autores for entrada in entradas):
+        chaves_autores = resolver(entradas)
+    return [[(chaves_autores[entrada], nome) for nome, entrada in autores] for autores in artigos]
+
+# Função para calcular a assinatura das chaves resolvidas dos autores de um currículo (detecta mudanças da
+# resolução sem alteração do arquivo)
+def _assinatura(artigos):
+    resumo = hashlib.blake2b(digest_size=16)
+    for autores in artigos:
+        resumo.update(('\t'.join(chave for chave, _ in autores) + '\n').encode('utf-8'))
+    return resumo.hexdigest()
+
+# Função para obter a chave do dono de um currículo entre os autores dos seus artigos: a do NRO-ID-CNPQ do
+# próprio currículo ou, sem ela, a chave com mais artigos entre as formas compatíveis com o NOME-COMPLETO de
+# DADOS-GERAIS e, só se nenhuma for, com um dos NOME-EM-CITACOES-BIBLIOGRAFICAS (None se o dono não aparece)
+def _chave_dono(metricas, artigos):
+    if metricas['identificador'] and ('id:' + metricas['identificador']) in {chave for autores in artigos for chave, _ in autores}:
+        return 'id:' + metricas['identificador']
+
+    formas_artigos = [(forma, chave) for artigo, autores in zip(metricas['artigos'], artigos)
+                      for (_, (forma, _)), (chave, _) in zip(autores_artigo(artigo), autores)]
+    for nomes_dono in ([metricas.get('nome_completo', '')], metricas.get('nomes_citacao', '').split(';')):
+        formas_dono = {normalizar_nome(nome) for nome in nomes_dono} - {None}
+        candidatas = Counter(chave for forma, chave in formas_artigos
+                             if any(bloco(forma) == bloco(forma_dono) and compativeis(forma, forma_dono)
+                                    for forma_dono in formas_dono))
+        if candidatas:
+            return min(candidatas, key=lambda chave: (-candidatas[chave], chave))
+    return None
+
+# Função para normalizar o estado de um arquivo (tamanho, versão) para a forma gravada em JSON
+def _normalizar_estado(estado):
+    return json.loads(json.dumps(estado))
+
+# Função para calcular a contribuição de um currículo: seus nós, o dono e as arestas (códigos e pesos)
+def _contribuicao(grafo, metricas, estado, chaves_autores=None):
+    artigos = _autores_resolvidos(metricas, chaves_autores)
+    pares = []
+    presentes = set()
+    for autores in artigos:
+        nos = sorted({_no(grafo, chave, nome) for chave, nome in autores})
+        presentes.update(nos)
+        pares.extend((u << 32) | v for u, v in combinations(nos, 2))
+
+    codigos, pesos = np.unique(np.array(pares, dtype=np.int64), return_counts=True)
+    chave_dono = _chave_dono(metricas, artigos)
+    return {
+        'estado': _normalizar_estado(estado),
+        'assinatura': _assinatura(artigos),
+        'nos': np.array(sorted(presentes), dtype=np.int32),
+        'dono': -1 if chave_dono is None else grafo['ids'][chave_dono],
+        'codigos': codigos,
+        'pesos': pesos.astype(np.int32)
+    }
+
+# Função para incluir (ou substituir) a contribuição de um currículo
+def atualizar_curriculo(grafo, caminho, metricas, estado=None, chaves_autores=None):
+    estado = estado_xml(caminho) if estado is None else estado
+    grafo['curriculos'][caminho] = _contribuicao(grafo, metricas, estado, chaves_autores)
+    grafo['csr'] = None
+
+# Função para retirar a contribuição de um currículo (os nós continuam, sem as arestas dele)
+def remover_curriculo(grafo, caminho):
+    if grafo['curriculos'].pop(caminho, None) is not None:
+        grafo['csr'] = None
+
+# Função para atualizar o grafo com as métricas do corpus ({caminho: métricas}) e a resolução dos autores do
+# corpus: apenas os currículos novos, alterados ou com autores resolvidos de outra forma são refeitos, e os que
+# saíram do corpus são retirados
+@medir('metrica')
+def atualizar_grafo(grafo, metricas_por_arquivo, chaves_autores=None):
+    resumo = {'atualizados': 0, 'mantidos': 0, 'removidos': 0}
+    for caminho, metricas in metricas_por_arquivo.items():
+        if metricas is None:
+            continue
+        estado = estado_xml(caminho)
+        contribuicao = grafo['curriculos'].get(caminho)
+        if (contribuicao is not None and contribuicao['estado'] == _normalizar_estado(estado)
+                and contribuicao['assinatura'] == _assinatura(_autores_resolvidos(metricas, chaves_autores))):
+            resumo['mantidos'] += 1
+            continue
+        atualizar_curriculo(grafo, caminho, metricas, estado, chaves_autores)
+        resumo['atualizados'] += 1
+
+    for caminho in [caminho for caminho in grafo['curriculos'] if metricas_por_arquivo.get(caminho) is None]:
+        remover_curriculo(grafo, caminho)
+        resumo['removidos'] += 1
+    return resumo
+
+# Função para montar a adjacência CSR (simétrica) somando as arestas de todos os currículos
+def _montar_csr(grafo):
+    n = len(grafo['nomes'])
+    contribuicoes = list(grafo['curriculos'].values())
+    codigos = np.concatenate([c['codigos'] for c in contribuicoes] or [np.zeros(0, dtype=np.int64)])
+    pesos = np.concatenate([c['pesos'] for c in contribuicoes] or [np.zeros(0, dtype=np.int32)])
+
+    codigos, inverso = np.unique(codigos, return_inverse=True)
+    pesos = np.bincount(inverso, weights=pesos, minlength=len(codigos)).astype(np.int64)
+    u = (codigos >> _DESLOCAMENTO).astype(np.int32)
+    v = (codigos & _MASCARA).astype(np.int32)
+
+    origem = np.concatenate([u, v])
+    destino = np.concatenate([v, u])
+    ordem = np.lexsort((destino, origem))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origem, minlength=n), out=indptr[1:])
+    return {
+        'indptr': indptr,
+        'indices': destino[ordem],
+        'pesos': np.concatenate([pesos, pesos])[ordem],
+        'linhas': origem[ordem]  # Nó de origem de cada entrada (para os produtos matriz-vetor)
+    }
+
+# Função para obter a adjacência CSR do grafo, montando-a se necessário
+def csr(grafo):
+    if grafo['csr'] is None:
+        grafo['csr'] = _montar_csr(grafo)
+    return grafo['csr']
+
+# Função para obter o grau (quantidade de coautores distintos) de todos os nós
+def graus(grafo):
+    return np.diff(csr(grafo)['indptr'])
+
+# Função para obter o grau ponderado (artigos em coautoria, somados por coautor) de todos os nós
+def forcas(grafo):
+    adjacencia = csr(grafo)
+    return np.bincount(adjacencia['linhas'], weights=adjacencia['pesos'], minlength=len(grafo['nomes']))
+
+# Função para obter o nó de um autor pela chave resolvida ou pelo nome, como aparece nos artigos (None se ausente)
+def no_autor(grafo, autor):
+    no = grafo['ids'].get(autor)
+    return grafo['por_nome'].get(autor) if no is None else no
+
+# Função para obter o grau de um autor pela chave ou pelo nome (0 se ausente)
+def grau(grafo, autor):
+    no = no_autor(grafo, autor)
+    return 0 if no is None else int(graus(grafo)[no])
+
+# Função para listar os coautores de um autor, com o número de artigos em comum, do maior para o menor
+def coautores(grafo, autor):
+    no = no_autor(grafo, autor)
+    if no is None:
+        return []
+    adjacencia = csr(grafo)
+    inicio, fim = adjacencia['indptr'][no], adjacencia['indptr'][no + 1]
+    vizinhos = adjacencia['indices'][inicio:fim]
+    pesos = adjacencia['pesos'][inicio:fim]
+    ordem = np.lexsort((vizinhos, -pesos))
+    return [(grafo['nomes'][vizinho], int(peso)) for vizinho, peso in zip(vizinhos[ordem], pesos[ordem])]
+
+# Função para contar os autores distintos (chaves resolvidas) dos artigos de um currículo
+def coautores_distintos(grafo, caminho):
+    contribuicao = grafo['curriculos'].get(caminho)
+    return 0 if contribuicao is None else len(contribuicao['nos'])
+
+# Função para obter o nó do dono de um currículo (-1 se o dono não aparece nos artigos)
+def no_orientador(grafo, caminho):
+    contribuicao = grafo['curriculos'].get(caminho)
+    return -1 if contribuicao is None else contribuicao['dono']
+
+# Função para calcular a centralidade de grau normalizada de todos os nós
+def centralidade_grau(grafo):
+    n = len(grafo['nomes'])
+    return graus(grafo) / (n - 1) if n > 1 else np.zeros(n)
+
+# Função para calcular o PageRank ponderado de todos os nós (iteração de potência sobre o CSR)
+def pagerank(grafo, amortecimento=0.85, iteracoes=100, tolerancia=1e-10):
+    n = len(grafo['nomes'])
+    if n == 0:
+        return np.zeros(0)
+    adjacencia = csr(grafo)
+    forca = forcas(grafo)
+    sem_arestas = forca == 0
+    # Peso de cada entrada normalizado pela força do nó de origem
+    transicao = adjacencia['pesos'] / forca[adjacencia['linhas']]
+
+    valores = np.full(n, 1.0 / n)
+    for _ in range(iteracoes):
+        recebido = np.bincount(adjacencia['indices'], weights=valores[adjacencia['linhas']] * transicao, minlength=n)
+        # Os nós sem arestas distribuem o seu valor igualmente entre todos
+        novos = (1 - amortecimento) / n + amortecimento * (recebido + valores[sem_arestas].sum() / n)
+        if np.abs(novos - valores).sum() < tolerancia:
+            return novos
+        valores = novos
+    return valores
+
+# Função para o caminho do JSON com os nomes e os currículos de um grafo salvo
+def _caminho_nomes(caminho):
+    return os.path.splitext(caminho)[0] + '_nomes.json'
+
+# Função para gravar o grafo: as contribuições concatenadas no .npz, os nomes e os currículos no JSON
+def salvar_grafo(grafo, caminho=GRAFO_PADRAO):
+    curriculos = list(grafo['curriculos'].items())
+    np.savez(caminho,
+             nos=np.concatenate([c['nos'] for _, c in curriculos] or [np.zeros(0, dtype=np.int32)]),
+             codigos=np.concatenate([c['codigos'] for _, c in curriculos] or [np.zeros(0, dtype=np.int64)]),
+             pesos=np.concatenate([c['pesos'] for _, c in curriculos] or [np.zeros(0, dtype=np.int32)]))
+    with open(_caminho_nomes(caminho), 'w', encoding='utf-8') as arquivo:
+        json.dump({
+            'chaves': grafo['chaves'],
+            'nomes': grafo['nomes'],
+            'por_nome': grafo['por_nome'],
+            'curriculos': [[caminho_cv, c['estado'], c['assinatura'], c['dono'], len(c['nos']), len(c['codigos'])]
+                           for caminho_cv, c in curriculos]
+        }, arquivo, ensure_ascii=False)
+
+# Função para abrir um grafo salvo (um grafo vazio se o arquivo não existir)
+def carregar_grafo(caminho=GRAFO_PADRAO):
+    grafo = novo_grafo()
+    if not os.path.exists(caminho) or not os.path.exists(_caminho_nomes(caminho)):
+        return grafo
+
+    with open(_caminho_nomes(caminho), encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if 'chaves' not in dados:
+        # Grafo gravado com os nomes sem resolução como nós: é refeito do zero
+        return grafo
+    grafo['chaves'] = dados['chaves']
+    grafo['nomes'] = dados['nomes']
+    grafo['ids'] = {chave: no for no, chave in enumerate(dados['chaves'])}
+    grafo['por_nome'] = dados['por_nome']
+
+    with np.load(caminho) as arrays:
+        nos, codigos, pesos = arrays['nos'], arrays['codigos'], arrays['pesos']
+    inicio_nos = inicio_arestas = 0
+    for caminho_cv, estado, assinatura, dono, total_nos, total_arestas in dados['curriculos']:
+        grafo['curriculos'][caminho_cv] = {
+            'estado': estado,
+            'assinatura': assinatura,
+            'nos': nos[inicio_nos:inicio_nos + total_nos],
+            'dono': dono,
+            'codigos': codigos[inicio_arestas:inicio_arestas + total_arestas],
+            'pesos': pesos[inicio_arestas:inicio_arestas + total_arestas]
+        }
+        inicio_nos += total_nos
+        inicio_arestas += total_arestas
+    return grafo
+
+# Função para construir (ou atualizar) o grafo salvo com os currículos de uma pasta
+def construir_grafo(pasta, caminho_grafo=GRAFO_PADRAO, processos=None, recursivo=False):
+    grafo = carregar_grafo(caminho_grafo)
+    metricas_por_arquivo, _ = carregar_metricas(pasta, processos=processos, recursivo=recursivo)
+    resolucao = resolver_corpus(metricas_por_arquivo)
+    resumo = atualizar_grafo(grafo, metricas_por_arquivo, resolucao['chaves'])
+    salvar_grafo(grafo, caminho_grafo)
+    return grafo, resumo
+
+def exibir_grafo(grafo, resumo, limite=10):
+    adjacencia = csr(grafo)
+    print("Grafo de Coautoria")
+    print("=" * 40)
+    print(f"Currículos: {len(grafo['curriculos'])} ({resumo['atualizados']} atualizados, "
+          f"{resumo['mantidos']} mantidos, {resumo['removidos']} removidos)")
+    print(f"Autores (nós): {len(grafo['nomes'])}")
+    print(f"Pares de coautores (arestas): {len(adjacencia['indices']) // 2}")
+
+    valores = pagerank(grafo)
+    grau_nos = graus(grafo)
+    print("\nAutores mais centrais (PageRank):")
+    for no in np.argsort(-valores, kind='stable')[:limite]:
+        print(f"  {grafo['nomes'][no]}: PageRank {valores[no]:.5f}, {grau_nos[no]} coautores")
+
+    print("\nOrientadores:")
+    for caminho, contribuicao in sorted(grafo['curriculos'].items()):
+        dono = contribuicao['dono']
+        if not len(contribuicao['nos']):
+            print(f"  {os.path.basename(caminho)}: sem artigos publicados")
+            continue
+        if dono < 0:
+            print(f"  {os.path.basename(caminho)}: dono do currículo não encontrado entre os autores dos artigos")
+            continue
+        print(f"  {os.path.basename(caminho)}: {grafo['nomes'][dono]}, {len(contribuicao['nos'])} autores distintos, "
+              f"grau {grau_nos[dono]}, PageRank {valores[dono]:.5f}")
+
+def main(processos=None):
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    grafo, resumo = construir_grafo(folder_path, processos=processos)
+    exibir_grafo(grafo, resumo)
+    print(f"Grafo gravado em {GRAFO_PADRAO}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#####################################################################
+# Índice invertido das áreas do conhecimento. Cada prefixo da hierarquia
+# (grande área), (grande área, área), (..., sub-área) e (..., especialidade)
+# aponta para os orientadores que o possuem, com o número de ocorrências.
+#
+# A soma de `p_similar.compare_areas` sobre todos os pares de áreas é igual à
+# soma, por prefixo comum, de peso_do_nível x ocorrências na referência x
+# ocorrências no orientador (pesos 1, 2, 3 e 5). Uma consulta percorre
+# apenas as listas dos prefixos da referência, sem comparar par a par.
+#####################################################################
+
+import os
+import sys
+import heapq
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+from matriz_caracteristicas import perfil_areas, PESOS_NIVEL
+
+# Função para criar um índice vazio
+def novo_indice():
+    return {
+        'postings': defaultdict(dict),    # prefixo -> {orientador: ocorrências}
+        'perfis': {}                       # orientador -> perfil de prefixos (para remoção)
+    }
+
+# Função para adicionar (ou atualizar) um orientador no índice
+def indexar_orientador(indice, orientador, perfil):
+    if orientador in indice['perfis']:
+        remover_orientador(indice, orientador)
+    for prefixo, quantidade in perfil.items():
+        indice['postings'][prefixo][orientador] = quantidade
+    indice['perfis'][orientador] = perfil
+
+# Função para retirar um orientador do índice
+def remover_orientador(indice, orientador):
+    for prefixo in indice['perfis'].pop(orientador, {}):
+        lista = indice['postings'][prefixo]
+        lista.pop(orientador, None)
+        if not lista:
+            del indice['postings'][prefixo]
+
+# Função para obter o perfil de áreas de um arquivo XML
+def perfil_arquivo(xml_file):
+    return perfil_areas(obter_metricas(xml_file))
+
+# Função para construir o índice com todos os arquivos XML de uma pasta
+# (os perfis são montados neste processo, pois os códigos de áreas são locais a ele)
+def construir_indice(folder_path, processos=None):
+    indice = novo_indice()
+    metricas_por_arquivo, _ = carregar_metricas(folder_path, processos=processos)
+    for xml_file, metricas in metricas_por_arquivo.items():
+        if metricas is not None:
+            indexar_orientador(indice, xml_file, perfil_areas(metricas))
+    return indice
+
+# Função para calcular a pontuação de similaridade de todos os orientadores com alguma área em comum
+def pontuar_referencia(indice, perfil_referencia):
+    pontuacoes = defaultdict(int)
+    for prefixo, quantidade in perfil_referencia.items():
+        lista = indice['postings'].get(prefixo)
+        if not lista:
+            continue
+        peso = PESOS_NIVEL[len(prefixo)] * quantidade
+        for orientador, ocorrencias in lista.items():
+            pontuacoes[orientador] += peso * ocorrencias
+    return pontuacoes
+
+# Função para obter os k orientadores mais similares (todos, se k for None), em ordem decrescente
+def consultar(indice, perfil_referencia, k=None):
+    pontuacoes = pontuar_referencia(indice, perfil_referencia)
+    # Empates ficam na ordem dos caminhos, como na ordenação estável de p_similar
+    chave = lambda item: (-item[1], item[0])
+    if k is None:
+        return sorted(pontuacoes.items(), key=chave)
+    return heapq.nsmallest(k, pontuacoes.items(), key=chave)
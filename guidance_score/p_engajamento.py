@@ -2,33 +2,40 @@
 #Este código analisa arquivos XML para calcular a pontuação de engajamento acadêmico com base em atividades de ensino, pesquisa e extensão. A função #`get_teaching_score` conta disciplinas únicas ensinadas, `get_research_score` conta atividades de pesquisa, e `get_extension_score` conta atividades de #extensão e serviços técnicos. A função `calculate_engagement_score` combina essas pontuações usando pesos definidos (`omega_e`, `omega_p`, `omega_x`). O #script percorre todos os arquivos XML em uma pasta especificada, calcula as pontuações para cada arquivo e exibe os resultados..
 #####################################################################
 
-import xml.etree.ElementTree as ET
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from executor_corpus import processar_corpus
+from contagem_bytes import contar_metricas, CONTAGEM_EM_BYTES
+from perfil_execucao import medir
+
+# Caminhos contados pelas pontuações de pesquisa e extensão (apenas contagens, ver contagem_bytes)
+CAMINHOS_PESQUISA_EXTENSAO = (
+    ('ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO', 'PESQUISA-E-DESENVOLVIMENTO'),
+    ('ATIVIDADES-DE-SERVICO-TECNICO-ESPECIALIZADO', 'SERVICO-TECNICO-ESPECIALIZADO'),
+    ('ATIVIDADES-DE-TREINAMENTO-MINISTRADO', 'TREINAMENTO-MINISTRADO'),
+    ('ATIVIDADES-DE-EXTENSAO-UNIVERSITARIA', 'EXTENSAO-UNIVERSITARIA')
+)
 
 # Função para extrair pontuação de ensino sem duplicar contagens
-def get_teaching_score(root):
-    disciplinas = set()  # Usar um conjunto para evitar duplicatas
-    for ensino in root.findall(".//ATIVIDADES-DE-ENSINO/ENSINO"):
-        for disciplina in ensino.findall("DISCIPLINA"):
-            disciplinas.add(disciplina.text)  # Adicionar o nome da disciplina ao conjunto
-    return len(disciplinas)  # Retornar o número de disciplinas únicas
+@medir('metrica')
+def get_teaching_score(metricas):
+    return len(metricas['disciplinas'])  # Retornar o número de disciplinas únicas
 
 # Função para extrair pontuação de pesquisa
-def get_research_score(root):
-    research_score = 0
-    for activity in root.findall(".//ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO/PESQUISA-E-DESENVOLVIMENTO"):
-        research_score += 1
-    return research_score
+@medir('metrica')
+def get_research_score(metricas):
+    return metricas['caminhos'][('ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO', 'PESQUISA-E-DESENVOLVIMENTO')]
 
 # Função para extrair pontuação de extensão
-def get_extension_score(root):
+@medir('metrica')
+def get_extension_score(metricas):
     extension_score = 0
-    for activity in root.findall(".//ATIVIDADES-DE-SERVICO-TECNICO-ESPECIALIZADO/SERVICO-TECNICO-ESPECIALIZADO"):
-        extension_score += 1
-    for training in root.findall(".//ATIVIDADES-DE-TREINAMENTO-MINISTRADO/TREINAMENTO-MINISTRADO"):
-        extension_score += 1
-    for extension in root.findall(".//ATIVIDADES-DE-EXTENSAO-UNIVERSITARIA/EXTENSAO-UNIVERSITARIA"):
-        extension_score += 1
+    extension_score += metricas['caminhos'][('ATIVIDADES-DE-SERVICO-TECNICO-ESPECIALIZADO', 'SERVICO-TECNICO-ESPECIALIZADO')]
+    extension_score += metricas['caminhos'][('ATIVIDADES-DE-TREINAMENTO-MINISTRADO', 'TREINAMENTO-MINISTRADO')]
+    extension_score += metricas['caminhos'][('ATIVIDADES-DE-EXTENSAO-UNIVERSITARIA', 'EXTENSAO-UNIVERSITARIA')]
     return extension_score
 
 # Função para calcular a pontuação de engajamento
@@ -43,24 +50,32 @@ omega_e = 0.4  # Peso para ensino
 omega_p = 0.4  # Peso para pesquisa
 omega_x = 0.2  # Peso para extensão
 
-# Iterar sobre todos os arquivos XML na pasta e subpastas
-for root_dir, sub_dirs, files in os.walk(directory_path):
-    for file in files:
-        if file.endswith(".xml"):
-            file_path = os.path.join(root_dir, file)
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            pe = get_teaching_score(root)
-            pp = get_research_score(root)
-            px = get_extension_score(root)
-            
-            engagement_score = calculate_engagement_score(omega_e, omega_p, omega_x, pe, pp, px)
+# Função para calcular as pontuações de engajamento de um arquivo XML
+@medir('pontuacao')
+def avaliar_arquivo(file_path):
+    if CONTAGEM_EM_BYTES:
+        # Os textos das disciplinas também são lidos em bytes
+        metricas = contar_metricas(file_path, caminhos=CAMINHOS_PESQUISA_EXTENSAO, disciplinas=True)
+    else:
+        metricas = obter_metricas(file_path)
+
+    pe = get_teaching_score(metricas)
+    pp = get_research_score(metricas)
+    px = get_extension_score(metricas)
+
+    engagement_score = calculate_engagement_score(omega_e, omega_p, omega_x, pe, pp, px)
+    return pe, pp, px, engagement_score
+
+def main(processos=None):
+    # Iterar sobre todos os arquivos XML na pasta e subpastas
+    for file_path, (pe, pp, px, engagement_score) in processar_corpus(avaliar_arquivo, directory_path, processos, recursivo=True):
+        # Exibir resultados para cada arquivo
+        print("Arquivo:", os.path.basename(file_path))
+        print("Pontuação de Ensino (PE):", pe)
+        print("Pontuação de Pesquisa (PP):", pp)
+        print("Pontuação de Extensão (PX):", px)
+        print("Pontuação de Engajamento:", engagement_score)
+        print()  # Linha em branco para separar resultados
 
-            # Exibir resultados para cada arquivo
-            print("Arquivo:", file)
-            print("Pontuação de Ensino (PE):", pe)
-            print("Pontuação de Pesquisa (PP):", pp)
-            print("Pontuação de Extensão (PX):", px)
-            print("Pontuação de Engajamento:", engagement_score)
-            print()  # Linha em branco para separar resultados
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
 import os
-import xml.etree.ElementTree as ET
-import numpy as np
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from extrator_metricas import contar_por_natureza
+from executor_corpus import processar_corpus
+from estatisticas_corpus import novo_esboco, adicionar_valor, calcular_percentil
+from perfil_execucao import medir
 
 # Função para contar orientações concluídas em um arquivo XML
+@medir('metrica')
 def count_orientacoes_concluidas(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_concluidas = {
         'iniciacao_cientifica': 0,
@@ -20,49 +26,31 @@ def count_orientacoes_concluidas(xml_file):
     }
 
     for termo_orientacao, categoria in orientacoes_map.items():
-        orientacoes_concluidas[categoria] += len(list(root.iter(termo_orientacao)))
+        orientacoes_concluidas[categoria] += metricas['tags'][termo_orientacao]
 
-    for orientacao in root.iter('DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'):
-        natureza = orientacao.attrib.get('NATUREZA', '').upper()
-        if natureza == 'INICIACAO_CIENTIFICA':
-            orientacoes_concluidas['iniciacao_cientifica'] += 1
-        elif natureza == 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO':
-            orientacoes_concluidas['graduacao'] += 1
+    orientacoes_concluidas['iniciacao_cientifica'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'INICIACAO_CIENTIFICA', maiusculas=True)
+    orientacoes_concluidas['graduacao'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO', maiusculas=True)
 
     return orientacoes_concluidas
 
 # Função para contar orientações em andamento em um arquivo XML
+@medir('metrica')
 def count_orientacoes_andamento(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_andamento = {
-        'iniciacao_cientifica': 0,
-        'graduacao': 0,
-        'mestrado': 0,
-        'doutorado': 0
+        'iniciacao_cientifica': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA', 'Iniciação Científica'),
+        'graduacao': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO', 'Graduação'),
+        'mestrado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'Dissertação de mestrado'),
+        'doutorado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO', 'Tese de doutorado')
     }
 
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Iniciação Científica':
-            orientacoes_andamento['iniciacao_cientifica'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Graduação':
-            orientacoes_andamento['graduacao'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Dissertação de mestrado':
-            orientacoes_andamento['mestrado'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Tese de doutorado':
-            orientacoes_andamento['doutorado'] += 1
-
     return orientacoes_andamento
 
 # Função para calcular o fator de qualidade Q
@@ -70,6 +58,7 @@ def calcular_fator_qualidade(P_r, P_max):
     return P_r / P_max if P_max != 0 else 0
 
 # Função para calcular a pontuação de experiência baseada na equação fornecida
+@medir('pontuacao')
 def calcular_pontuacao_equacao(concluida, andamento, Q, pesos, limites):
     experiencia = {
         'graduacao': concluida['graduacao'] + andamento['graduacao'],
@@ -86,10 +75,9 @@ def calcular_pontuacao_equacao(concluida, andamento, Q, pesos, limites):
     return pe
 
 # Função para extrair o número de publicações de um arquivo XML
+@medir('metrica')
 def extrair_numero_publicacoes(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    return len(list(root.iter('ARTIGO-PUBLICADO')))
+    return obter_metricas(xml_file)['tags']['ARTIGO-PUBLICADO']
 
 # Caminho dos arquivos XML
 path = r'C:\Users\radim\Desktop\ppgmmc'
@@ -102,51 +90,54 @@ pesos = {
 }
 limites = [50, 30, 20]  # Limites superiores para graduação, mestrado e doutorado
 
-# Lista para armazenar o número de publicações de cada orientador
-numeros_publicacoes = []
-
-# Contadores para pastas e arquivos
-total_pastas = 0
-total_arquivos = 0
-
-# Processar cada arquivo XML para extrair o número de publicações
-for root_dir, dirs, files in os.walk(path):
-    total_pastas += len(dirs)
-    for xml_file in files:
-        if xml_file.endswith(".xml"):
-            full_path = os.path.join(root_dir, xml_file)
-            numeros_publicacoes.append(extrair_numero_publicacoes(full_path))
-            total_arquivos += 1
-
-# Calcular P_max como o percentil 90 dos números de publicações
-P_max = np.percentile(numeros_publicacoes, 90)
-print(f"P_max (Percentil 90 das publicações): {P_max}")
-
-# Processar cada arquivo XML novamente para calcular a pontuação de experiência
-for root_dir, dirs, files in os.walk(path):
-    for xml_file in files:
-        if xml_file.endswith(".xml"):
-            full_path = os.path.join(root_dir, xml_file)
-            orientador_nome = os.path.splitext(xml_file)[0]
-
-            concluida = count_orientacoes_concluidas(full_path)
-            andamento = count_orientacoes_andamento(full_path)
-
-            # Exemplo de número de publicações em revistas
-            P_r = extrair_numero_publicacoes(full_path)
-            Q = calcular_fator_qualidade(P_r, P_max)
-
-            pontuacao_experiencia = calcular_pontuacao_equacao(concluida, andamento, Q, pesos, limites)
-
-            # Imprimir informações no terminal para depuração
-            print(f"Orientador: {orientador_nome}")
-            print(f"Número de Artigos Publicados: {P_r}")
-            print(f"Experiência em Graduação: {concluida['graduacao'] + andamento['graduacao']}")
-            print(f"Experiência em Mestrado: {concluida['mestrado'] + andamento['mestrado']}")
-            print(f"Experiência em Doutorado: {concluida['doutorado'] + andamento['doutorado']}")
-            print(f"Pontuação da Experiência: {pontuacao_experiencia:.2f}")
-            print("-" * 40)
-
-# Imprimir o total de pastas e arquivos varridos
-print(f"Total de pastas varridas: {total_pastas}")
-print(f"Total de arquivos XML varridos: {total_arquivos}")
+# Função para extrair de um arquivo XML tudo o que a pontuação de experiência usa
+def extrair_experiencia(full_path):
+    return {
+        'P_r': extrair_numero_publicacoes(full_path),
+        'concluida': count_orientacoes_concluidas(full_path),
+        'andamento': count_orientacoes_andamento(full_path)
+    }
+
+def main(processos=None):
+    # Contadores para pastas e arquivos
+    total_pastas = sum(len(dirs) for _, dirs, _ in os.walk(path))
+
+    # Cada arquivo XML é lido uma única vez, em paralelo
+    dados = processar_corpus(extrair_experiencia, path, processos, recursivo=True)
+    total_arquivos = len(dados)
+
+    # Calcular P_max como o percentil 90 dos números de publicações, mantido em um esboço incremental
+    esboco_publicacoes = novo_esboco()
+    for _, dados_arquivo in dados:
+        adicionar_valor(esboco_publicacoes, dados_arquivo['P_r'])
+    P_max = calcular_percentil(esboco_publicacoes, 90)
+    print(f"P_max (Percentil 90 das publicações): {P_max}")
+
+    # Calcular a pontuação de experiência a partir dos dados já extraídos
+    for full_path, dados_arquivo in dados:
+        orientador_nome = os.path.splitext(os.path.basename(full_path))[0]
+
+        concluida = dados_arquivo['concluida']
+        andamento = dados_arquivo['andamento']
+
+        # Exemplo de número de publicações em revistas
+        P_r = dados_arquivo['P_r']
+        Q = calcular_fator_qualidade(P_r, P_max)
+
+        pontuacao_experiencia = calcular_pontuacao_equacao(concluida, andamento, Q, pesos, limites)
+
+        # Imprimir informações no terminal para depuração
+        print(f"Orientador: {orientador_nome}")
+        print(f"Número de Artigos Publicados: {P_r}")
+        print(f"Experiência em Graduação: {concluida['graduacao'] + andamento['graduacao']}")
+        print(f"Experiência em Mestrado: {concluida['mestrado'] + andamento['mestrado']}")
+        print(f"Experiência em Doutorado: {concluida['doutorado'] + andamento['doutorado']}")
+        print(f"Pontuação da Experiência: {pontuacao_experiencia:.2f}")
+        print("-" * 40)
+
+    # Imprimir o total de pastas e arquivos varridos
+    print(f"Total de pastas varridas: {total_pastas}")
+    print(f"Total de arquivos XML varridos: {total_arquivos}")
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,46 @@
 import os
-import xml.etree.ElementTree as ET
+import sys
+from functools import partial
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from executor_corpus import processar_corpus
+from perfil_execucao import medir
+
+@medir('metrica')
 def extrair_dados_publicacoes(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     publicacoes = []
-    for artigo in root.findall('.//ARTIGO-PUBLICADO'):
+    for artigo in metricas['artigos']:
         # Supondo que o fator de impacto e o percentil estão armazenados como atributos no XML
-        fator_impacto = float(artigo.find('.//FACTOR-DE-IMPACTO').text)
-        percentil = float(artigo.find('.//PERCENTIL').text)
+        fator_impacto = float(artigo['fator_impacto'])
+        percentil = float(artigo['percentil'])
         publicacoes.append((fator_impacto, percentil))
 
     return publicacoes
 
+@medir('pontuacao')
 def calcular_pontuacao_producao(publicacoes, h_index):
     pontuacao = 0
     for fator_impacto, percentil in publicacoes:
         pontuacao += fator_impacto * h_index * percentil
     return pontuacao
 
-def main():
+# Função para calcular a pontuação de produção de um arquivo XML
+def avaliar_arquivo(caminho_arquivo, h_index):
+    publicacoes = extrair_dados_publicacoes(caminho_arquivo)
+    return calcular_pontuacao_producao(publicacoes, h_index)
+
+def main(processos=None):
     diretorio_xml = r'C:\Users\radim\Desktop\ppgmmc'
     h_index = 10  # Suponha um h-index fixo ou calcule a partir dos dados
 
-    for arquivo in os.listdir(diretorio_xml):
-        if arquivo.endswith('.xml'):
-            caminho_arquivo = os.path.join(diretorio_xml, arquivo)
-            publicacoes = extrair_dados_publicacoes(caminho_arquivo)
-            pontuacao_producao = calcular_pontuacao_producao(publicacoes, h_index)
-
-            print(f"Arquivo: {arquivo}")
-            print(f"Pontuação da Produção Científica: {pontuacao_producao:.2f}")
-            print("-" * 40)
+    for caminho_arquivo, pontuacao_producao in processar_corpus(partial(avaliar_arquivo, h_index=h_index), diretorio_xml, processos):
+        print(f"Arquivo: {os.path.basename(caminho_arquivo)}")
+        print(f"Pontuação da Produção Científica: {pontuacao_producao:.2f}")
+        print("-" * 40)
 
 if __name__ == "__main__":
     main()
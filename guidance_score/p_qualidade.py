@@ -1,9 +1,16 @@
 import os
-import xml.etree.ElementTree as ET
+import sys
+from functools import partial
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from extrator_metricas import contar_por_natureza
+from executor_corpus import processar_corpus
+from perfil_execucao import medir
+
+@medir('metrica')
 def count_orientacoes_concluidas(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_concluidas = {
         'graduacao': 0,
@@ -17,40 +24,26 @@ def count_orientacoes_concluidas(xml_file):
     }
 
     for termo_orientacao, categoria in orientacoes_map.items():
-        orientacoes_concluidas[categoria] += len(list(root.iter(termo_orientacao)))
+        orientacoes_concluidas[categoria] += metricas['tags'][termo_orientacao]
 
-    for orientacao in root.iter('DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'):
-        natureza = orientacao.attrib.get('NATUREZA', '').upper()
-        if natureza == 'INICIACAO_CIENTIFICA':
-            orientacoes_concluidas['graduacao'] += 1
+    orientacoes_concluidas['graduacao'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'INICIACAO_CIENTIFICA', maiusculas=True)
 
     return orientacoes_concluidas
 
+@medir('metrica')
 def count_orientacoes_andamento(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_andamento = {
-        'graduacao': 0,
-        'mestrado': 0,
-        'doutorado': 0
+        'graduacao': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA', 'Iniciação Científica'),
+        'mestrado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'Dissertação de mestrado'),
+        'doutorado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO', 'Tese de doutorado')
     }
 
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Iniciação Científica':
-            orientacoes_andamento['graduacao'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Dissertação de mestrado':
-            orientacoes_andamento['mestrado'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Tese de doutorado':
-            orientacoes_andamento['doutorado'] += 1
-
     return orientacoes_andamento
 
 def calcular_taxa_conclusao(concluidas, andamento):
@@ -64,6 +57,7 @@ def calcular_taxa_conclusao(concluidas, andamento):
         taxas_conclusao[nivel] = taxa_conclusao
     return taxas_conclusao
 
+@medir('pontuacao')
 def calcular_pontuacao_qualidade(concluidas, andamento, pesos):
     taxas_conclusao = calcular_taxa_conclusao(concluidas, andamento)
     pontuacao_qualidade = 0
@@ -75,26 +69,28 @@ def calcular_pontuacao_qualidade(concluidas, andamento, pesos):
     
     return pontuacao_qualidade
 
-def processar_arquivos_xml(diretorio, pesos):
+def avaliar_arquivo(caminho_arquivo, pesos):
+    concluida = count_orientacoes_concluidas(caminho_arquivo)
+    andamento = count_orientacoes_andamento(caminho_arquivo)
+    pontuacao_qualidade = calcular_pontuacao_qualidade(concluida, andamento, pesos)
+
+    resultado = {
+        'arquivo': os.path.basename(caminho_arquivo),
+        'concluida': concluida,
+        'andamento': andamento,
+        'pontuacao_qualidade': pontuacao_qualidade
+    }
+    return resultado
+
+def processar_arquivos_xml(diretorio, pesos, processos=None):
     resultados = []
 
-    for arquivo in os.listdir(diretorio):
-        if arquivo.endswith('.xml'):
-            caminho_arquivo = os.path.join(diretorio, arquivo)
-            concluida = count_orientacoes_concluidas(caminho_arquivo)
-            andamento = count_orientacoes_andamento(caminho_arquivo)
-            pontuacao_qualidade = calcular_pontuacao_qualidade(concluida, andamento, pesos)
-            
-            resultado = {
-                'arquivo': arquivo,
-                'concluida': concluida,
-                'andamento': andamento,
-                'pontuacao_qualidade': pontuacao_qualidade
-            }
-            resultados.append(resultado)
+    for caminho_arquivo, resultado in processar_corpus(partial(avaliar_arquivo, pesos=pesos), diretorio, processos):
+        resultados.append(resultado)
 
     return resultados
 
+@medir('saida')
 def exibir_resultados_terminal(resultados):
     print("Pontuação da Qualidade por Nível de Orientação")
     print("=" * 40)
@@ -107,13 +103,15 @@ def exibir_resultados_terminal(resultados):
         print(f"  Pontuação de Qualidade: {resultado['pontuacao_qualidade']:.2f}")
         print("-" * 40)
 
+# Pesos por nível de orientação
+pesos = {
+    'graduacao': 1,
+    'mestrado': 2,
+    'doutorado': 3
+}
+
 def main():
     diretorio_xml = r'C:\Users\radim\Desktop\ppgmmc'
-    pesos = {
-        'graduacao': 1,
-        'mestrado': 2,
-        'doutorado': 3
-    }
     resultados = processar_arquivos_xml(diretorio_xml, pesos)
 
     if resultados:
@@ -1,93 +1,103 @@
 import os
-import xml.etree.ElementTree as ET
-from collections import defaultdict
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas, exibir_estatisticas
+from estatisticas_corpus import novo_esboco, adicionar_valor, minimo, maximo
+from resolucao_autores import resolver_corpus, coautores_resolvidos
+from analisador_xml import ErroXML
+from perfil_execucao import medir
 
 # Função para extrair participações em bancas
+@medir('metrica')
 def extract_participations(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
     
     participations = {
-        'graduacao': 0,
-        'mestrado': 0,
-        'doutorado': 0
+        'graduacao': metricas['tags']['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO'],
+        'mestrado': metricas['tags']['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO'],
+        'doutorado': metricas['tags']['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO']
     }
-    
-    for participacao in root.findall('.//DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO'):
-        participations['graduacao'] += 1
-    
-    for participacao in root.findall('.//DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO'):
-        participations['mestrado'] += 1
-    
-    for participacao in root.findall('.//DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO'):
-        participations['doutorado'] += 1
             
     total_participations = participations['graduacao'] + participations['mestrado'] + participations['doutorado']
     return total_participations
 
-# Função para extrair informações de coautores
-def extrair_coautores(xml_path):
+# Função para extrair informações de coautores (`chaves_autores`: resolução dos nomes no corpus)
+@medir('metrica')
+def extrair_coautores(xml_path, chaves_autores=None):
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        coautores = set()
-
-        # Buscar artigos publicados dentro de ARTIGOS-PUBLICADOS
-        for artigo in root.findall('.//ARTIGO-PUBLICADO'):
-            # Extrair nomes dos coautores
-            for autor in artigo.findall('.//AUTORES'):
-                nome_autor = autor.get('NOME-COMPLETO-DO-AUTOR', 'N/A')
-                coautores.add(nome_autor)
-
-        return len(coautores)
+        metricas = obter_metricas(xml_path)
+        # Coautores de cada ARTIGO-PUBLICADO, com as grafias do mesmo autor resolvidas para uma única chave
+        return len(coautores_resolvidos(metricas, chaves_autores))
 
-    except ET.ParseError as e:
+    except ErroXML as e:
         print(f"Erro ao analisar o arquivo XML: {xml_path}, erro: {e}")
         return 0
 
+# Pesos das participações em bancas (w1) e dos coautores (w2)
+w1 = 0.5
+w2 = 0.5
+
 # Função para calcular a pontuação de reputação
-def calcular_pontuacao(participacoes, coautores, min_b, max_b, min_c, max_c, w1=0.5, w2=0.5):
+@medir('pontuacao')
+def calcular_pontuacao(participacoes, coautores, min_b, max_b, min_c, max_c, w1=w1, w2=w2):
     normalized_b = (participacoes - min_b) / (max_b - min_b) if max_b > min_b else 0
     normalized_c = (coautores - min_c) / (max_c - min_c) if max_c > min_c else 0
     return w1 * normalized_b + w2 * normalized_c
 
+# Função para extrair participações e coautores de um arquivo XML
+def extrair_dados_reputacao(caminho_arquivo, chaves_autores=None):
+    return {
+        'Participacoes': extract_participations(caminho_arquivo),
+        'Coautores': extrair_coautores(caminho_arquivo, chaves_autores)
+    }
+
 # Caminho para a pasta contendo os arquivos XML
 caminho_pasta = r'C:\Users\radim\Desktop\ppgmmc'
 
-# Dicionário para armazenar os resultados por arquivo
-participacoes_list = []
-coautores_list = []
-resultados_por_arquivo = {}
+def main(processos=None):
+    # Esboços com a distribuição de participações e coautores, para min e max
+    esboco_participacoes = novo_esboco()
+    esboco_coautores = novo_esboco()
+
+    # Dicionário para armazenar os resultados por arquivo
+    resultados_por_arquivo = {}
+
+    # Verificar se a pasta existe e se contém arquivos XML
+    if os.path.exists(caminho_pasta):
+        # Apenas os arquivos novos ou alterados desde a última execução são extraídos novamente
+        metricas_por_arquivo, estatisticas = carregar_metricas(caminho_pasta, processos=processos)
+        # Os nomes dos coautores são resolvidos uma vez para o corpus inteiro
+        resolucao = resolver_corpus(metricas_por_arquivo)
+        for caminho_arquivo, metricas in metricas_por_arquivo.items():
+            if metricas is None:
+                continue
+            dados_arquivo = extrair_dados_reputacao(caminho_arquivo, resolucao['chaves'])
+            adicionar_valor(esboco_participacoes, dados_arquivo['Participacoes'])
+            adicionar_valor(esboco_coautores, dados_arquivo['Coautores'])
+            resultados_por_arquivo[os.path.basename(caminho_arquivo)] = dados_arquivo
+
+        # Calcular min e max
+        min_b = minimo(esboco_participacoes)
+        max_b = maximo(esboco_participacoes)
+        min_c = minimo(esboco_coautores)
+        max_c = maximo(esboco_coautores)
 
-# Verificar se a pasta existe e se contém arquivos XML
-if os.path.exists(caminho_pasta):
-    for arquivo in os.listdir(caminho_pasta):
-        if arquivo.endswith('.xml'):
-            caminho_arquivo = os.path.join(caminho_pasta, arquivo)
-            participacoes = extract_participations(caminho_arquivo)
-            coautores = extrair_coautores(caminho_arquivo)
-            participacoes_list.append(participacoes)
-            coautores_list.append(coautores)
-            resultados_por_arquivo[arquivo] = {
-                'Participacoes': participacoes,
-                'Coautores': coautores
-            }
+        # Calcular pontuações de reputação e imprimir resultados no terminal
+        for nome_arquivo, dados_arquivo in resultados_por_arquivo.items():
+            participacoes = dados_arquivo['Participacoes']
+            coautores = dados_arquivo['Coautores']
+            pontuacao = calcular_pontuacao(participacoes, coautores, min_b, max_b, min_c, max_c)
+            print(f"Arquivo XML: {nome_arquivo}")
+            print(f"Total de participações em bancas: {participacoes}")
+            print(f"Total de coautores: {coautores}")
+            print(f"Pontuação de reputação: {pontuacao:.2f}")
+            print("-" * 40)
 
-    # Calcular min e max
-    min_b = min(participacoes_list)
-    max_b = max(participacoes_list)
-    min_c = min(coautores_list)
-    max_c = max(coautores_list)
+        exibir_estatisticas(estatisticas)
+    else:
+        print(f"Pasta não encontrada: {caminho_pasta}")
 
-    # Calcular pontuações de reputação e imprimir resultados no terminal
-    for nome_arquivo, dados_arquivo in resultados_por_arquivo.items():
-        participacoes = dados_arquivo['Participacoes']
-        coautores = dados_arquivo['Coautores']
-        pontuacao = calcular_pontuacao(participacoes, coautores, min_b, max_b, min_c, max_c)
-        print(f"Arquivo XML: {nome_arquivo}")
-        print(f"Total de participações em bancas: {participacoes}")
-        print(f"Total de coautores: {coautores}")
-        print(f"Pontuação de reputação: {pontuacao:.2f}")
-        print("-" * 40)
-else:
-    print(f"Pasta não encontrada: {caminho_pasta}")
+if __name__ == "__main__":
+    main()
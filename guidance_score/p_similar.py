@@ -1,73 +1,50 @@
 import os
-import glob
-import xml.etree.ElementTree as ET
+import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+import tabela_areas
+from matriz_caracteristicas import perfil_areas
+import indice_areas
+from perfil_execucao import medir
+
+# Função para obter os códigos (da tabela de áreas) das áreas de formação de um arquivo XML
+@medir('metrica')
 def extract_knowledge_areas(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
     
     areas = []
+    for secao in ['GRADUACAO', 'MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']:
+        areas.extend(metricas['areas'][secao])
     
-    def get_areas_of_knowledge(element):
-        for area in element.findall('.//AREA-DO-CONHECIMENTO-1'):
-            grande_area = area.get("NOME-GRANDE-AREA-DO-CONHECIMENTO")
-            area_nome = area.get("NOME-DA-AREA-DO-CONHECIMENTO")
-            sub_area = area.get("NOME-DA-SUB-AREA-DO-CONHECIMENTO")
-            especialidade = area.get("NOME-DA-ESPECIALIDADE")
-            
-            areas.append({
-                'grande_area': grande_area,
-                'area': area_nome,
-                'sub_area': sub_area,
-                'especialidade': especialidade
-            })
-
-    for formacao in root.findall('.//GRADUACAO'):
-        get_areas_of_knowledge(formacao)
-
-    for formacao in root.findall('.//MESTRADO'):
-        get_areas_of_knowledge(formacao)
-
-    for formacao in root.findall('.//DOUTORADO'):
-        get_areas_of_knowledge(formacao)
-
-    for formacao in root.findall('.//POS-DOUTORADO'):
-        get_areas_of_knowledge(formacao)
-    
-    return areas
+    return tabela_areas.codificar_areas(areas)
 
+# Função para pontuar duas áreas (códigos da tabela de áreas) pela hierarquia em comum
 def compare_areas(area1, area2):
-    score = 0
-    if area1['grande_area'] == area2['grande_area']:
-        score += 1
-        if area1['area'] == area2['area']:
-            score += 2
-            if area1['sub_area'] == area2['sub_area']:
-                score += 3
-                if area1['especialidade'] == area2['especialidade']:
-                    score += 5
-    return score
-
-def main(reference_xml, folder_path):
-    reference_areas = extract_knowledge_areas(reference_xml)
-    xml_files = glob.glob(os.path.join(folder_path, '*.xml'))
+    return tabela_areas.comparar_areas(area1, area2)
+
+# Função para somar a pontuação entre as áreas de referência e as áreas de um arquivo XML
+@medir('pontuacao')
+def pontuar_arquivo(xml_file, reference_areas):
+    current_areas = extract_knowledge_areas(xml_file)
+    total_score = 0
+    for area1 in reference_areas:
+        for area2 in current_areas:
+            score = compare_areas(area1, area2)
+            total_score += score
+    return total_score
+
+def main(reference_xml, folder_path, processos=None, k=None, indice=None):
+    # O índice invertido pode ser construído uma vez e reaproveitado em várias consultas
+    if indice is None:
+        indice = indice_areas.construir_indice(folder_path, processos)
     results = []
 
-    for xml_file in xml_files:
-        current_areas = extract_knowledge_areas(xml_file)
-        total_score = 0
-        for area1 in reference_areas:
-            for area2 in current_areas:
-                score = compare_areas(area1, area2)
-                total_score += score
-        
-        if total_score > 0:
-            results.append({
-                'file_name': os.path.basename(xml_file),
-                'total_score': total_score
-            })
-
-    results.sort(key=lambda x: x['total_score'], reverse=True)
+    for xml_file, total_score in indice_areas.consultar(indice, perfil_areas(obter_metricas(reference_xml)), k):
+        results.append({
+            'file_name': os.path.basename(xml_file),
+            'total_score': total_score
+        })
 
     # Imprimir resultados no terminal
     print("Resultados da Comparação de Áreas de Conhecimento")
@@ -0,0 +1,153 @@
+#####################################################################
+# Calcula os seis critérios (engajamento, experiência, produção, qualidade,
+# reputação e similaridade) para todos os currículos de uma pasta. Cada
+# arquivo XML é lido do disco uma única vez e vira uma linha da matriz de
+# características; os normalizadores do corpus (P_max e min/max) vêm dos
+# esboços e os critérios são avaliados de forma vetorizada sobre a matriz
+# (ver `pontuacao_vetorizada.py`).
+#####################################################################
+
+import os
+import math
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+from matriz_caracteristicas import construir_matriz, perfil_areas, COLUNAS
+from cubo_atividades import construir_cubo, matriz_do_periodo
+from resolucao_autores import resolver_corpus
+from estatisticas_corpus import novo_esboco, adicionar_valor, calcular_percentil, minimo, maximo
+
+import pontuacao_vetorizada
+from perfil_execucao import medir
+
+# Critérios que usam colunas sem contagem por ano (ver cubo_atividades): não são avaliados em um período
+CRITERIOS_SEM_PERIODO = ('engajamento', 'producao', 'reputacao')
+
+# Posições, na linha da matriz de características, das colunas usadas pelos normalizadores
+_INDICE = {nome: posicao for posicao, nome in enumerate(COLUNAS)}
+
+# Função para obter os valores de um orientador em cada normalizador, a partir da sua linha da matriz
+# (também usada para atualizar os esboços quando um currículo muda, ver monitor_pastas)
+def valores_normalizadores(linha):
+    return {
+        'publicacoes': int(linha[_INDICE['artigos']]),
+        'participacoes': int(linha[_INDICE['bancas_graduacao']] + linha[_INDICE['bancas_mestrado']]
+                             + linha[_INDICE['bancas_doutorado']]),
+        'coautores': int(linha[_INDICE['coautores']])
+    }
+
+# Função para criar os esboços vazios dos normalizadores do corpus
+def novos_normalizadores():
+    return {
+        'publicacoes': novo_esboco(),
+        'participacoes': novo_esboco(),
+        'coautores': novo_esboco()
+    }
+
+# Função para construir os esboços dos normalizadores do corpus a partir da matriz de características
+def calcular_normalizadores(matriz):
+    normalizadores = novos_normalizadores()
+    for linha in matriz['valores']:
+        for nome, valor in valores_normalizadores(linha).items():
+            adicionar_valor(normalizadores[nome], valor)
+    return normalizadores
+
+# Função para obter P_max (percentil 90 das publicações) e os limites de min-max da reputação
+def calcular_limites(normalizadores):
+    P_max = calcular_percentil(normalizadores['publicacoes'], 90)
+    limites_reputacao = (minimo(normalizadores['participacoes']), maximo(normalizadores['participacoes']),
+                         minimo(normalizadores['coautores']), maximo(normalizadores['coautores']))
+    return P_max, limites_reputacao
+
+# Função para calcular todos os critérios de cada arquivo da pasta
+# (com `periodo` = (primeiro ano, último ano), as produções, orientações e bancas contam apenas esses anos, e
+# os critérios de CRITERIOS_SEM_PERIODO ficam None)
+@medir('pontuacao')
+def calcular_pontuacoes(pasta, reference_xml, h_index=10, processos=None, periodo=None):
+    # Cada arquivo é extraído uma única vez (ou lido do armazém) e vira uma linha da matriz
+    metricas_por_arquivo, _ = carregar_metricas(pasta, processos=processos, recursivo=True)
+    return pontuar_metricas(metricas_por_arquivo, reference_xml, h_index, periodo)
+
+# Função para calcular todos os critérios a partir das métricas já obtidas de cada arquivo ({caminho: métricas})
+def pontuar_metricas(metricas_por_arquivo, reference_xml, h_index=10, periodo=None):
+    # Os nomes dos coautores (coluna 'coautores') são resolvidos no corpus inteiro
+    resolucao = resolver_corpus(metricas_por_arquivo)
+    matriz = construir_matriz(metricas_por_arquivo, resolucao['chaves'])
+    if not matriz['nomes']:
+        return []
+    if periodo is None:
+        # Normalizadores do corpus, mantidos em esboços atualizados com os dados já extraídos
+        P_max, limites_reputacao = calcular_limites(calcular_normalizadores(matriz))
+    else:
+        # As colunas com contagem por ano são trocadas pelas somas do período, fatiadas do cubo de atividades;
+        # P_max vem das publicações do período e a reputação (coautores sem ano) não é avaliada
+        matriz = matriz_do_periodo(matriz, construir_cubo(metricas_por_arquivo), *periodo)
+        P_max, limites_reputacao = None, None
+
+    # Todos os critérios avaliados de uma vez sobre a matriz inteira
+    pontuacoes = pontuacao_vetorizada.calcular_todas(
+        matriz, perfil_areas(obter_metricas(reference_xml)), h_index, P_max, limites_reputacao)
+    if periodo is not None:
+        for criterio in CRITERIOS_SEM_PERIODO:
+            pontuacoes[criterio] = [None] * len(matriz['nomes'])
+
+    # O laço por orientador serve apenas para montar a exibição
+    resultados = []
+    for posicao, arquivo in enumerate(matriz['nomes']):
+        producao = pontuacoes['producao'][posicao]
+        resultados.append({
+            'arquivo': os.path.basename(arquivo),
+            'caminho': arquivo,
+            'engajamento': pontuacoes['engajamento'][posicao],
+            'experiencia': pontuacoes['experiencia'][posicao],
+            'producao': None if producao is None or math.isnan(producao) else producao,
+            'qualidade': pontuacoes['qualidade'][posicao],
+            'reputacao': pontuacoes['reputacao'][posicao],
+            'similaridade': int(pontuacoes['similaridade'][posicao]),
+            'periodo': periodo
+        })
+
+    return resultados
+
+@medir('saida')
+def exibir_resultados_terminal(resultados):
+    print("Pontuações por Critério")
+    print("=" * 40)
+
+    for resultado in resultados:
+        print(f"Arquivo: {resultado['arquivo']}")
+        if resultado['periodo'] is not None:
+            print(f"  Período: {resultado['periodo'][0]} a {resultado['periodo'][1]}")
+            print("  Engajamento: não avaliado no período")
+        else:
+            print(f"  Engajamento: {resultado['engajamento']:.2f}")
+        print(f"  Experiência: {resultado['experiencia']:.2f}")
+        if resultado['periodo'] is not None:
+            print("  Produção: não avaliada no período")
+        elif resultado['producao'] is None:
+            print("  Produção: dados de fator de impacto indisponíveis")
+        else:
+            print(f"  Produção: {resultado['producao']:.2f}")
+        print(f"  Qualidade: {resultado['qualidade']:.2f}")
+        if resultado['periodo'] is not None:
+            print("  Reputação: não avaliada no período")
+        else:
+            print(f"  Reputação: {resultado['reputacao']:.2f}")
+        print(f"  Similaridade: {resultado['similaridade']}")
+        print("-" * 40)
+
+def main(processos=None):
+    reference_xml = r'C:\Users\radim\Desktop\Miriam Ines Marchi.xml'
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    resultados = calcular_pontuacoes(folder_path, reference_xml, processos=processos)
+
+    if resultados:
+        exibir_resultados_terminal(resultados)
+        print(f"Total de arquivos XML analisados: {len(resultados)}")
+    else:
+        print("Nenhum arquivo XML encontrado no diretório.")
+
+if __name__ == "__main__":
+    main()
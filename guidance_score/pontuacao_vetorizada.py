@@ -0,0 +1,105 @@
+#####################################################################
+# Pontuação vetorizada dos seis critérios. Cada critério é avaliado como
+# uma expressão NumPy sobre a matriz de características inteira (uma linha
+# por orientador), reproduzindo as fórmulas de p_engajamento, p_experiencia,
+# p_producao, p_qualidade, p_reputacao e p_similar sem laço em Python por
+# orientador.
+#####################################################################
+
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from matriz_caracteristicas import coluna, PESOS_NIVEL
+
+import p_engajamento
+import p_experiencia
+import p_qualidade
+import p_reputacao
+from perfil_execucao import medir
+
+# Função para dividir elemento a elemento, com 0 onde o denominador é 0
+def _dividir(numerador, denominador):
+    return np.divide(numerador, denominador, out=np.zeros(np.broadcast(numerador, denominador).shape),
+                     where=denominador != 0)
+
+# Engajamento: omega_e * PE + omega_p * PP + omega_x * PX
+def pontuar_engajamento(matriz, omega_e, omega_p, omega_x):
+    return omega_e * coluna(matriz, 'disciplinas') + omega_p * coluna(matriz, 'pesquisa') + omega_x * coluna(matriz, 'extensao')
+
+# Experiência: soma ponderada das orientações por nível, multiplicada pelo fator de qualidade Q
+def pontuar_experiencia(matriz, pesos, limites, P_max=None):
+    artigos = coluna(matriz, 'artigos')
+    if P_max is None:
+        P_max = np.percentile(artigos, 90)
+    Q = artigos / P_max if P_max != 0 else np.zeros(len(artigos))
+
+    G, M, D = limites
+    graduacao = coluna(matriz, 'conc_tcc') + coluna(matriz, 'and_graduacao')
+    mestrado = coluna(matriz, 'conc_mestrado') + coluna(matriz, 'and_mestrado')
+    doutorado = coluna(matriz, 'conc_doutorado') + coluna(matriz, 'and_doutorado')
+
+    return ((graduacao * pesos['graduacao'] / G) +
+            (mestrado * pesos['mestrado'] / M) +
+            (doutorado * pesos['doutorado'] / D)) * Q
+
+# Produção: soma de fator de impacto x h-index x percentil (NaN quando os dados não existem no XML)
+def pontuar_producao(matriz, h_index):
+    return h_index * coluna(matriz, 'soma_fi_percentil')
+
+# Qualidade: taxa de conclusão ponderada por nível (com o mapeamento de níveis de p_qualidade)
+def pontuar_qualidade(matriz, pesos):
+    niveis = {
+        'graduacao': (coluna(matriz, 'conc_iniciacao'), coluna(matriz, 'and_iniciacao')),
+        'mestrado': (coluna(matriz, 'conc_mestrado'), coluna(matriz, 'and_mestrado')),
+        'doutorado': (coluna(matriz, 'conc_doutorado'), coluna(matriz, 'and_doutorado'))
+    }
+
+    pontuacao = np.zeros(len(matriz['nomes']))
+    for nivel, (concluidas, andamento) in niveis.items():
+        total = concluidas + andamento
+        taxa = _dividir(concluidas, total)
+        pontuacao += _dividir(pesos[nivel] * taxa * concluidas, total)
+    return pontuacao
+
+# Reputação: bancas e coautores normalizados por min-max no corpus
+# (limites = (min_b, max_b, min_c, max_c) já conhecidos, por exemplo mantidos em esboços)
+def pontuar_reputacao(matriz, w1, w2, limites=None):
+    bancas = coluna(matriz, 'bancas_graduacao') + coluna(matriz, 'bancas_mestrado') + coluna(matriz, 'bancas_doutorado')
+    coautores = coluna(matriz, 'coautores')
+    if limites is None:
+        limites = (bancas.min(), bancas.max(), coautores.min(), coautores.max()) if len(bancas) else (0, 0, 0, 0)
+    min_b, max_b, min_c, max_c = limites
+
+    normalized_b = (bancas - min_b) / (max_b - min_b) if max_b > min_b else np.zeros(len(bancas))
+    normalized_c = (coautores - min_c) / (max_c - min_c) if max_c > min_c else np.zeros(len(coautores))
+    return w1 * normalized_b + w2 * normalized_c
+
+# Similaridade: soma de compare_areas entre as áreas de referência e as de cada orientador
+def pontuar_similaridade(matriz, perfil_referencia):
+    areas = matriz['areas']
+    pesos_prefixos = np.zeros(len(areas['prefixos']))
+    for prefixo, quantidade in perfil_referencia.items():
+        posicao = areas['prefixos'].get(prefixo)
+        if posicao is not None:
+            pesos_prefixos[posicao] = PESOS_NIVEL[len(prefixo)] * quantidade
+
+    return np.bincount(areas['linhas'], weights=areas['valores'] * pesos_prefixos[areas['colunas']],
+                       minlength=len(matriz['nomes']))
+
+# Função para avaliar todos os critérios sobre a matriz, com os pesos padrão dos scripts individuais
+# (a similaridade só é calculada quando há um perfil de referência)
+@medir('pontuacao')
+def calcular_todas(matriz, perfil_referencia=None, h_index=10, P_max=None, limites_reputacao=None):
+    pontuacoes = {
+        'engajamento': pontuar_engajamento(
+            matriz, p_engajamento.omega_e, p_engajamento.omega_p, p_engajamento.omega_x),
+        'experiencia': pontuar_experiencia(matriz, p_experiencia.pesos, p_experiencia.limites, P_max),
+        'producao': pontuar_producao(matriz, h_index),
+        'qualidade': pontuar_qualidade(matriz, p_qualidade.pesos),
+        'reputacao': pontuar_reputacao(matriz, p_reputacao.w1, p_reputacao.w2, limites_reputacao)
+    }
+    if perfil_referencia is not None:
+        pontuacoes['similaridade'] = pontuar_similaridade(matriz, perfil_referencia)
+    return pontuacoes
@@ -0,0 +1,296 @@
+#####################################################################
+# Ranking combinado dos orientadores com pesos configuráveis, sem reler o
+# corpus. Os pesos dos critérios (omega_e/omega_p/omega_x de
+# p_engajamento, pesos e limites de p_experiencia, pesos de p_qualidade e
+# w1/w2 de p_reputacao) entram nas fórmulas apenas como coeficientes de
+# colunas que não dependem deles. Essas colunas (as características de
+# ranking) são calculadas uma vez a partir da matriz de características e
+# gravadas em um arquivo .npy, com os nomes em um JSON ao lado (como em
+# similaridade_todos).
+#
+# Com as características em memória, cada critério é um produto da matriz
+# de características pelo vetor de coeficientes dos pesos, e o ranking
+# combinado é a soma dos critérios normalizados por min-max no corpus,
+# cada um multiplicado pelo seu peso em 'criterios'. Os k melhores são
+# selecionados por ordenação parcial (np.partition), sem ordenar o corpus
+# inteiro; a ordem é a mesma de uma ordenação estável completa.
+#
+# Uso: python ranking_pesos.py
+#####################################################################
+
+import os
+import sys
+import json
+import copy
+import math
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+from matriz_caracteristicas import construir_matriz, coluna, perfil_areas
+from resolucao_autores import resolver_corpus
+from perfil_execucao import medir
+
+import p_engajamento
+import p_experiencia
+import p_qualidade
+import p_reputacao
+import pontuacao_vetorizada
+from pontuacao_geral import calcular_normalizadores, calcular_limites
+
+CARACTERISTICAS_PADRAO = 'caracteristicas_ranking.npy'
+
+# Pesos padrão: os mesmos dos scripts individuais; 'criterios' pondera cada critério no ranking combinado
+PESOS_PADRAO = {
+    'omega_e': p_engajamento.omega_e,
+    'omega_p': p_engajamento.omega_p,
+    'omega_x': p_engajamento.omega_x,
+    'pesos_experiencia': dict(p_experiencia.pesos),
+    'limites': list(p_experiencia.limites),
+    'pesos_qualidade': dict(p_qualidade.pesos),
+    'w1': p_reputacao.w1,
+    'w2': p_reputacao.w2,
+    'criterios': {
+        'engajamento': 1,
+        'experiencia': 1,
+        'producao': 1,
+        'qualidade': 1,
+        'reputacao': 1,
+        'similaridade': 1
+    }
+}
+
+NIVEIS = ('graduacao', 'mestrado', 'doutorado')
+
+# Colunas das características de ranking, na ordem em que são armazenadas: (critério, componente)
+COLUNAS = (
+    ('engajamento', 'disciplinas'),
+    ('engajamento', 'pesquisa'),
+    ('engajamento', 'extensao'),
+    ('experiencia', 'graduacao'),   # Orientações de graduação x Q
+    ('experiencia', 'mestrado'),
+    ('experiencia', 'doutorado'),
+    ('producao', 'producao'),       # h-index x soma de fator de impacto x percentil (NaN sem os dados)
+    ('qualidade', 'graduacao'),     # Taxa de conclusão x concluídas / total do nível
+    ('qualidade', 'mestrado'),
+    ('qualidade', 'doutorado'),
+    ('reputacao', 'bancas'),        # Bancas normalizadas por min-max
+    ('reputacao', 'coautores'),     # Coautores normalizados por min-max
+    ('similaridade', 'similaridade')
+)
+
+# Função para calcular as características de ranking a partir da matriz de características
+# (P_max e limites_reputacao como em pontuacao_vetorizada.calcular_todas)
+@medir('pontuacao')
+def preparar_caracteristicas(matriz, perfil_referencia=None, h_index=10, P_max=None, limites_reputacao=None):
+    n = len(matriz['nomes'])
+    valores = np.zeros((n, len(COLUNAS)))
+    if not n:
+        # Corpus vazio: sem normalizadores (P_max é o percentil de um corpus sem publicações)
+        return {'nomes': [], 'valores': valores, 'similaridade': perfil_referencia is not None}
+
+    for posicao, nome in enumerate(('disciplinas', 'pesquisa', 'extensao')):
+        valores[:, posicao] = coluna(matriz, nome)
+
+    # Com peso 1 e limite 1 em um nível, a experiência é a própria coluna do nível
+    for posicao, nivel in enumerate(NIVEIS, start=3):
+        pesos = {outro: float(outro == nivel) for outro in NIVEIS}
+        valores[:, posicao] = pontuacao_vetorizada.pontuar_experiencia(matriz, pesos, (1, 1, 1), P_max)
+
+    valores[:, 6] = pontuacao_vetorizada.pontuar_producao(matriz, h_index)
+
+    for posicao, nivel in enumerate(NIVEIS, start=7):
+        pesos = {outro: float(outro == nivel) for outro in NIVEIS}
+        valores[:, posicao] = pontuacao_vetorizada.pontuar_qualidade(matriz, pesos)
+
+    valores[:, 10] = pontuacao_vetorizada.pontuar_reputacao(matriz, 1, 0, limites_reputacao)
+    valores[:, 11] = pontuacao_vetorizada.pontuar_reputacao(matriz, 0, 1, limites_reputacao)
+
+    if perfil_referencia is not None:
+        valores[:, 12] = pontuacao_vetorizada.pontuar_similaridade(matriz, perfil_referencia)
+
+    return {
+        'nomes': list(matriz['nomes']),
+        'valores': valores,
+        'similaridade': perfil_referencia is not None
+    }
+
+# Função para verificar se um peso é um número finito (NaN, infinito e inteiros fora do alcance de um float
+# são recusados)
+def _numerico(valor):
+    if not isinstance(valor, (int, float, np.integer, np.floating)) or isinstance(valor, bool):
+        return False
+    try:
+        return math.isfinite(valor)
+    except OverflowError:
+        return False
+
+# Função para completar uma configuração (parcial) de pesos com os pesos padrão
+def mesclar_pesos(pesos=None):
+    completos = copy.deepcopy(PESOS_PADRAO)
+    for chave, valor in (pesos or {}).items():
+        if chave not in completos:
+            raise ValueError(f"Peso desconhecido: {chave}")
+        if isinstance(completos[chave], dict):
+            if not isinstance(valor, dict):
+                raise ValueError(f"'{chave}' deve indicar os pesos por nome (por exemplo, {chave}.{next(iter(completos[chave]))})")
+            desconhecidos = set(valor) - set(completos[chave])
+            if desconhecidos:
+                raise ValueError(f"Pesos desconhecidos em {chave}: {', '.join(sorted(desconhecidos))}")
+            if not all(_numerico(peso) for peso in valor.values()):
+                raise ValueError(f"Os pesos de '{chave}' devem ser números finitos")
+            completos[chave].update(valor)
+        elif isinstance(completos[chave], list):
+            if not isinstance(valor, (list, tuple)) or not all(_numerico(limite) for limite in valor):
+                raise ValueError(f"'{chave}' deve ser uma lista de números finitos")
+            completos[chave] = list(valor)
+        else:
+            if not _numerico(valor):
+                raise ValueError(f"Peso '{chave}' deve ser um número finito")
+            completos[chave] = valor
+    if len(completos['limites']) != 3 or 0 in completos['limites']:
+        raise ValueError("'limites' deve ter três valores diferentes de zero (graduação, mestrado, doutorado)")
+    return completos
+
+# Função para obter os coeficientes de cada coluna das características para uma configuração de pesos
+def coeficientes(pesos):
+    limites = dict(zip(NIVEIS, pesos['limites']))
+    por_coluna = {
+        ('engajamento', 'disciplinas'): pesos['omega_e'],
+        ('engajamento', 'pesquisa'): pesos['omega_p'],
+        ('engajamento', 'extensao'): pesos['omega_x'],
+        ('producao', 'producao'): 1,
+        ('reputacao', 'bancas'): pesos['w1'],
+        ('reputacao', 'coautores'): pesos['w2'],
+        ('similaridade', 'similaridade'): 1
+    }
+    for nivel in NIVEIS:
+        por_coluna[('experiencia', nivel)] = pesos['pesos_experiencia'][nivel] / limites[nivel]
+        por_coluna[('qualidade', nivel)] = pesos['pesos_qualidade'][nivel]
+    return np.array([por_coluna[coluna_ranking] for coluna_ranking in COLUNAS], dtype=np.float64)
+
+# Função para listar os critérios disponíveis nas características, com as posições das suas colunas
+def _criterios(caracteristicas):
+    criterios = {}
+    for posicao, (criterio, _) in enumerate(COLUNAS):
+        if criterio != 'similaridade' or caracteristicas['similaridade']:
+            criterios.setdefault(criterio, []).append(posicao)
+    return criterios
+
+# Função para calcular cada critério com uma configuração de pesos: {critério: vetor}
+def pontuar_criterios(caracteristicas, pesos=None):
+    coeficientes_pesos = coeficientes(mesclar_pesos(pesos))
+    valores = caracteristicas['valores']
+    return {criterio: valores[:, posicoes] @ coeficientes_pesos[posicoes]
+            for criterio, posicoes in _criterios(caracteristicas).items()}
+
+# Função para normalizar um critério por min-max no corpus (valores indisponíveis, NaN, valem 0)
+def _normalizar(valores):
+    validos = valores[~np.isnan(valores)]
+    if not len(validos) or validos.max() == validos.min():
+        return np.zeros(len(valores))
+    return np.nan_to_num((valores - validos.min()) / (validos.max() - validos.min()))
+
+# Função para calcular a pontuação combinada: soma dos critérios normalizados, ponderados por 'criterios'
+def pontuar_combinado(caracteristicas, pesos=None):
+    pesos = mesclar_pesos(pesos)
+    combinado = np.zeros(len(caracteristicas['nomes']))
+    for criterio, valores in pontuar_criterios(caracteristicas, pesos).items():
+        if pesos['criterios'][criterio]:
+            combinado += pesos['criterios'][criterio] * _normalizar(valores)
+    return combinado
+
+# Função para obter as posições dos k maiores valores, em ordem decrescente (empates pela posição, como em
+# uma ordenação estável), com ordenação parcial; valores NaN ficam de fora
+def melhores(valores, k):
+    posicoes = np.flatnonzero(~np.isnan(valores))
+    validos = valores[posicoes]
+    k = min(k, len(validos))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    limiar = np.partition(validos, len(validos) - k)[len(validos) - k]
+    acima = np.flatnonzero(validos > limiar)
+    iguais = np.flatnonzero(validos == limiar)[:k - len(acima)]
+    escolhidas = np.concatenate((acima, iguais))
+    return posicoes[escolhidas[np.lexsort((escolhidas, -validos[escolhidas]))]]
+
+# Função para obter o ranking combinado dos k melhores orientadores para uma configuração de pesos
+@medir('pontuacao')
+def ranquear(caracteristicas, pesos=None, k=10):
+    combinado = pontuar_combinado(caracteristicas, pesos)
+    return [{'caminho': caracteristicas['nomes'][posicao], 'pontuacao': float(combinado[posicao])}
+            for posicao in melhores(combinado, k)]
+
+# Função para converter parâmetros de texto (por exemplo, de uma consulta HTTP) em pesos:
+# 'omega_e=0.5', 'pesos_experiencia.mestrado=8', 'limites=50,30,20', 'criterios.producao=0'
+def ler_pesos(parametros):
+    pesos = {}
+    for chave, texto in parametros.items():
+        grupo, _, nome = chave.partition('.')
+        if grupo not in PESOS_PADRAO:
+            continue
+        try:
+            valor = [float(parte) for parte in texto.split(',')] if grupo == 'limites' else float(texto)
+        except ValueError:
+            raise ValueError(f"Peso '{chave}' deve ser numérico")
+        if nome:
+            pesos.setdefault(grupo, {})[nome] = valor
+        else:
+            pesos[grupo] = valor
+    return pesos
+
+# Função para o caminho do JSON com os nomes das linhas de características salvas
+def _caminho_nomes(caminho):
+    return os.path.splitext(caminho)[0] + '_nomes.json'
+
+# Função para gravar as características de ranking
+def salvar_caracteristicas(caracteristicas, caminho=CARACTERISTICAS_PADRAO):
+    np.save(caminho, caracteristicas['valores'])
+    with open(_caminho_nomes(caminho), 'w', encoding='utf-8') as arquivo:
+        json.dump({'nomes': caracteristicas['nomes'], 'similaridade': caracteristicas['similaridade']},
+                  arquivo, ensure_ascii=False)
+
+# Função para abrir características de ranking salvas
+def carregar_caracteristicas(caminho=CARACTERISTICAS_PADRAO):
+    with open(_caminho_nomes(caminho), encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    return {'nomes': dados['nomes'], 'valores': np.load(caminho), 'similaridade': dados['similaridade']}
+
+# Função para calcular e gravar as características de ranking dos currículos de uma pasta
+def construir_caracteristicas(pasta, reference_xml=None, caminho=CARACTERISTICAS_PADRAO, h_index=10, processos=None):
+    metricas_por_arquivo, _ = carregar_metricas(pasta, processos=processos, recursivo=True)
+    resolucao = resolver_corpus(metricas_por_arquivo)
+    matriz = construir_matriz(metricas_por_arquivo, resolucao['chaves'])
+    P_max, limites_reputacao = calcular_limites(calcular_normalizadores(matriz)) if matriz['nomes'] else (None, None)
+    perfil_referencia = perfil_areas(obter_metricas(reference_xml)) if reference_xml else None
+    caracteristicas = preparar_caracteristicas(matriz, perfil_referencia, h_index, P_max, limites_reputacao)
+    salvar_caracteristicas(caracteristicas, caminho)
+    return caracteristicas
+
+@medir('saida')
+def exibir_ranking(titulo, ranking):
+    print(titulo)
+    print("=" * 40)
+    for posicao, resultado in enumerate(ranking, start=1):
+        print(f"{posicao}. {os.path.basename(resultado['caminho'])}: {resultado['pontuacao']:.4f}")
+    print("-" * 40)
+
+def main(processos=None):
+    reference_xml = r'C:\Users\radim\Desktop\Miriam Ines Marchi.xml'
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+
+    caracteristicas = construir_caracteristicas(folder_path, reference_xml, processos=processos)
+    if not caracteristicas['nomes']:
+        print("Nenhum arquivo XML encontrado no diretório.")
+        return
+
+    # As demais configurações são avaliadas a partir das características já calculadas, sem reler o corpus
+    exibir_ranking("Ranking Combinado (pesos padrão)", ranquear(caracteristicas))
+    exibir_ranking("Ranking Combinado (apenas produção e qualidade)", ranquear(caracteristicas, {
+        'criterios': {'engajamento': 0, 'experiencia': 0, 'producao': 1, 'qualidade': 1, 'reputacao': 0, 'similaridade': 0}
+    }))
+    print(f"Características gravadas em {CARACTERISTICAS_PADRAO}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#####################################################################
+# Sensibilidade do ranking combinado (ranking_pesos) aos pesos: milhares
+# de configurações de pesos (omega_e/omega_p/omega_x, pesos e limites de
+# experiência, pesos de qualidade, w1/w2), sorteadas em torno dos pesos
+# padrão ou em grade, são avaliadas sobre as características de ranking
+# em lote: os critérios de todas as configurações de um bloco saem de um
+# único produto de matrizes (orientadores x colunas por colunas x
+# configurações), sem laço em Python por configuração.
+#
+# Cada ranking é comparado com o dos pesos padrão:
+#   - Kendall tau (sem empates: a ordem estável do ranking) por
+#     configuração e por orientador, a partir das inversões de cada
+#     orientador, contadas em O(n log² n) por uma ordenação por
+#     intercalação vetorizada sobre todas as configurações do bloco;
+#   - sobreposição dos k primeiros por configuração e frequência de cada
+#     orientador entre os k primeiros;
+#   - posição média, desvio, melhor e pior posição de cada orientador.
+#
+# Uso: python sensibilidade_pesos.py
+#####################################################################
+
+import os
+import sys
+import itertools
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from perfil_execucao import medir
+
+import ranking_pesos
+from ranking_pesos import PESOS_PADRAO, COLUNAS, NIVEIS
+
+# Memória aproximada (em bytes) ocupada por um bloco de configurações durante a avaliação
+MEMORIA_BLOCO = 256 * 1024 * 1024
+
+# Função para achatar uma configuração de pesos em {nome do parâmetro: valor}
+# ('omega_e', 'pesos_experiencia.mestrado', 'limites.doutorado', 'criterios.producao'...)
+def achatar_pesos(pesos=None):
+    pesos = ranking_pesos.mesclar_pesos(pesos)
+    parametros = {}
+    for grupo, valor in pesos.items():
+        if grupo == 'limites':
+            parametros.update((f"limites.{nivel}", limite) for nivel, limite in zip(NIVEIS, valor))
+        elif isinstance(valor, dict):
+            parametros.update((f"{grupo}.{nome}", peso) for nome, peso in valor.items())
+        else:
+            parametros[grupo] = valor
+    return parametros
+
+# Nomes dos parâmetros, na ordem das colunas da matriz de configurações
+PARAMETROS = list(achatar_pesos())
+
+# Parâmetros variados por padrão: todos os pesos dos critérios (os pesos de 'criterios' ficam fixos)
+PARAMETROS_VARIADOS = [nome for nome in PARAMETROS if not nome.startswith('criterios.')]
+
+# Função para sortear configurações: cada parâmetro de `variar` multiplicado por um fator uniforme em
+# [1 - variacao, 1 + variacao] em torno de `pesos`; configurações x parâmetros
+def amostrar_parametros(quantidade, variacao=0.5, pesos=None, variar=PARAMETROS_VARIADOS, semente=0):
+    base = np.array(list(achatar_pesos(pesos).values()), dtype=np.float64)
+    configuracoes = np.tile(base, (quantidade, 1))
+    colunas = [PARAMETROS.index(nome) for nome in variar]
+    aleatorio = np.random.default_rng(semente)
+    configuracoes[:, colunas] *= aleatorio.uniform(1 - variacao, 1 + variacao, size=(quantidade, len(colunas)))
+    return configuracoes
+
+# Função para montar a grade (produto cartesiano) dos valores de cada parâmetro em {nome: valores};
+# os demais parâmetros ficam com os valores de `pesos`
+def grade_parametros(valores_por_parametro, pesos=None):
+    base = np.array(list(achatar_pesos(pesos).values()), dtype=np.float64)
+    nomes = list(valores_por_parametro)
+    desconhecidos = set(nomes) - set(PARAMETROS)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(desconhecidos))}")
+    combinacoes = np.array(list(itertools.product(*valores_por_parametro.values())), dtype=np.float64)
+    configuracoes = np.tile(base, (len(combinacoes), 1))
+    configuracoes[:, [PARAMETROS.index(nome) for nome in nomes]] = combinacoes
+    return configuracoes
+
+# Função para obter, para um lote de configurações, os coeficientes de cada coluna das características
+# (colunas x configurações) e os pesos de cada critério (critério -> vetor por configuração)
+def coeficientes_lote(configuracoes):
+    parametro = {nome: configuracoes[:, posicao] for posicao, nome in enumerate(PARAMETROS)}
+    if any((parametro[f"limites.{nivel}"] == 0).any() for nivel in NIVEIS):
+        raise ValueError("Os limites de experiência devem ser diferentes de zero")
+    um = np.ones(len(configuracoes))
+    por_coluna = {
+        ('engajamento', 'disciplinas'): parametro['omega_e'],
+        ('engajamento', 'pesquisa'): parametro['omega_p'],
+        ('engajamento', 'extensao'): parametro['omega_x'],
+        ('producao', 'producao'): um,
+        ('reputacao', 'bancas'): parametro['w1'],
+        ('reputacao', 'coautores'): parametro['w2'],
+        ('similaridade', 'similaridade'): um
+    }
+    for nivel in NIVEIS:
+        por_coluna[('experiencia', nivel)] = parametro[f"pesos_experiencia.{nivel}"] / parametro[f"limites.{nivel}"]
+        por_coluna[('qualidade', nivel)] = parametro[f"pesos_qualidade.{nivel}"]
+    coeficientes = np.array([por_coluna[coluna_ranking] for coluna_ranking in COLUNAS])
+    criterios = {criterio: parametro[f"criterios.{criterio}"] for criterio in PESOS_PADRAO['criterios']}
+    return coeficientes, criterios
+
+# Função para calcular a pontuação combinada de um lote de configurações: orientadores x configurações
+# (os mesmos valores de ranking_pesos.pontuar_combinado para cada configuração)
+def pontuar_lote(caracteristicas, configuracoes):
+    coeficientes, pesos_criterios = coeficientes_lote(configuracoes)
+    valores = caracteristicas['valores']
+    combinado = np.zeros((len(caracteristicas['nomes']), len(configuracoes)))
+    for criterio, posicoes in ranking_pesos._criterios(caracteristicas).items():
+        pontuacoes = valores[:, posicoes] @ coeficientes[posicoes]
+        # Min-max de cada configuração no corpus; valores indisponíveis (NaN) valem 0
+        minimos = np.fmin.reduce(pontuacoes, axis=0)
+        amplitudes = np.fmax.reduce(pontuacoes, axis=0) - minimos
+        validas = amplitudes > 0
+        normalizadas = np.zeros(pontuacoes.shape)
+        np.divide(pontuacoes - minimos, amplitudes, out=normalizadas, where=validas)
+        combinado += pesos_criterios[criterio] * np.nan_to_num(normalizadas)
+    return combinado
+
+# Função para obter a posição (0 = primeiro) de cada orientador em cada coluna de pontuações,
+# na ordem decrescente estável: orientadores x configurações
+def posicoes_ranking(pontuacoes):
+    ordem = np.argsort(-pontuacoes, axis=0, kind='stable')
+    posicoes = np.empty(ordem.shape, dtype=np.int64)
+    np.put_along_axis(posicoes, ordem, np.arange(ordem.shape[0])[:, None], axis=0)
+    return posicoes
+
+# Função para contar, em cada linha de `sequencias` (configurações x n, cada linha uma permutação de 0..n-1),
+# quantos elementos à esquerda de cada posição são menores que ele; ordenação por intercalação vetorizada sobre
+# todas as linhas, nível a nível
+def menores_a_esquerda(sequencias):
+    linhas, n = sequencias.shape
+    tamanho = 1 << max(n - 1, 0).bit_length()
+    # Posições de preenchimento ficam à direita, com valores maiores que os reais
+    ordenados = np.empty((linhas, tamanho), dtype=np.int64)
+    ordenados[:, :n] = sequencias
+    ordenados[:, n:] = np.arange(n, tamanho)
+    # As contagens acompanham os elementos durante a intercalação
+    contagens = np.zeros((linhas, tamanho), dtype=np.int64)
+
+    segmento = 1
+    while segmento < tamanho:
+        pares = tamanho // (2 * segmento)
+        blocos = ordenados.reshape(linhas, pares, 2 * segmento)
+        # Duas metades já ordenadas: a ordenação estável (timsort) apenas as intercala
+        origem = np.argsort(blocos, axis=-1, kind='stable')
+        # Um elemento da metade direita na posição j da intercalação, que era o i-ésimo da sua metade,
+        # tem j - i elementos menores na metade esquerda
+        menores = np.arange(2 * segmento) - (origem - segmento)
+        menores[origem < segmento] = 0
+        ordenados = np.take_along_axis(blocos, origem, axis=-1).reshape(linhas, tamanho)
+        contagens = (np.take_along_axis(contagens.reshape(blocos.shape), origem, axis=-1) + menores).reshape(linhas, tamanho)
+        segmento *= 2
+
+    # Ao final, cada linha está ordenada: a contagem do valor v está na posição v
+    return np.take_along_axis(contagens, sequencias, axis=1)
+
+# Função para contar, para cada orientador e configuração, os pares discordantes entre o ranking da
+# configuração e o ranking base: orientadores x configurações
+def discordancias(posicoes_base, posicoes):
+    ordem_base = np.argsort(posicoes_base)
+    # Posições de cada configuração na ordem do ranking base; os menores à esquerda são os orientadores
+    # acima dele nos dois rankings
+    acima_nos_dois = menores_a_esquerda(posicoes[ordem_base].T).T
+    # Discordantes = (acima na base e abaixo na configuração) + (abaixo na base e acima na configuração)
+    resultado = np.empty(posicoes.shape, dtype=np.int64)
+    resultado[ordem_base] = posicoes_base[ordem_base][:, None] + posicoes[ordem_base] - 2 * acima_nos_dois
+    return resultado
+
+# Função para escolher quantas configurações avaliar por vez
+def _tamanho_bloco(n, tamanho_bloco=None):
+    if tamanho_bloco:
+        return tamanho_bloco
+    tamanho = 1 << max(n - 1, 0).bit_length()
+    return max(1, MEMORIA_BLOCO // (8 * 8 * max(tamanho, 1)))
+
+# Função para avaliar as configurações (configurações x parâmetros) e resumir a estabilidade do ranking
+# em relação ao ranking de `pesos_base`
+@medir('pontuacao')
+def varrer_pesos(caracteristicas, configuracoes, k=10, pesos_base=None, tamanho_bloco=None):
+    n = len(caracteristicas['nomes'])
+    quantidade = len(configuracoes)
+    base = np.array(list(achatar_pesos(pesos_base).values()), dtype=np.float64)[None, :]
+    posicoes_base = posicoes_ranking(pontuar_lote(caracteristicas, base))[:, 0]
+    no_topo_base = posicoes_base < k
+
+    soma = np.zeros(n)
+    soma_quadrados = np.zeros(n)
+    melhor = np.full(n, n, dtype=np.int64)
+    pior = np.zeros(n, dtype=np.int64)
+    vezes_no_topo = np.zeros(n, dtype=np.int64)
+    soma_tau = np.zeros(n)
+    tau = np.zeros(quantidade)
+    sobreposicao = np.zeros(quantidade)
+
+    passo = _tamanho_bloco(n, tamanho_bloco)
+    for inicio in range(0, quantidade, passo):
+        fim = min(inicio + passo, quantidade)
+        posicoes = posicoes_ranking(pontuar_lote(caracteristicas, configuracoes[inicio:fim]))
+
+        soma += posicoes.sum(axis=1)
+        soma_quadrados += (posicoes.astype(np.float64) ** 2).sum(axis=1)
+        np.minimum(melhor, posicoes.min(axis=1), out=melhor)
+        np.maximum(pior, posicoes.max(axis=1), out=pior)
+        no_topo = posicoes < k
+        vezes_no_topo += no_topo.sum(axis=1)
+        sobreposicao[inicio:fim] = (no_topo & no_topo_base[:, None]).sum(axis=0) / max(min(k, n), 1)
+
+        if n > 1:
+            discordantes = discordancias(posicoes_base, posicoes)
+            soma_tau += (1 - 2 * discordantes / (n - 1)).sum(axis=1)
+            # Cada par discordante é contado nos dois orientadores do par
+            tau[inicio:fim] = 1 - 2 * discordantes.sum(axis=0) / (n * (n - 1))
+        else:
+            soma_tau += fim - inicio
+            tau[inicio:fim] = 1
+
+    media = soma / max(quantidade, 1)
+    return {
+        'nomes': caracteristicas['nomes'],
+        'configuracoes': quantidade,
+        'k': k,
+        'tau': tau,
+        'sobreposicao': sobreposicao,
+        'posicao_base': posicoes_base,
+        'posicao_media': media,
+        'desvio': np.sqrt(np.maximum(soma_quadrados / max(quantidade, 1) - media ** 2, 0)),
+        'melhor': melhor,
+        'pior': pior,
+        'frequencia_topo': vezes_no_topo / max(quantidade, 1),
+        'tau_orientador': soma_tau / max(quantidade, 1)
+    }
+
+@medir('saida')
+def exibir_sensibilidade(resumo, limite=20):
+    print("Sensibilidade do Ranking Combinado aos Pesos")
+    print("=" * 40)
+    print(f"Configurações avaliadas: {resumo['configuracoes']}")
+    if not resumo['configuracoes']:
+        return
+    print(f"Kendall tau em relação aos pesos padrão: média {resumo['tau'].mean():.3f}, "
+          f"mínimo {resumo['tau'].min():.3f}")
+    print(f"Sobreposição dos {resumo['k']} primeiros: média {resumo['sobreposicao'].mean():.1%}, "
+          f"mínimo {resumo['sobreposicao'].min():.1%}")
+    print("-" * 40)
+    print(f"Orientadores, na ordem do ranking padrão (posição, média ± desvio, melhor-pior, "
+          f"frequência entre os {resumo['k']} primeiros, tau):")
+    for posicao in np.argsort(resumo['posicao_base'])[:limite]:
+        print(f"  {resumo['posicao_base'][posicao] + 1}. {os.path.basename(resumo['nomes'][posicao])}: "
+              f"{resumo['posicao_media'][posicao] + 1:.1f} ± {resumo['desvio'][posicao]:.1f}, "
+              f"{resumo['melhor'][posicao] + 1}-{resumo['pior'][posicao] + 1}, "
+              f"{resumo['frequencia_topo'][posicao]:.1%}, tau {resumo['tau_orientador'][posicao]:.3f}")
+
+def main(processos=None):
+    reference_xml = r'C:\Users\radim\Desktop\Miriam Ines Marchi.xml'
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+
+    caracteristicas = ranking_pesos.construir_caracteristicas(folder_path, reference_xml, processos=processos)
+    if not caracteristicas['nomes']:
+        print("Nenhum arquivo XML encontrado no diretório.")
+        return
+
+    # Pesos e limites sorteados a até 50% dos valores padrão
+    resumo = varrer_pesos(caracteristicas, amostrar_parametros(2000, variacao=0.5), k=10)
+    exibir_sensibilidade(resumo)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#####################################################################
+# Serviço local de consultas (HTTP/JSON, asyncio) para o chatbot. As
+# métricas do corpus são carregadas uma única vez (do armazém, extraindo
+# apenas os currículos novos ou alterados), a matriz de características e o
+# índice de áreas ficam em memória e as consultas são respondidas sem ler XML.
+#
+# Rotas (o orientador é o nome do arquivo sem .xml ou o NUMERO-IDENTIFICADOR):
+#   GET  /ranking?criterio=engajamento&k=10
+#   GET  /combinado?k=10&omega_e=0.5&criterios.producao=0   (pesos de ranking_pesos)
+#   GET  /similares?orientador=X&k=10
+#   GET  /areas?orientador=X
+#   GET  /relatorio?orientador=X
+#   POST /recarregar     relê a pasta e troca o estado sem reiniciar
+#####################################################################
+
+import os
+import sys
+import json
+import math
+import asyncio
+from functools import partial
+from collections import Counter
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from armazem_metricas import carregar_metricas
+from matriz_caracteristicas import construir_matriz, perfil_areas
+from resolucao_autores import resolver_corpus
+from relatorio_agrupado import agrupar_contagens
+import tabela_areas
+
+import indice_areas
+import pontuacao_vetorizada
+import ranking_pesos
+from pontuacao_geral import calcular_normalizadores, calcular_limites
+
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8080
+
+# Função para carregar o corpus de uma pasta e montar tudo o que as consultas usam
+def carregar_estado(pasta, processos=None):
+    metricas_por_arquivo, estatisticas = carregar_metricas(pasta, processos=processos, recursivo=True)
+    resolucao = resolver_corpus(metricas_por_arquivo)
+    matriz = construir_matriz(metricas_por_arquivo, resolucao['chaves'])
+
+    pontuacoes = {}
+    ordens = {}
+    P_max = limites_reputacao = None
+    if matriz['nomes']:
+        P_max, limites_reputacao = calcular_limites(calcular_normalizadores(matriz))
+        pontuacoes = pontuacao_vetorizada.calcular_todas(
+            matriz, P_max=P_max, limites_reputacao=limites_reputacao)
+        # Ordem decrescente de cada critério calculada uma vez; valores indisponíveis (NaN) ficam de fora
+        for criterio, valores in pontuacoes.items():
+            ordem = np.argsort(-valores, kind='stable')
+            ordens[criterio] = ordem[~np.isnan(valores[ordem])]
+
+    indice = indice_areas.novo_indice()
+    posicoes = {}
+    for posicao, caminho in enumerate(matriz['nomes']):
+        metricas = metricas_por_arquivo[caminho]
+        posicoes[caminho] = posicao
+        indice_areas.indexar_orientador(indice, caminho, perfil_areas(metricas))
+        posicoes[os.path.splitext(os.path.basename(caminho))[0]] = posicao
+        if metricas['identificador']:
+            posicoes[metricas['identificador']] = posicao
+
+    return {
+        'pasta': pasta,
+        'metricas': metricas_por_arquivo,
+        'matriz': matriz,
+        'pontuacoes': pontuacoes,
+        'ordens': ordens,
+        # Características para o ranking combinado com pesos informados na consulta
+        'caracteristicas': ranking_pesos.preparar_caracteristicas(
+            matriz, P_max=P_max, limites_reputacao=limites_reputacao),
+        'indice': indice,
+        'posicoes': posicoes,
+        'estatisticas': estatisticas
+    }
+
+# Função para converter um número para JSON (NaN vira null)
+def _valor(numero):
+    numero = float(numero)
+    return None if math.isnan(numero) else numero
+
+# Consultas: parâmetros inválidos geram ValueError (HTTP 400), orientadores desconhecidos LookupError (HTTP 404)
+# e qualquer outra falha HTTP 500
+
+# Função para localizar um orientador pelo nome do arquivo ou identificador
+def _posicao(estado, parametros):
+    orientador = parametros.get('orientador')
+    if not orientador:
+        raise ValueError("Parâmetro 'orientador' obrigatório")
+    posicao = estado['posicoes'].get(orientador)
+    if posicao is None:
+        raise LookupError(f"Orientador não encontrado: {orientador}")
+    return posicao
+
+# Função para ler o parâmetro k (quantidade de resultados)
+def _k(parametros):
+    try:
+        k = int(parametros.get('k', 10))
+    except ValueError:
+        raise ValueError("Parâmetro 'k' deve ser um número inteiro")
+    if k < 0:
+        raise ValueError("Parâmetro 'k' não pode ser negativo")
+    return k
+
+# Função para descrever um orientador nas respostas
+def _orientador(estado, posicao):
+    caminho = estado['matriz']['nomes'][posicao]
+    return {
+        'arquivo': os.path.basename(caminho),
+        'identificador': estado['metricas'][caminho]['identificador']
+    }
+
+def consultar_ranking(estado, parametros):
+    criterio = parametros.get('criterio')
+    valores = estado['pontuacoes'].get(criterio)
+    if valores is None:
+        raise ValueError(f"Parâmetro 'criterio' deve ser um de: {', '.join(estado['pontuacoes'])}")
+    ordem = estado['ordens'][criterio][:_k(parametros)]
+    return [dict(_orientador(estado, posicao), pontuacao=_valor(valores[posicao])) for posicao in ordem]
+
+def consultar_combinado(estado, parametros):
+    combinado = ranking_pesos.pontuar_combinado(estado['caracteristicas'], ranking_pesos.ler_pesos(parametros))
+    return [dict(_orientador(estado, posicao), pontuacao=_valor(combinado[posicao]))
+            for posicao in ranking_pesos.melhores(combinado, _k(parametros))]
+
+def consultar_similares(estado, parametros):
+    posicao = _posicao(estado, parametros)
+    caminho = estado['matriz']['nomes'][posicao]
+    k = _k(parametros)
+    # Um resultado a mais, pois o próprio orientador aparece na consulta
+    resultados = indice_areas.consultar(estado['indice'], estado['indice']['perfis'][caminho], k + 1)
+    return [dict(_orientador(estado, estado['posicoes'][outro]), pontuacao=pontuacao)
+            for outro, pontuacao in resultados if outro != caminho][:k]
+
+def consultar_areas(estado, parametros):
+    posicao = _posicao(estado, parametros)
+    metricas = estado['metricas'][estado['matriz']['nomes'][posicao]]
+    secoes = {secao: [tabela_areas.descrever_area(codigo) for codigo in tabela_areas.codificar_areas(areas)]
+              for secao, areas in metricas['areas'].items()}
+    grandes_areas = Counter()
+    for areas in secoes.values():
+        grandes_areas.update(area['grande_area'] for area in areas)
+    return dict(_orientador(estado, posicao), secoes=secoes, grandes_areas=dict(grandes_areas))
+
+def consultar_relatorio(estado, parametros):
+    posicao = _posicao(estado, parametros)
+    metricas = estado['metricas'][estado['matriz']['nomes'][posicao]]
+    pontuacoes = {criterio: _valor(valores[posicao]) for criterio, valores in estado['pontuacoes'].items()}
+    return dict(_orientador(estado, posicao), contagens=agrupar_contagens(metricas), pontuacoes=pontuacoes)
+
+ROTAS = {
+    '/ranking': consultar_ranking,
+    '/combinado': consultar_combinado,
+    '/similares': consultar_similares,
+    '/areas': consultar_areas,
+    '/relatorio': consultar_relatorio
+}
+
+# Função para carregar o serviço; o estado é trocado por inteiro a cada recarga
+def criar_servico(pasta, processos=None):
+    return {
+        'pasta': pasta,
+        'processos': processos,
+        'estado': carregar_estado(pasta, processos),
+        'recarga': asyncio.Lock()
+    }
+
+# Função para reler a pasta sem interromper as consultas em andamento
+async def recarregar(servico):
+    async with servico['recarga']:
+        # A leitura dos arquivos roda fora do laço de eventos
+        servico['estado'] = await asyncio.to_thread(carregar_estado, servico['pasta'], servico['processos'])
+    estatisticas = servico['estado']['estatisticas']
+    return {
+        'orientadores': len(servico['estado']['matriz']['nomes']),
+        'reaproveitados': estatisticas['acertos'],
+        'extraidos': estatisticas['extraidos']
+    }
+
+# Função para executar uma requisição e obter (status HTTP, corpo da resposta)
+async def responder(servico, metodo, alvo):
+    url = urlsplit(alvo)
+    parametros = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+    try:
+        if url.path == '/recarregar':
+            if metodo != 'POST':
+                return 405, {'erro': "Use POST para recarregar"}
+            return 200, await recarregar(servico)
+        consulta = ROTAS.get(url.path)
+        if consulta is None:
+            return 404, {'erro': f"Rota desconhecida: {url.path}"}
+        return 200, consulta(servico['estado'], parametros)
+    except LookupError as erro:
+        return 404, {'erro': str(erro)}
+    except ValueError as erro:
+        return 400, {'erro': str(erro)}
+    except Exception as erro:
+        # Qualquer outra falha ainda recebe uma resposta HTTP, em vez de a conexão ser fechada sem resposta
+        return 500, {'erro': f"Erro interno ({type(erro).__name__}): {erro}"}
+
+# Função para atender uma conexão HTTP
+async def atender(servico, leitor, escritor):
+    try:
+        linha = (await leitor.readline()).decode('latin-1').split()
+        cabecalhos = {}
+        while True:
+            cabecalho = await leitor.readline()
+            if cabecalho in (b'\r\n', b'\n', b''):
+                break
+            nome, _, valor = cabecalho.decode('latin-1').partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        tamanho = int(cabecalhos.get('content-length', 0) or 0)
+        if tamanho:
+            await leitor.readexactly(tamanho)
+
+        if len(linha) < 2:
+            status, corpo = 400, {'erro': "Requisição inválida"}
+        else:
+            status, corpo = await responder(servico, linha[0], linha[1])
+
+        dados = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+        escritor.write(
+            f"HTTP/1.1 {status} {'OK' if status == 200 else 'Erro'}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(dados)}\r\n"
+            "Connection: close\r\n\r\n".encode('latin-1') + dados)
+        await escritor.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        escritor.close()
+
+async def executar(pasta, host=HOST_PADRAO, porta=PORTA_PADRAO, processos=None):
+    servico = criar_servico(pasta, processos)
+    servidor = await asyncio.start_server(partial(atender, servico), host, porta)
+    print(f"Orientadores carregados: {len(servico['estado']['matriz']['nomes'])}")
+    print(f"Serviço de consultas em http://{host}:{porta}")
+    async with servidor:
+        await servidor.serve_forever()
+
+def main(processos=None):
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    porta = int(os.environ.get('LATTES_PORTA', PORTA_PADRAO))
+    asyncio.run(executar(folder_path, porta=porta, processos=processos))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#####################################################################
+# Matriz de similaridade orientador x orientador (a soma de
+# `p_similar.compare_areas` sobre todos os pares de áreas, para todos os
+# pares de currículos) e agrupamento dos orientadores em grupos de pesquisa.
+#
+# Cada perfil de áreas é um vetor esparso de contagens de prefixos. Com A
+# (orientadores x prefixos) e W (pesos 1, 2, 3 e 5 de cada nível), a matriz é
+# A W Aᵀ. Ela é calculada em blocos de linhas e gravada diretamente em um
+# arquivo .npy mapeado em memória (um arquivo temporário, se nenhum caminho
+# for informado), de modo que o uso de memória depende do tamanho do bloco e
+# não do quadrado do número de orientadores. Com o SciPy instalado, os blocos
+# são produtos de matrizes esparsas; sem ele, cada bloco usa apenas as colunas
+# (prefixos) presentes nas suas linhas, em partes limitadas por MEMORIA_BLOCO.
+# O agrupamento lê a matriz uma única vez, bloco a bloco, unindo os pares
+# vizinhos em uma estrutura de união-busca.
+#####################################################################
+
+import os
+import sys
+import json
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from armazem_metricas import carregar_metricas
+from matriz_caracteristicas import codificar_perfis, pesos_prefixos, perfil_areas
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+# Memória aproximada (em bytes) ocupada por um bloco de linhas durante o cálculo
+MEMORIA_BLOCO = 256 * 1024 * 1024
+
+# Função para escolher quantas linhas calcular por vez
+def _tamanho_bloco(n, tamanho_bloco=None):
+    if tamanho_bloco:
+        return tamanho_bloco
+    return max(1, min(1024, MEMORIA_BLOCO // (8 * max(n, 1))))
+
+# Função para calcular as linhas [inicio, fim) da matriz sem o SciPy
+def _bloco_denso(areas, n, pesos, inicio, fim):
+    linhas, colunas, valores = areas['linhas'], areas['colunas'], areas['valores']
+    # As linhas codificadas estão em ordem crescente
+    a, b = np.searchsorted(linhas, [inicio, fim])
+    linhas_bloco, colunas_bloco, valores_bloco = linhas[a:b], colunas[a:b], valores[a:b]
+    distintas = np.unique(colunas_bloco)
+
+    # As colunas são usadas em partes, de modo que esquerda e direita ((linhas do bloco + n) x colunas da parte)
+    # respeitem MEMORIA_BLOCO
+    bloco = np.zeros((fim - inicio, n))
+    passo = max(1, MEMORIA_BLOCO // (8 * (n + fim - inicio)))
+    mapa = np.full(len(pesos), -1, dtype=np.int64)
+    for parte in range(0, len(distintas), passo):
+        colunas_parte = distintas[parte:parte + passo]
+        mapa[colunas_parte] = np.arange(len(colunas_parte))
+
+        selecionadas = mapa[colunas_bloco] >= 0
+        esquerda = np.zeros((fim - inicio, len(colunas_parte)))
+        esquerda[linhas_bloco[selecionadas] - inicio, mapa[colunas_bloco[selecionadas]]] = \
+            valores_bloco[selecionadas] * pesos[colunas_bloco[selecionadas]]
+
+        selecionadas = mapa[colunas] >= 0
+        direita = np.zeros((n, len(colunas_parte)))
+        direita[linhas[selecionadas], mapa[colunas[selecionadas]]] = valores[selecionadas]
+
+        bloco += esquerda @ direita.T
+        mapa[colunas_parte] = -1
+    return bloco
+
+# Função para calcular a matriz de similaridade de uma lista de perfis de áreas
+def calcular_matriz_similaridade(perfis, caminho=None, tamanho_bloco=None):
+    n = len(perfis)
+    areas = codificar_perfis(perfis)
+    pesos = pesos_prefixos(areas['prefixos'])
+
+    # A matriz é gravada em disco bloco a bloco; sem caminho, em um arquivo temporário (apagado ao ser fechado)
+    if caminho:
+        matriz = np.lib.format.open_memmap(caminho, mode='w+', dtype=np.int32, shape=(n, n))
+    elif n:
+        matriz = np.memmap(tempfile.TemporaryFile(), mode='w+', dtype=np.int32, shape=(n, n))
+    else:
+        matriz = np.zeros((0, 0), dtype=np.int32)
+
+    if sparse is not None:
+        A = sparse.csr_matrix((areas['valores'], (areas['linhas'], areas['colunas'])), shape=(n, len(pesos)))
+        AW = A @ sparse.diags(pesos)
+        AT = A.T.tocsc()
+
+    passo = _tamanho_bloco(n, tamanho_bloco)
+    for inicio in range(0, n, passo):
+        fim = min(inicio + passo, n)
+        if sparse is not None:
+            bloco = (AW[inicio:fim] @ AT).toarray()
+        else:
+            bloco = _bloco_denso(areas, n, pesos, inicio, fim)
+        matriz[inicio:fim] = np.rint(bloco)
+
+    if isinstance(matriz, np.memmap):
+        matriz.flush()
+    return matriz
+
+# Função para o caminho do arquivo com os nomes dos orientadores de uma matriz salva
+def _caminho_nomes(caminho):
+    return os.path.splitext(caminho)[0] + '_nomes.json'
+
+# Função para gravar os nomes dos orientadores, na ordem das linhas da matriz
+def salvar_nomes(caminho, nomes):
+    with open(_caminho_nomes(caminho), 'w', encoding='utf-8') as arquivo:
+        json.dump(nomes, arquivo, ensure_ascii=False)
+
+# Função para abrir uma matriz salva (mapeada em memória, somente leitura) e os nomes das linhas
+def carregar_matriz_similaridade(caminho):
+    with open(_caminho_nomes(caminho), encoding='utf-8') as arquivo:
+        nomes = json.load(arquivo)
+    return nomes, np.load(caminho, mmap_mode='r')
+
+# Função para obter a raiz de cada elemento na estrutura de união-busca, comprimindo os caminhos percorridos
+def _raizes(pais, elementos):
+    raizes = pais[elementos]
+    while True:
+        acima = pais[raizes]
+        if (acima == raizes).all():
+            break
+        raizes = acima
+    pais[elementos] = raizes
+    return raizes
+
+# Função para unir os pares (origem, destino) na estrutura de união-busca; a raiz de cada grupo é o menor índice
+def _unir(pais, origem, destino):
+    while len(origem):
+        raiz_origem, raiz_destino = _raizes(pais, origem), _raizes(pais, destino)
+        diferentes = raiz_origem != raiz_destino
+        origem, destino = origem[diferentes], destino[diferentes]
+        raiz_origem, raiz_destino = raiz_origem[diferentes], raiz_destino[diferentes]
+        np.minimum.at(pais, np.maximum(raiz_origem, raiz_destino), np.minimum(raiz_origem, raiz_destino))
+
+# Função para agrupar orientadores cuja similaridade normalizada (cosseno) atinge o limiar
+def agrupar_orientadores(matriz, limiar=0.5, tamanho_bloco=None):
+    n = matriz.shape[0]
+    norma = np.sqrt(np.diagonal(matriz).astype(np.float64))
+    pais = np.arange(n)
+
+    # Uma única leitura da matriz: os pares vizinhos de cada bloco (acima da diagonal) são unidos
+    passo = _tamanho_bloco(n, tamanho_bloco)
+    for inicio in range(0, n, passo):
+        fim = min(inicio + passo, n)
+        denominador = np.outer(norma[inicio:fim], norma)
+        vizinhos = np.zeros(denominador.shape, dtype=bool)
+        np.greater_equal(np.divide(matriz[inicio:fim], denominador, out=np.zeros(denominador.shape),
+                                   where=denominador > 0), limiar, out=vizinhos)
+        vizinhos &= denominador > 0
+        origem, destino = np.nonzero(vizinhos)
+        origem += inicio
+        acima = destino > origem
+        _unir(pais, origem[acima], destino[acima])
+
+    rotulos = _raizes(pais, np.arange(n))
+    grupos = {}
+    for indice, rotulo in enumerate(rotulos):
+        grupos.setdefault(rotulo, []).append(indice)
+    return sorted(grupos.values(), key=lambda grupo: (-len(grupo), grupo[0]))
+
+# Função para calcular e salvar a matriz de todos os currículos de uma pasta
+def calcular_pasta(folder_path, caminho_saida, processos=None):
+    metricas_por_arquivo, _ = carregar_metricas(folder_path, processos=processos)
+    nomes = [xml_file for xml_file, metricas in metricas_por_arquivo.items() if metricas is not None]
+    matriz = calcular_matriz_similaridade([perfil_areas(metricas_por_arquivo[xml_file]) for xml_file in nomes], caminho_saida)
+    salvar_nomes(caminho_saida, nomes)
+    return nomes, matriz
+
+def main(folder_path, caminho_saida, limiar=None, processos=None):
+    nomes, matriz = calcular_pasta(folder_path, caminho_saida, processos)
+    print(f"Matriz de similaridade {len(nomes)} x {len(nomes)} salva em: {caminho_saida}")
+
+    if limiar is not None:
+        print("Grupos de Pesquisa")
+        print("=" * 50)
+        for numero, grupo in enumerate(agrupar_orientadores(matriz, limiar), start=1):
+            if len(grupo) < 2:
+                continue
+            print(f"Grupo {numero} ({len(grupo)} orientadores):")
+            for indice in grupo:
+                print(f"  {os.path.basename(nomes[indice])}")
+            print("-" * 50)
+
+if __name__ == "__main__":
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    caminho_saida = r'C:\Users\radim\Desktop\similaridade_orientadores.npy'
+    main(folder_path, caminho_saida, limiar=0.5)
@@ -1,25 +1,209 @@
-import xml.etree.ElementTree as ET
+#####################################################################
+# Lista as tags de um currículo e, no modo censo, percorre todos os XML de
+# uma pasta (ou ZIP) em paralelo contando, em fluxo, as ocorrências de cada
+# tag e de cada caminho (CURRICULO-VITAE/DADOS-GERAIS/...), em quantos
+# currículos cada tag aparece e a taxa de preenchimento de cada atributo
+# (ocorrências com o atributo não vazio / ocorrências da tag). O resultado é
+# comparado com os elementos declarados no XSD do Lattes distribuído com o
+# repositório, para decidir quais métricas vale a pena extrair.
+#####################################################################
+
+import os
+from collections import Counter
+from fontes_xml import abrir_xml
+from analisador_xml import iterar_eventos, analisar, liberar, ErroXML, exibir_backend
+from executor_corpus import listar_arquivos_xml, processar_conforme_termina
+
+# XSD do currículo Lattes distribuído com o repositório
+CAMINHO_XSD = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'xml_cvbase_src_main_resources_CurriculoLattes_12_09_2022.xsd')
+
+XS = '{http://www.w3.org/2001/XMLSchema}'
 
 def extract_tags(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-    
     tags = set()
+    elementos = []
+
+    # Leitura em fluxo: cada elemento é descartado depois de lido, sem montar a árvore inteira
+    # (o arquivo pode ser um XML comum ou um membro de ZIP, 'arquivo.zip!membro.xml')
+    with abrir_xml(xml_file) as arquivo:
+        for evento, elem in iterar_eventos(arquivo):
+            if evento == 'start':
+                tags.add(elem.tag)
+                elementos.append(elem)
+            else:
+                elementos.pop()
+                liberar(elem, elementos[-1] if elementos else None)
 
-    def recurse(node):
-        tags.add(node.tag)
-        for child in node:
-            recurse(child)
-    
-    recurse(root)
-    
     return tags
 
-# Caminho do arquivo XML
-xml_file_path = r'C:\Users\radim\Desktop\frantz.xml'
-tags = extract_tags(xml_file_path)
-tags = sorted(tags)
+# Função para criar um censo vazio
+def novo_censo():
+    return {
+        'arquivos': 0,
+        'tags': Counter(),          # Ocorrências de cada tag
+        'caminhos': Counter(),      # Ocorrências de cada caminho a partir da raiz
+        'presenca': Counter(),      # Quantidade de arquivos em que cada tag aparece
+        'atributos': Counter()      # Ocorrências de (tag, atributo) com valor não vazio
+    }
+
+# Função para fazer o censo de um arquivo XML em fluxo
+def recensear_arquivo(xml_file):
+    censo = novo_censo()
+    censo['arquivos'] = 1
+    pilha = []
+    elementos = []
+
+    with abrir_xml(xml_file) as arquivo:
+        for evento, elem in iterar_eventos(arquivo):
+            if evento == 'start':
+                pilha.append(elem.tag)
+                censo['tags'][elem.tag] += 1
+                censo['caminhos']['/'.join(pilha)] += 1
+                for atributo, valor in elem.attrib.items():
+                    if valor.strip():
+                        censo['atributos'][(elem.tag, atributo)] += 1
+                elementos.append(elem)
+            else:
+                pilha.pop()
+                elementos.pop()
+                liberar(elem, elementos[-1] if elementos else None)
+
+    censo['presenca'].update(censo['tags'].keys())
+    return censo
+
+# Função para tratar arquivos inválidos sem interromper o censo
+def _recensear(xml_file):
+    try:
+        return recensear_arquivo(xml_file)
+    except ErroXML as e:
+        print(f"Erro ao parsear o arquivo: {xml_file}, erro: {e}")
+        return None
+
+# Função para somar um censo a outro
+def mesclar_censo(total, censo):
+    total['arquivos'] += censo['arquivos']
+    for chave in ('tags', 'caminhos', 'presenca', 'atributos'):
+        total[chave].update(censo[chave])
+    return total
+
+# Função para fazer o censo de todos os XML de uma pasta (ou ZIP), em paralelo: um único conjunto de processos
+# percorre todos os arquivos e cada censo é mesclado ao total assim que fica pronto (limita a memória em corpora
+# grandes)
+def recensear_corpus(diretorio, processos=None, recursivo=True):
+    total = novo_censo()
+    invalidos = 0
+
+    for _, censo in processar_conforme_termina(_recensear, listar_arquivos_xml(diretorio, recursivo), processos):
+        if censo is None:
+            invalidos += 1
+        else:
+            mesclar_censo(total, censo)
+
+    total['invalidos'] = invalidos
+    return total
+
+# Função para ler os elementos declarados no XSD e os atributos de cada um
+def ler_elementos_xsd(caminho_xsd=CAMINHO_XSD):
+    elementos = {}
+    for elemento in analisar(caminho_xsd).findall(XS + 'element'):
+        elementos[elemento.get('name')] = {
+            atributo.get('name') for atributo in elemento.iter(XS + 'attribute') if atributo.get('name')
+        }
+    return elementos
+
+# Função para ler do XSD, para cada elemento, os filhos (em ordem), o máximo de ocorrências e os atributos
+def ler_esquema(caminho_xsd=CAMINHO_XSD):
+    esquema = {}
+    for elemento in analisar(caminho_xsd).findall(XS + 'element'):
+        filhos = []
+        minimos = {}
+        maximos = {}
+        for filho in elemento.iter(XS + 'element'):
+            if filho.get('ref'):
+                filhos.append(filho.get('ref'))
+                minimos[filho.get('ref')] = int(filho.get('minOccurs', '1'))
+                maximo = filho.get('maxOccurs', '1')
+                maximos[filho.get('ref')] = None if maximo == 'unbounded' else int(maximo)
+        atributos = []
+        for atributo in elemento.iter(XS + 'attribute'):
+            if atributo.get('name'):
+                enumeracao = tuple(valor.get('value') for valor in atributo.iter(XS + 'enumeration'))
+                atributos.append((atributo.get('name'), enumeracao))
+        esquema[elemento.get('name')] = {'filhos': filhos, 'minimos': minimos, 'maximos': maximos, 'atributos': atributos}
+    return esquema
+
+# Função para calcular a taxa de preenchimento de cada atributo (declarado no XSD ou encontrado)
+def calcular_preenchimento(censo, elementos_xsd):
+    preenchimento = {}
+    for tag, ocorrencias in censo['tags'].items():
+        atributos = set(elementos_xsd.get(tag, ()))
+        atributos.update(atributo for (tag_atual, atributo) in censo['atributos'] if tag_atual == tag)
+        for atributo in atributos:
+            preenchimento[(tag, atributo)] = censo['atributos'][(tag, atributo)] / ocorrencias
+    return preenchimento
+
+# Função para comparar as tags encontradas com os elementos do XSD
+def comparar_com_xsd(censo, elementos_xsd):
+    encontradas = set(censo['tags'])
+    declaradas = set(elementos_xsd)
+    atributos_nao_usados = sorted(
+        (tag, atributo)
+        for tag in declaradas & encontradas
+        for atributo in elementos_xsd[tag]
+        if censo['atributos'][(tag, atributo)] == 0
+    )
+    return {
+        'nao_encontradas': sorted(declaradas - encontradas),
+        'fora_do_xsd': sorted(encontradas - declaradas),
+        'atributos_nao_usados': atributos_nao_usados
+    }
+
+def exibir_censo(censo, elementos_xsd, limite=50):
+    comparacao = comparar_com_xsd(censo, elementos_xsd)
+    preenchimento = calcular_preenchimento(censo, elementos_xsd)
+
+    print(f"Arquivos recenseados: {censo['arquivos']} ({censo.get('invalidos', 0)} inválidos)")
+    print(f"Tags distintas: {len(censo['tags'])} de {len(elementos_xsd)} elementos do XSD")
+    print(f"Caminhos distintos: {len(censo['caminhos'])}")
+
+    # Empates em ordem alfabética: a ordem de chegada dos censos varia entre execuções
+    print("\nTags mais frequentes (ocorrências, arquivos com a tag):")
+    for tag, quantidade in sorted(censo['tags'].items(), key=lambda item: (-item[1], item[0]))[:limite]:
+        print(f"  {tag}: {quantidade} ({censo['presenca'][tag]} arquivos)")
+
+    print("\nCaminhos mais frequentes:")
+    for caminho, quantidade in sorted(censo['caminhos'].items(), key=lambda item: (-item[1], item[0]))[:limite]:
+        print(f"  {caminho}: {quantidade}")
+
+    print("\nAtributos com menor preenchimento (nas tags encontradas):")
+    for (tag, atributo), taxa in sorted(preenchimento.items(), key=lambda item: (item[1], item[0]))[:limite]:
+        print(f"  {tag}/@{atributo}: {taxa * 100:.2f}%")
+
+    print(f"\nElementos do XSD nunca encontrados: {len(comparacao['nao_encontradas'])}")
+    for tag in comparacao['nao_encontradas'][:limite]:
+        print(f"  {tag}")
+    print(f"Tags encontradas fora do XSD: {len(comparacao['fora_do_xsd'])}")
+    for tag in comparacao['fora_do_xsd']:
+        print(f"  {tag}")
+    print(f"Atributos do XSD nunca preenchidos: {len(comparacao['atributos_nao_usados'])}")
+
+def main(processos=None):
+    # Caminho do arquivo XML
+    xml_file_path = r'C:\Users\radim\Desktop\frantz.xml'
+    tags = extract_tags(xml_file_path)
+    tags = sorted(tags)
+
+    # Imprimindo as tags
+    for tag in tags:
+        print(tag)
+
+    # Censo de todos os currículos da pasta, comparado com o XSD
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    print("\nCenso das tags do corpus")
+    print("=" * 50)
+    exibir_censo(recensear_corpus(folder_path, processos), ler_elementos_xsd())
+    exibir_backend()
 
-# Imprimindo as tags
-for tag in tags:
-    print(tag)
+if __name__ == "__main__":
+    main()
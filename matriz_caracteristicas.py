@@ -0,0 +1,147 @@
+#####################################################################
+# Matriz de características dos orientadores: uma linha por currículo e uma
+# coluna por contagem extraída. É construída a partir das métricas de
+# `extrator_metricas` (ou do armazém) e serve de entrada para a pontuação
+# vetorizada dos critérios em `guidance_score/pontuacao_vetorizada.py`.
+#
+# Os perfis de áreas do conhecimento ficam em formato esparso (linha,
+# coluna, valor): cada coluna é um prefixo (grande área), (grande área,
+# área), (..., sub-área) ou (..., especialidade), formado pelos códigos da
+# tabela de áreas (`tabela_areas`).
+#####################################################################
+
+from collections import Counter
+import numpy as np
+
+from extrator_metricas import contar_por_natureza
+from resolucao_autores import coautores_resolvidos
+import tabela_areas
+from perfil_execucao import medir
+
+# Colunas da matriz, na ordem em que são armazenadas
+COLUNAS = [
+    'disciplinas',            # Disciplinas únicas ensinadas (PE)
+    'pesquisa',               # Atividades de pesquisa e desenvolvimento (PP)
+    'extensao',               # Serviço técnico, treinamento e extensão (PX)
+    'artigos',                # ARTIGO-PUBLICADO
+    'conc_mestrado',          # ORIENTACOES-CONCLUIDAS-PARA-MESTRADO
+    'conc_doutorado',         # ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO
+    'conc_iniciacao',         # Outras orientações concluídas de iniciação científica
+    'conc_tcc',               # Outras orientações concluídas de TCC de graduação
+    'and_iniciacao',          # Orientações em andamento de iniciação científica
+    'and_graduacao',          # Orientações em andamento de graduação
+    'and_mestrado',           # Orientações em andamento de mestrado
+    'and_doutorado',          # Orientações em andamento de doutorado
+    'bancas_graduacao',
+    'bancas_mestrado',
+    'bancas_doutorado',
+    'coautores',              # Autores distintos (nomes resolvidos) dos artigos publicados
+    'soma_fi_percentil'       # Soma de fator de impacto x percentil (NaN se indisponível)
+]
+
+# Seções usadas na comparação de áreas do conhecimento (as mesmas de p_similar)
+SECOES_SIMILARIDADE = ['GRADUACAO', 'MESTRADO', 'DOUTORADO', 'POS-DOUTORADO']
+
+# Pontuação de cada nível de prefixo, acumulada como em p_similar.compare_areas
+PESOS_NIVEL = {1: 1, 2: 2, 3: 3, 4: 5}
+
+# Função para somar fator de impacto x percentil dos artigos (NaN quando algum dado falta)
+def _soma_fator_percentil(artigos):
+    soma = 0.0
+    for artigo in artigos:
+        try:
+            soma += float(artigo['fator_impacto']) * float(artigo['percentil'])
+        except (TypeError, ValueError):
+            return float('nan')
+    return soma
+
+# Função para calcular a linha de características de um currículo (`chaves_autores`: resolução dos coautores do
+# corpus, ver resolucao_autores.resolver_corpus)
+def extrair_linha(metricas, chaves_autores=None):
+    tags = metricas['tags']
+    caminhos = metricas['caminhos']
+    outras = 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'
+    andamento = 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-'
+
+    return [
+        len(metricas['disciplinas']),
+        caminhos[('ATIVIDADES-DE-PESQUISA-E-DESENVOLVIMENTO', 'PESQUISA-E-DESENVOLVIMENTO')],
+        caminhos[('ATIVIDADES-DE-SERVICO-TECNICO-ESPECIALIZADO', 'SERVICO-TECNICO-ESPECIALIZADO')]
+        + caminhos[('ATIVIDADES-DE-TREINAMENTO-MINISTRADO', 'TREINAMENTO-MINISTRADO')]
+        + caminhos[('ATIVIDADES-DE-EXTENSAO-UNIVERSITARIA', 'EXTENSAO-UNIVERSITARIA')],
+        tags['ARTIGO-PUBLICADO'],
+        tags['ORIENTACOES-CONCLUIDAS-PARA-MESTRADO'],
+        tags['ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO'],
+        contar_por_natureza(metricas, outras, 'INICIACAO_CIENTIFICA', maiusculas=True),
+        contar_por_natureza(metricas, outras, 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO', maiusculas=True),
+        contar_por_natureza(metricas, andamento + 'INICIACAO-CIENTIFICA', 'Iniciação Científica'),
+        contar_por_natureza(metricas, andamento + 'GRADUACAO', 'Graduação'),
+        contar_por_natureza(metricas, andamento + 'MESTRADO', 'Dissertação de mestrado'),
+        contar_por_natureza(metricas, andamento + 'DOUTORADO', 'Tese de doutorado'),
+        tags['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO'],
+        tags['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO'],
+        tags['DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO'],
+        len(coautores_resolvidos(metricas, chaves_autores)),
+        _soma_fator_percentil(metricas['artigos'])
+    ]
+
+# Função para contar os prefixos (em códigos) das áreas do conhecimento de um currículo
+def perfil_areas(metricas):
+    perfil = Counter()
+    for secao in SECOES_SIMILARIDADE:
+        for codigo in tabela_areas.codificar_areas(metricas['areas'][secao]):
+            perfil.update(tabela_areas.prefixos(codigo))
+    return perfil
+
+# Função para codificar perfis de áreas em formato esparso (linha, prefixo, contagem)
+def codificar_perfis(perfis):
+    prefixos = {}
+    linhas_areas, colunas_areas, valores_areas = [], [], []
+    for indice, perfil in enumerate(perfis):
+        for prefixo, quantidade in perfil.items():
+            linhas_areas.append(indice)
+            colunas_areas.append(prefixos.setdefault(prefixo, len(prefixos)))
+            valores_areas.append(quantidade)
+
+    return {
+        'prefixos': prefixos,
+        'linhas': np.array(linhas_areas, dtype=np.int64),
+        'colunas': np.array(colunas_areas, dtype=np.int64),
+        'valores': np.array(valores_areas, dtype=np.float64)
+    }
+
+# Função para obter o peso de nível (1, 2, 3 ou 5) de cada prefixo codificado
+def pesos_prefixos(prefixos):
+    pesos = np.zeros(len(prefixos))
+    for prefixo, posicao in prefixos.items():
+        pesos[posicao] = PESOS_NIVEL[len(prefixo)]
+    return pesos
+
+# Função para montar a matriz de características a partir de {nome: métricas}, com a resolução dos coautores
+# do corpus
+@medir('metrica')
+def construir_matriz(metricas_por_orientador, chaves_autores=None):
+    nomes = []
+    linhas = []
+    perfis = []
+    for nome, metricas in metricas_por_orientador.items():
+        if metricas is None:
+            continue
+        nomes.append(nome)
+        linhas.append(extrair_linha(metricas, chaves_autores))
+        perfis.append(perfil_areas(metricas))
+    return montar_matriz(nomes, linhas, perfis)
+
+# Função para montar a matriz a partir das linhas e dos perfis de áreas já calculados de cada orientador
+def montar_matriz(nomes, linhas, perfis):
+    return {
+        'nomes': nomes,
+        'colunas': COLUNAS,
+        'indice': {coluna: posicao for posicao, coluna in enumerate(COLUNAS)},
+        'valores': np.array(linhas, dtype=np.float64).reshape(len(nomes), len(COLUNAS)),
+        'areas': codificar_perfis(perfis)
+    }
+
+# Função para obter uma coluna da matriz pelo nome
+def coluna(matriz, nome):
+    return matriz['valores'][:, matriz['indice'][nome]]
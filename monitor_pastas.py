@@ -0,0 +1,267 @@
+#####################################################################
+# Monitor de pastas: mantém o ranking combinado do corpus atualizado
+# enquanto currículos são adicionados, alterados ou removidos. A cada
+# `intervalo` segundos, o tamanho e a versão (mtime, ou CRC e data de um
+# membro de ZIP; ver fontes_xml.estado_xml) de cada XML das pastas são
+# comparados com os do último processamento. Uma alteração só é
+# processada depois de o mesmo estado ser observado por `espera` segundos,
+# para não ler arquivos ainda sendo copiados ou baixados.
+#
+# Apenas os currículos alterados são extraídos (pelo armazém de métricas),
+# e apenas as linhas da matriz afetadas são recalculadas: as dos próprios
+# currículos e as dos currículos com coautores nos blocos de nomes que a
+# resolução de autores refez. Os normalizadores do corpus são esboços
+# atualizados valor a valor (substituir, adicionar ou remover), sem
+# percorrer o corpus de novo. Em seguida, as características de ranking e
+# o ranking combinado são recalculados sobre as linhas mantidas em memória
+# e publicados na pasta de destino:
+#   - ranking.json: os k melhores orientadores, com a pontuação de cada
+#     critério e o horário da atualização;
+#   - caracteristicas_ranking.npy (e _nomes.json): as características de
+#     ranking, no formato de guidance_score/ranking_pesos.
+# Os arquivos são escritos em arquivos temporários e trocados com
+# os.replace, de modo que um leitor nunca vê uma publicação pela metade.
+#
+# Uso: python monitor_pastas.py (Ctrl+C para encerrar)
+#####################################################################
+
+import os
+import sys
+import json
+import time
+import datetime
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'guidance_score'))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas_arquivos
+from executor_corpus import listar_arquivos_xml
+from fontes_xml import estado_xml, nome_curriculo
+from matriz_caracteristicas import extrair_linha, perfil_areas, montar_matriz
+from resolucao_autores import resolver_corpus, mencoes, bloco
+from estatisticas_corpus import adicionar_valor, remover_valor, substituir_valor
+from pontuacao_geral import novos_normalizadores, valores_normalizadores, calcular_limites
+from ranking_pesos import (preparar_caracteristicas, pontuar_criterios, pontuar_combinado, melhores,
+                           salvar_caracteristicas, CARACTERISTICAS_PADRAO)
+from perfil_execucao import medir
+
+RANKING = 'ranking.json'
+
+# Função para listar o estado atual dos XML das pastas: {caminho: (tamanho, estado)}
+def listar_estados(pastas, recursivo=True):
+    estados = {}
+    for pasta in pastas:
+        for caminho, tamanho in listar_arquivos_xml(pasta, recursivo):
+            try:
+                estados[caminho] = (tamanho, estado_xml(caminho))
+            except FileNotFoundError:
+                # Removido entre a listagem e a leitura do estado; aparece como remoção na próxima verificação
+                continue
+    return estados
+
+# Função para criar o monitor: o estado mantido entre as verificações
+def novo_monitor(pastas, destino, reference_xml=None, pesos=None, k=10, h_index=10, espera=2.0,
+                 caminho_armazem=None, processos=None, recursivo=True):
+    return {
+        'pastas': list(pastas),
+        'destino': destino,
+        'perfil_referencia': perfil_areas(obter_metricas(reference_xml)) if reference_xml else None,
+        'pesos': pesos,
+        'k': k,
+        'h_index': h_index,
+        'espera': espera,
+        'caminho_armazem': caminho_armazem,
+        'processos': processos,
+        'recursivo': recursivo,
+        'conhecidos': {},       # caminho -> estado do último processamento
+        'observados': {},       # caminho -> (estado observado ou None se removido, instante da primeira observação)
+        'metricas': {},         # caminho -> métricas (None se o XML é inválido)
+        'linhas': {},           # caminho -> linha da matriz de características
+        'perfis': {},           # caminho -> perfil de áreas
+        'blocos': {},           # caminho -> blocos de nomes dos coautores
+        'normalizadores': novos_normalizadores(),
+        'consistente': True,    # False se um processamento foi interrompido no meio: todas as linhas são refeitas
+        'publicado': False      # False se há alterações processadas ainda não publicadas
+    }
+
+# Função para obter os caminhos com alterações estáveis há pelo menos `espera` segundos
+def detectar_alteracoes(monitor, estados, agora):
+    conhecidos, observados = monitor['conhecidos'], monitor['observados']
+    prontos = []
+    for caminho in set(estados) | set(conhecidos):
+        estado = estados[caminho][1] if caminho in estados else None
+        if estado == conhecidos.get(caminho):
+            # Sem alteração (ou a alteração foi desfeita antes de ser processada)
+            observados.pop(caminho, None)
+            continue
+        observado = observados.get(caminho)
+        if observado is None or observado[0] != estado:
+            # Alteração nova, ou o arquivo ainda está mudando: a espera recomeça
+            observados[caminho] = (estado, agora)
+        elif agora - observado[1] >= monitor['espera']:
+            prontos.append(caminho)
+    return sorted(prontos)
+
+# Função para atualizar a linha de um currículo e os esboços dos normalizadores, com a resolução dos coautores
+# do corpus
+def _atualizar_linha(monitor, caminho, chaves_autores):
+    normalizadores = monitor['normalizadores']
+    anterior = monitor['linhas'].pop(caminho, None)
+    monitor['perfis'].pop(caminho, None)
+    monitor['blocos'].pop(caminho, None)
+    metricas = monitor['metricas'].get(caminho)
+
+    valores_anteriores = valores_normalizadores(anterior) if anterior is not None else None
+    if metricas is None:
+        if valores_anteriores is not None:
+            for nome, valor in valores_anteriores.items():
+                remover_valor(normalizadores[nome], valor)
+        return
+
+    linha = extrair_linha(metricas, chaves_autores)
+    monitor['linhas'][caminho] = linha
+    monitor['perfis'][caminho] = perfil_areas(metricas)
+    monitor['blocos'][caminho] = {bloco(forma) for forma, _ in mencoes(metricas)}
+    for nome, valor in valores_normalizadores(linha).items():
+        if valores_anteriores is None:
+            adicionar_valor(normalizadores[nome], valor)
+        else:
+            substituir_valor(normalizadores[nome], valores_anteriores[nome], valor)
+
+# Função para processar os caminhos alterados: extrai os novos ou modificados, descarta os removidos e
+# recalcula as linhas afetadas; devolve as estatísticas do armazém. Os caminhos só deixam de estar pendentes
+# ao final: se o processamento falhar, são processados de novo na próxima verificação
+@medir('metrica')
+def aplicar_alteracoes(monitor, caminhos, estados):
+    alterados = [(caminho, estados[caminho][0]) for caminho in caminhos if caminho in estados]
+    metricas_novas, estatisticas = carregar_metricas_arquivos(
+        alterados, monitor['caminho_armazem'], monitor['processos'])
+
+    # Daqui em diante, uma falha deixa linhas e normalizadores parcialmente atualizados
+    refazer_todas = not monitor['consistente']
+    monitor['consistente'] = False
+    monitor['publicado'] = False
+    for caminho in caminhos:
+        if caminho in estados:
+            monitor['metricas'][caminho] = metricas_novas[caminho]
+        else:
+            monitor['metricas'].pop(caminho, None)
+
+    # Os coautores de um currículo não alterado mudam quando um dos seus blocos de nomes é refeito
+    resolucao = resolver_corpus(monitor['metricas'], monitor['caminho_armazem'])
+    afetados = set(caminhos) | (set(monitor['linhas']) | set(monitor['metricas']) if refazer_todas else set())
+    afetados.update(caminho for caminho, blocos in monitor['blocos'].items() if blocos & resolucao['blocos_alterados'])
+    for caminho in sorted(afetados):
+        _atualizar_linha(monitor, caminho, resolucao['chaves'])
+
+    for caminho in caminhos:
+        monitor['observados'].pop(caminho, None)
+        if caminho in estados:
+            monitor['conhecidos'][caminho] = estados[caminho][1]
+        else:
+            monitor['conhecidos'].pop(caminho, None)
+    monitor['consistente'] = True
+
+    estatisticas['afetados'] = len(afetados)
+    return estatisticas
+
+# Função para gravar um arquivo de forma atômica: `gravar` escreve no caminho temporário recebido
+def _gravar_atomico(caminho, gravar):
+    temporario = caminho + '.tmp'
+    gravar(temporario)
+    os.replace(temporario, caminho)
+
+# Função para converter um valor de critério para JSON (NaN, produção indisponível, vira None)
+def _valor_json(valor):
+    valor = float(valor)
+    return None if valor != valor else valor
+
+# Função para recalcular o ranking a partir das linhas em memória e publicá-lo na pasta de destino
+@medir('saida')
+def publicar(monitor):
+    nomes = sorted(monitor['linhas'])
+    matriz = montar_matriz(nomes, [monitor['linhas'][nome] for nome in nomes],
+                           [monitor['perfis'][nome] for nome in nomes])
+    P_max, limites_reputacao = calcular_limites(monitor['normalizadores']) if nomes else (None, None)
+    caracteristicas = preparar_caracteristicas(
+        matriz, monitor['perfil_referencia'], monitor['h_index'], P_max, limites_reputacao)
+
+    criterios = pontuar_criterios(caracteristicas, monitor['pesos'])
+    combinado = pontuar_combinado(caracteristicas, monitor['pesos'])
+    ranking = [{
+        'arquivo': nome_curriculo(nomes[posicao]),
+        'caminho': nomes[posicao],
+        'pontuacao': float(combinado[posicao]),
+        'criterios': {criterio: _valor_json(valores[posicao]) for criterio, valores in criterios.items()}
+    } for posicao in melhores(combinado, monitor['k'])]
+    publicacao = {
+        'atualizacao': datetime.datetime.now().isoformat(timespec='seconds'),
+        'orientadores': len(nomes),
+        'ranking': ranking
+    }
+
+    os.makedirs(monitor['destino'], exist_ok=True)
+    caminho_caracteristicas = os.path.join(monitor['destino'], CARACTERISTICAS_PADRAO)
+    temporario = os.path.join(monitor['destino'], 'tmp_' + CARACTERISTICAS_PADRAO)
+    salvar_caracteristicas(caracteristicas, temporario)
+    os.replace(temporario, caminho_caracteristicas)
+    os.replace(os.path.splitext(temporario)[0] + '_nomes.json',
+               os.path.splitext(caminho_caracteristicas)[0] + '_nomes.json')
+
+    def gravar_ranking(caminho):
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(publicacao, arquivo, ensure_ascii=False, indent=2)
+    _gravar_atomico(os.path.join(monitor['destino'], RANKING), gravar_ranking)
+    monitor['publicado'] = True
+    return publicacao
+
+# Função para carregar o corpus inicial das pastas e publicar o primeiro ranking
+def iniciar(monitor):
+    # O estado é lido antes da extração: o que mudar durante a carga é detectado na primeira verificação
+    estados = listar_estados(monitor['pastas'], monitor['recursivo'])
+    aplicar_alteracoes(monitor, sorted(estados), estados)
+    return publicar(monitor)
+
+# Função para executar uma verificação das pastas; devolve o número de currículos processados
+def verificar(monitor):
+    inicio = time.perf_counter()
+    estados = listar_estados(monitor['pastas'], monitor['recursivo'])
+    prontos = detectar_alteracoes(monitor, estados, time.monotonic())
+    if not prontos:
+        # Uma publicação que falhou na verificação anterior é refeita
+        if not monitor['publicado']:
+            publicar(monitor)
+        return 0
+    estatisticas = aplicar_alteracoes(monitor, prontos, estados)
+    publicacao = publicar(monitor)
+    print(f"{publicacao['atualizacao']}: {len(prontos)} currículo(s) alterado(s), {estatisticas['extraidos']} extraído(s), "
+          f"{estatisticas['afetados']} linha(s) recalculada(s); ranking publicado em {time.perf_counter() - inicio:.2f} s")
+    return len(prontos)
+
+# Função para monitorar as pastas até Ctrl+C (ou por `ciclos` verificações); um erro em uma verificação
+# (por exemplo, um arquivo removido durante a leitura) é registrado, e as alterações continuam pendentes
+def monitorar(monitor, intervalo=1.0, ciclos=None):
+    ciclo = 0
+    try:
+        while ciclos is None or ciclo < ciclos:
+            time.sleep(intervalo)
+            try:
+                verificar(monitor)
+            except Exception as erro:
+                print(f"Erro na verificação das pastas ({type(erro).__name__}): {erro}")
+            ciclo += 1
+    except KeyboardInterrupt:
+        print("Monitor encerrado.")
+
+def main(processos=None):
+    reference_xml = r'C:\Users\radim\Desktop\Miriam Ines Marchi.xml'
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    destino = os.path.join(folder_path, 'publicacao')
+
+    monitor = novo_monitor([folder_path], destino, reference_xml, processos=processos)
+    publicacao = iniciar(monitor)
+    print(f"Ranking inicial de {publicacao['orientadores']} orientador(es) publicado em {destino}")
+    print("Monitorando alterações (Ctrl+C para encerrar)...")
+    monitorar(monitor)
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,28 @@
 import os
-import xml.etree.ElementTree as ET
 from collections import defaultdict
+from executor_corpus import processar_corpus
+from fontes_xml import abrir_xml
+from analisador_xml import analisar, buscar, ErroXML, exibir_backend
+from perfil_execucao import medir, etapa
+from cache_metricas import obter_metricas
+from extrator_metricas import ARVORE_COMPLETA
 
 # Função para extrair informações de artigos publicados de um arquivo XML
+@medir('metrica')
 def extrair_informacoes(xml_path):
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
+        with etapa('analise') as registro, abrir_xml(xml_path) as arquivo:
+            root = analisar(arquivo)
+            registro['bytes'] = arquivo.tell()
         total_artigos = 0
         autores = defaultdict(int)
 
         # Buscar artigos publicados dentro de ARTIGOS-PUBLICADOS
-        for artigo in root.findall('.//ARTIGO-PUBLICADO'):
+        for artigo in buscar(root, './/ARTIGO-PUBLICADO'):
             total_artigos += 1
 
             # Extrair nomes dos autores
-            for autor in artigo.findall('.//AUTORES'):
+            for autor in buscar(artigo, './/AUTORES'):
                 nome_autor = autor.get('NOME-COMPLETO-DO-AUTOR', 'N/A')
                 autores[nome_autor] += 1
 
@@ -24,33 +31,55 @@ def extrair_informacoes(xml_path):
             'Autores': dict(autores)
         }
 
-    except ET.ParseError as e:
+    except ErroXML as e:
         print(f"Erro ao analisar o arquivo XML: {xml_path}, erro: {e}")
         return None
 
-# Caminho para a pasta contendo os arquivos XML
-caminho_pasta = r'C:\Users\radim\Desktop\ppgmmc'
+# Versão em fluxo de `extrair_informacoes`, a partir da passagem única do extrator de métricas (memória constante)
+@medir('metrica')
+def extrair_informacoes_fluxo(xml_path):
+    try:
+        metricas = obter_metricas(xml_path)
+    except ErroXML as e:
+        print(f"Erro ao analisar o arquivo XML: {xml_path}, erro: {e}")
+        return None
+
+    autores = defaultdict(int)
+    for artigo in metricas['artigos']:
+        for nome_autor in artigo['autores']:
+            autores[nome_autor] += 1
 
-# Dicionário para armazenar os resultados por arquivo
-resultados_por_arquivo = {}
+    return {
+        'Total de Artigos': len(metricas['artigos']),
+        'Autores': dict(autores)
+    }
 
-# Verificar se a pasta existe e se contém arquivos XML
-if os.path.exists(caminho_pasta):
-    for arquivo in os.listdir(caminho_pasta):
-        if arquivo.endswith('.xml'):
-            caminho_arquivo = os.path.join(caminho_pasta, arquivo)
+def main(processos=None):
+    # Caminho para a pasta contendo os arquivos XML
+    caminho_pasta = r'C:\Users\radim\Desktop\ppgmmc'
+
+    # Dicionário para armazenar os resultados por arquivo
+    resultados_por_arquivo = {}
+
+    # Verificar se a pasta existe e se contém arquivos XML
+    if os.path.exists(caminho_pasta):
+        extrair = extrair_informacoes if ARVORE_COMPLETA else extrair_informacoes_fluxo
+        for caminho_arquivo, dados_arquivo in processar_corpus(extrair, caminho_pasta, processos):
             print(f"Analisando arquivo: {caminho_arquivo}")
-            resultados_por_arquivo[arquivo] = extrair_informacoes(caminho_arquivo)
-
-    # Exibir os resultados no terminal
-    for nome_arquivo, dados_arquivo in resultados_por_arquivo.items():
-        if dados_arquivo:
-            print(f"Arquivo XML: {nome_arquivo}")
-            print(f"Total de artigos publicados: {dados_arquivo['Total de Artigos']}")
-            print("Autores dos Artigos:")
-            for autor, quantidade in sorted(dados_arquivo['Autores'].items(), key=lambda item: item[1], reverse=True):
-                print(f"  - Autor: {autor}, Quantidade: {quantidade}")
-            print("-----\n")
-else:
-    print(f"Pasta não encontrada: {caminho_pasta}")
+            resultados_por_arquivo[os.path.basename(caminho_arquivo)] = dados_arquivo
+
+        # Exibir os resultados no terminal
+        for nome_arquivo, dados_arquivo in resultados_por_arquivo.items():
+            if dados_arquivo:
+                print(f"Arquivo XML: {nome_arquivo}")
+                print(f"Total de artigos publicados: {dados_arquivo['Total de Artigos']}")
+                print("Autores dos Artigos:")
+                for autor, quantidade in sorted(dados_arquivo['Autores'].items(), key=lambda item: item[1], reverse=True):
+                    print(f"  - Autor: {autor}, Quantidade: {quantidade}")
+                print("-----\n")
+        exibir_backend()
+    else:
+        print(f"Pasta não encontrada: {caminho_pasta}")
 
+if __name__ == "__main__":
+    main()
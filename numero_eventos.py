@@ -8,10 +8,12 @@ e gera um relatório em formato PDF com essas informações.
    - Extrai o ano de participação em congressos de cada evento encontrado.
    - Conta a quantidade de eventos por ano e armazena essas informações em um dicionário.
    - Retorna o dicionário contendo a contagem de eventos por ano.
+   - `contar_eventos_por_ano_fluxo` devolve o mesmo resultado a partir da passagem única do extrator de
+     métricas, em memória constante; é a versão usada por padrão (LATTES_ARVORE=1 volta à árvore completa).
 
 2. Função `processar_arquivos_xml`:
    - Percorre todos os arquivos XML em um diretório especificado.
-   - Para cada arquivo XML encontrado, chama a função `contar_eventos_por_ano` e armazena os resultados.
+   - Distribui os arquivos entre processos (via `executor_corpus`), chamando a função `contar_eventos_por_ano` para cada um, e armazena os resultados na ordem dos nomes de arquivo.
    - Adiciona a contagem total de eventos para cada arquivo.
    - Retorna um dicionário contendo os resultados de todos os arquivos processados.
 
@@ -33,18 +35,25 @@ e gera um relatório em formato PDF com essas informações.
 
 import os
 from fpdf import FPDF
-import xml.etree.ElementTree as ET
 from collections import defaultdict
-
+from executor_corpus import processar_corpus
+from fontes_xml import abrir_xml
+from analisador_xml import analisar, buscar, buscar_primeiro, exibir_backend
+from cache_metricas import obter_metricas
+from extrator_metricas import ARVORE_COMPLETA
+from perfil_execucao import medir, etapa
+
+@medir('metrica')
 def contar_eventos_por_ano(xml_file):
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
+        with etapa('analise') as registro, abrir_xml(xml_file) as arquivo:
+            root = analisar(arquivo)
+            registro['bytes'] = arquivo.tell()
 
         eventos_por_ano = defaultdict(int)
 
-        for participacao in root.findall('.//PARTICIPACAO-EM-CONGRESSO'):
-            ano = participacao.find('DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO').get('ANO', 'Ano desconhecido')
+        for participacao in buscar(root, './/PARTICIPACAO-EM-CONGRESSO'):
+            ano = buscar_primeiro(participacao, 'DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO').get('ANO', 'Ano desconhecido')
             eventos_por_ano[ano] += 1
 
         return dict(eventos_por_ano)
@@ -53,19 +62,36 @@ def contar_eventos_por_ano(xml_file):
         print(f"Erro ao contar eventos por ano no arquivo XML {xml_file}: {e}")
         return None
 
-def processar_arquivos_xml(diretorio):
+# Versão em fluxo de `contar_eventos_por_ano`, com o mesmo resultado (inclusive o erro de uma participação sem dados básicos)
+@medir('metrica')
+def contar_eventos_por_ano_fluxo(xml_file):
+    try:
+        metricas = obter_metricas(xml_file)
+    except Exception as e:
+        print(f"Erro ao contar eventos por ano no arquivo XML {xml_file}: {e}")
+        return None
+
+    if metricas['eventos_sem_dados']:
+        print(f"Erro ao contar eventos por ano no arquivo XML {xml_file}: "
+              f"{metricas['eventos_sem_dados']} participação(ões) sem DADOS-BASICOS-DA-PARTICIPACAO-EM-CONGRESSO")
+        return None
+
+    # Cópia: o total é acrescentado ao dicionário devolvido, e as métricas ficam no cache
+    return dict(metricas['eventos_por_ano'])
+
+def processar_arquivos_xml(diretorio, processos=None):
     resultados = {}
+    contar = contar_eventos_por_ano if ARVORE_COMPLETA else contar_eventos_por_ano_fluxo
 
-    for arquivo in os.listdir(diretorio):
-        if arquivo.endswith('.xml'):
-            caminho_arquivo = os.path.join(diretorio, arquivo)
-            eventos_por_ano = contar_eventos_por_ano(caminho_arquivo)
-            if eventos_por_ano is not None:
-                resultados[arquivo] = eventos_por_ano
-                resultados[arquivo]['Total'] = sum(eventos_por_ano.values())
+    for caminho_arquivo, eventos_por_ano in processar_corpus(contar, diretorio, processos):
+        if eventos_por_ano is not None:
+            arquivo = os.path.basename(caminho_arquivo)
+            resultados[arquivo] = eventos_por_ano
+            resultados[arquivo]['Total'] = sum(eventos_por_ano.values())
 
     return resultados
 
+@medir('saida')
 def exibir_resultados_terminal(resultados):
     print("Participação em Congressos por Ano")
     print("=" * 40)
@@ -78,6 +104,7 @@ def exibir_resultados_terminal(resultados):
         print(f"Total de Eventos: {eventos_por_ano['Total']}")
         print("-" * 40)
 
+@medir('saida')
 def gerar_pdf(resultados, nome_pdf):
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -109,6 +136,7 @@ def main():
         nome_pdf = 'participacao_eventos.pdf'
         gerar_pdf(resultados, nome_pdf)
         print(f"PDF {nome_pdf} gerado com sucesso.")
+        exibir_backend()
     else:
         print("Nenhum arquivo XML encontrado no diretório.")
 
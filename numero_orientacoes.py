@@ -1,10 +1,13 @@
 import os
-import xml.etree.ElementTree as ET
+from cache_metricas import obter_metricas
+from extrator_metricas import contar_por_natureza
+from armazem_metricas import carregar_metricas, exibir_estatisticas
+from perfil_execucao import medir
 
 # Função para contar orientações concluídas em um arquivo XML
+@medir('metrica')
 def count_orientacoes_concluidas(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_concluidas = {
         'iniciacao_cientifica': 0,
@@ -19,69 +22,60 @@ def count_orientacoes_concluidas(xml_file):
     }
 
     for termo_orientacao, categoria in orientacoes_map.items():
-        orientacoes_concluidas[categoria] += len(list(root.iter(termo_orientacao)))
+        orientacoes_concluidas[categoria] += metricas['tags'][termo_orientacao]
 
-    for orientacao in root.iter('DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'):
-        natureza = orientacao.attrib.get('NATUREZA', '').upper()
-        if natureza == 'INICIACAO_CIENTIFICA':
-            orientacoes_concluidas['iniciacao_cientifica'] += 1
-        elif natureza == 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO':
-            orientacoes_concluidas['graduacao'] += 1
+    orientacoes_concluidas['iniciacao_cientifica'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'INICIACAO_CIENTIFICA', maiusculas=True)
+    orientacoes_concluidas['graduacao'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'TRABALHO_DE_CONCLUSAO_DE_CURSO_GRADUACAO', maiusculas=True)
 
     return orientacoes_concluidas
 
 # Função para contar orientações em andamento em um arquivo XML
+@medir('metrica')
 def count_orientacoes_andamento(xml_file):
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+    metricas = obter_metricas(xml_file)
 
     orientacoes_andamento = {
-        'iniciacao_cientifica': 0,
-        'graduacao': 0,
-        'mestrado': 0,
-        'doutorado': 0
+        'iniciacao_cientifica': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA', 'Iniciação Científica'),
+        'graduacao': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO', 'Graduação'),
+        'mestrado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'Dissertação de mestrado'),
+        'doutorado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO', 'Tese de doutorado')
     }
 
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Iniciação Científica':
-            orientacoes_andamento['iniciacao_cientifica'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Graduação':
-            orientacoes_andamento['graduacao'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Dissertação de mestrado':
-            orientacoes_andamento['mestrado'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Tese de doutorado':
-            orientacoes_andamento['doutorado'] += 1
-
     return orientacoes_andamento
 
+# Função para somar orientações concluídas e em andamento de um arquivo XML
+@medir('pontuacao')
+def calcular_experiencia(xml_file):
+    concluida = count_orientacoes_concluidas(xml_file)
+    andamento = count_orientacoes_andamento(xml_file)
+
+    experiencia = {
+        'iniciacao_cientifica': concluida['iniciacao_cientifica'] + andamento['iniciacao_cientifica'],
+        'graduacao': concluida['graduacao'] + andamento['graduacao'],
+        'mestrado': concluida['mestrado'] + andamento['mestrado'],
+        'doutorado': concluida['doutorado'] + andamento['doutorado']
+    }
+    return experiencia
+
 ##### Caminho dos arquivos XML #####
 path = r'C:\Users\radim\Desktop\ppgmmc'
 
-# Processar cada arquivo XML
-for xml_file in os.listdir(path):
-    if xml_file.endswith(".xml"):
-        full_path = os.path.join(path, xml_file)
-        orientador_nome = os.path.splitext(xml_file)[0]
+def main(processos=None):
+    # Métricas de cada arquivo XML, reaproveitando as já armazenadas
+    metricas_por_arquivo, estatisticas = carregar_metricas(path, processos=processos)
 
-        concluida = count_orientacoes_concluidas(full_path)
-        andamento = count_orientacoes_andamento(full_path)
-
-        experiencia = {
-            'iniciacao_cientifica': concluida['iniciacao_cientifica'] + andamento['iniciacao_cientifica'],
-            'graduacao': concluida['graduacao'] + andamento['graduacao'],
-            'mestrado': concluida['mestrado'] + andamento['mestrado'],
-            'doutorado': concluida['doutorado'] + andamento['doutorado']
-        }
+    # Processar cada arquivo XML
+    for full_path, metricas in metricas_por_arquivo.items():
+        if metricas is None:
+            continue
+        experiencia = calcular_experiencia(full_path)
+        orientador_nome = os.path.splitext(os.path.basename(full_path))[0]
 
         # Exibir informações no terminal
         print(f"Orientador: {orientador_nome}")
@@ -91,3 +85,8 @@ for xml_file in os.listdir(path):
         print(f"  Experiência em Mestrado: {experiencia['mestrado']}")
         print(f"  Experiência em Doutorado: {experiencia['doutorado']}")
         print("-----\n")
+
+    exibir_estatisticas(estatisticas)
+
+if __name__ == "__main__":
+    main()
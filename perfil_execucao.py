@@ -0,0 +1,236 @@
+#####################################################################
+# Instrumentação opcional dos pontos quentes dos scripts. Desligada por
+# padrão: com a variável de ambiente LATTES_PERFIL definida (caminho de um
+# arquivo .jsonl, ou "1" para perfil_lattes.jsonl), cada etapa medida grava
+# uma linha JSON com o nome da etapa, o arquivo XML (quando houver), o
+# tempo, os bytes lidos e o pico de memória residente do processo (RSS)
+# durante a etapa, que inclui as alocações de bibliotecas nativas, como a
+# árvore do libxml2 no analisador lxml padrão. No Linux, o pico de RSS é
+# reiniciado no começo de cada etapa (/proc/self/clear_refs); nos demais
+# sistemas, é o pico do processo até o fim da etapa (getrusage), e no
+# Windows não é registrado. Os processos do executor gravam no mesmo arquivo.
+#
+# Com LATTES_PERFIL_HEAP=1, cada etapa registra também o pico da memória
+# alocada pelo Python (tracemalloc) e quanto a etapa alocou. O tracemalloc
+# deixa a execução algumas vezes mais lenta, por isso fica desligado por
+# padrão mesmo com o perfil ligado.
+#
+# As etapas são nomeadas por categoria: analise (leitura do XML),
+# extracao (passagem única do extrator), metrica:<função>,
+# pontuacao:<função> e saida:<função> (terminal, PDF...). Ao final do
+# processo principal, um resumo com as etapas e os arquivos mais lentos é
+# exibido na saída de erros; o resumo também pode ser gerado depois com
+# `python perfil_execucao.py [arquivo.jsonl]`.
+#
+# Com o perfil desligado, `medir` devolve a própria função decorada e
+# `etapa` um contexto vazio, sem custo nos scripts.
+#####################################################################
+
+import os
+import sys
+import json
+import time
+import atexit
+import tracemalloc
+import multiprocessing
+try:
+    import resource
+except ImportError:
+    # Windows: sem getrusage
+    resource = None
+from functools import wraps
+from contextlib import contextmanager
+from collections import defaultdict
+
+PERFIL_PADRAO = 'perfil_lattes.jsonl'
+
+# Caminho do arquivo de perfil (None com o perfil desligado)
+_configuracao = os.environ.get('LATTES_PERFIL', '').strip()
+CAMINHO_PERFIL = None if not _configuracao or _configuracao == '0' else (PERFIL_PADRAO if _configuracao == '1' else _configuracao)
+ATIVO = CAMINHO_PERFIL is not None
+
+# Rastreamento da memória alocada pelo Python (tracemalloc), apenas com LATTES_PERFIL_HEAP=1
+RASTREAR_HEAP = ATIVO and os.environ.get('LATTES_PERFIL_HEAP', '').strip() not in ('', '0')
+
+# Etapas abertas no processo atual (a etapa mais interna por último)
+_pilha = []
+
+# Arquivo de saída do processo atual: [pid, arquivo], reaberto nos processos filhos
+_saida = [None, None]
+
+# Função para gravar um registro como uma linha JSON (cada processo abre o arquivo em modo de acréscimo)
+def _gravar(registro):
+    if _saida[0] != os.getpid():
+        # Nos processos filhos, o arquivo herdado do processo principal não é reutilizado
+        _saida[0] = os.getpid()
+        _saida[1] = open(CAMINHO_PERFIL, 'a', encoding='utf-8')
+    _saida[1].write(json.dumps(registro, ensure_ascii=False) + '\n')
+    _saida[1].flush()
+
+# Função para ler o pico de memória residente (RSS) do processo, em bytes (None se indisponível)
+def _pico_rss():
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            for linha in status:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss em bytes no macOS e em KB nos demais sistemas
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+# Função para reiniciar o pico de RSS do processo (Linux); nos demais sistemas o pico não pode ser reiniciado
+def _reiniciar_pico_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as arquivo:
+            arquivo.write('5')
+    except OSError:
+        pass
+
+# Função para ler o pico da memória alocada pelo Python desde o último reinício (None sem LATTES_PERFIL_HEAP)
+def _pico_memoria():
+    return tracemalloc.get_traced_memory()[1] if RASTREAR_HEAP else None
+
+# Função para acumular os picos atuais em todas as etapas abertas, antes de os picos serem reiniciados
+# (ou ao fim de uma etapa interna, cujo pico também é pico das etapas que a contêm)
+def _acumular_picos(pico_memoria, pico_rss):
+    for externa in _pilha:
+        if pico_memoria is not None:
+            externa['pico_memoria'] = max(externa['pico_memoria'] or 0, pico_memoria)
+        if pico_rss is not None:
+            externa['pico_rss'] = max(externa['pico_rss'] or 0, pico_rss)
+
+# Contexto para medir uma etapa; o dicionário devolvido aceita contagens extras (por exemplo, 'bytes')
+@contextmanager
+def _medir_etapa(nome, arquivo=None):
+    if RASTREAR_HEAP and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    # O arquivo é herdado da etapa externa quando não informado
+    if arquivo is None and _pilha:
+        arquivo = _pilha[-1]['arquivo']
+    _acumular_picos(_pico_memoria(), _pico_rss())
+    registro = {'etapa': nome, 'arquivo': arquivo, 'pid': os.getpid(), 'pico_memoria': None, 'pico_rss': None}
+    _pilha.append(registro)
+    if RASTREAR_HEAP:
+        tracemalloc.reset_peak()
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+    _reiniciar_pico_rss()
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro['segundos'] = time.perf_counter() - inicio
+        _acumular_picos(_pico_memoria(), _pico_rss())
+        if RASTREAR_HEAP:
+            # Memória alocada pela própria etapa, acima da que já estava em uso no início
+            registro['memoria_etapa'] = max(0, registro['pico_memoria'] - memoria_inicial)
+        _pilha.pop()
+        _gravar(registro)
+
+@contextmanager
+def _sem_medicao(nome, arquivo=None):
+    yield {}
+
+# Contexto para medir um trecho de código: `with etapa('analise', xml_file) as registro: ...`
+etapa = _medir_etapa if ATIVO else _sem_medicao
+
+# Decorador para medir cada chamada de uma função como a etapa '<categoria>:<módulo>.<função>'
+def medir(categoria):
+    def decorar(funcao):
+        if not ATIVO:
+            return funcao
+        # Nos scripts executados diretamente, o módulo é identificado pelo nome do arquivo
+        modulo = funcao.__module__
+        if modulo == '__main__':
+            modulo = os.path.splitext(os.path.basename(sys.argv[0]))[0] or modulo
+        nome = f"{categoria}:{modulo}.{funcao.__name__}"
+
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            # Funções que recebem o caminho do XML como primeiro argumento são atribuídas ao arquivo
+            arquivo = args[0] if args and isinstance(args[0], str) and args[0].endswith('.xml') else None
+            with _medir_etapa(nome, arquivo):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorar
+
+# Função para ler os registros de um arquivo de perfil
+def ler_perfil(caminho=None):
+    with open(caminho or CAMINHO_PERFIL or PERFIL_PADRAO, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+# Função para resumir os registros por etapa e por arquivo
+def resumir(registros, limite=10):
+    etapas = defaultdict(lambda: {'chamadas': 0, 'segundos': 0.0, 'maximo': 0.0, 'pico_memoria': 0, 'memoria_etapa': 0,
+                                  'pico_rss': 0, 'bytes': 0})
+    arquivos = defaultdict(lambda: {'segundos': 0.0, 'pico_memoria': 0, 'pico_rss': 0, 'bytes': 0, 'etapas': defaultdict(float)})
+
+    for registro in registros:
+        resumo = etapas[registro['etapa']]
+        resumo['chamadas'] += 1
+        resumo['segundos'] += registro['segundos']
+        resumo['maximo'] = max(resumo['maximo'], registro['segundos'])
+        resumo['pico_memoria'] = max(resumo['pico_memoria'], registro.get('pico_memoria') or 0)
+        resumo['memoria_etapa'] = max(resumo['memoria_etapa'], registro.get('memoria_etapa') or 0)
+        resumo['pico_rss'] = max(resumo['pico_rss'], registro.get('pico_rss') or 0)
+        resumo['bytes'] += registro.get('bytes', 0)
+
+        if registro['arquivo']:
+            por_arquivo = arquivos[registro['arquivo']]
+            por_arquivo['etapas'][registro['etapa']] += registro['segundos']
+            por_arquivo['pico_memoria'] = max(por_arquivo['pico_memoria'], registro.get('pico_memoria') or 0)
+            por_arquivo['pico_rss'] = max(por_arquivo['pico_rss'], registro.get('pico_rss') or 0)
+            por_arquivo['bytes'] += registro.get('bytes', 0)
+
+    # O tempo de um arquivo é o da sua etapa mais longa (as etapas podem estar aninhadas)
+    for por_arquivo in arquivos.values():
+        por_arquivo['segundos'] = max(por_arquivo['etapas'].values())
+
+    return {
+        'etapas': sorted(etapas.items(), key=lambda item: -item[1]['segundos'])[:limite],
+        'arquivos': sorted(arquivos.items(), key=lambda item: -item[1]['segundos'])[:limite],
+        'registros': len(registros)
+    }
+
+# Função para exibir um pico de memória em MB ('n/d' se não registrado)
+def _megabytes(pico):
+    return f"{pico / 1e6:.1f} MB" if pico else 'n/d'
+
+def exibir_resumo(resumo, saida=sys.stdout):
+    print(f"Perfil de execução: {resumo['registros']} medições", file=saida)
+    print("Etapas mais lentas (tempo total, chamadas, maior tempo, pico de RSS, pico de memória Python e alocado na "
+          "etapa com LATTES_PERFIL_HEAP=1):", file=saida)
+    for nome, dados in resumo['etapas']:
+        print(f"  {nome}: {dados['segundos']:.3f} s, {dados['chamadas']}x, máx. {dados['maximo'] * 1000:.1f} ms, "
+              f"RSS {_megabytes(dados['pico_rss'])}"
+              + (f", Python {_megabytes(dados['pico_memoria'])}, +{dados['memoria_etapa'] / 1e6:.1f} MB"
+                 if dados['pico_memoria'] else '')
+              + (f", {dados['bytes'] / 1e6:.1f} MB lidos" if dados['bytes'] else ''),
+              file=saida)
+    print("Arquivos mais lentos (etapa mais longa, pico de RSS, pico de memória Python, bytes lidos):", file=saida)
+    for caminho, dados in resumo['arquivos']:
+        etapa_lenta = max(dados['etapas'].items(), key=lambda item: item[1])[0]
+        print(f"  {caminho}: {dados['segundos'] * 1000:.1f} ms ({etapa_lenta}), RSS {_megabytes(dados['pico_rss'])}, "
+              f"Python {_megabytes(dados['pico_memoria'])}, {dados['bytes'] / 1e6:.2f} MB lidos",
+              file=saida)
+
+# Função para exibir o resumo ao final do processo principal
+def _resumir_ao_sair():
+    if _saida[1] is not None and _saida[0] == os.getpid():
+        _saida[1].close()
+    if os.path.exists(CAMINHO_PERFIL):
+        exibir_resumo(resumir(ler_perfil(CAMINHO_PERFIL)), sys.stderr)
+
+# O processo principal começa um perfil novo; os processos filhos acrescentam ao mesmo arquivo
+if ATIVO and __name__ != '__main__' and multiprocessing.parent_process() is None:
+    open(CAMINHO_PERFIL, 'w', encoding='utf-8').close()
+    atexit.register(_resumir_ao_sair)
+
+def main():
+    caminho = sys.argv[1] if len(sys.argv) > 1 else (CAMINHO_PERFIL or PERFIL_PADRAO)
+    exibir_resumo(resumir(ler_perfil(caminho)))
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,38 @@
 import os
-import xml.etree.ElementTree as ET
-
-def contar_itens(tag_name, root):
-    return len(root.findall(f".//{tag_name}"))
-
-def extract_participations(root):
+from extrator_metricas import extrair_metricas, contar_por_natureza, TAGS_COM_NATUREZA
+from armazem_metricas import carregar_metricas, exibir_estatisticas
+from analisador_xml import ErroXML
+from executor_corpus import processar_corpus
+from contagem_bytes import contar_metricas, CONTAGEM_EM_BYTES
+from perfil_execucao import medir, etapa
+
+# Tags contadas pelo relatório (todas as chamadas de contar_itens), para a contagem em bytes
+TAGS_RELATORIO = (
+    "GRADUACAO", "ESPECIALIZACAO", "MESTRADO", "DOUTORADO", "POS-DOUTORADO",
+    "AREA-DE-ATUACAO", "PREMIO-TITULO", "ARTIGO-PUBLICADO", "LIVROS-PUBLICADOS-OU-ORGANIZADOS",
+    "CAPITULO-DE-LIVRO-PUBLICADO", "APRESENTACAO-DE-TRABALHO", "PARTICIPACAO-EM-EVENTO",
+    "ORGANIZACAO-DE-EVENTO", "PATENTE", "SOFTWARE", "PROJETO-TECNICO", "TRABALHO-TECNICO",
+    "TRABALHO-ARTISTICO", "LINHA-DE-PESQUISA", "IDIOMA",
+    "DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO",
+    "DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO",
+    "DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO",
+    "ORIENTACOES-CONCLUIDAS-PARA-MESTRADO", "ORIENTACOES-CONCLUIDAS-PARA-DOUTORADO"
+)
+
+def contar_itens(tag_name, metricas):
+    return metricas['tags'][tag_name]
+
+@medir('metrica')
+def extract_participations(metricas):
     participations = {
-        'bancas de graduacao': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO", root),
-        'bancas de mestrado': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO", root),
-        'bancas de doutorado': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO", root)
+        'bancas de graduacao': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-GRADUACAO", metricas),
+        'bancas de mestrado': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-MESTRADO", metricas),
+        'bancas de doutorado': contar_itens("DADOS-BASICOS-DA-PARTICIPACAO-EM-BANCA-DE-DOUTORADO", metricas)
     }
     return participations
 
-def count_orientacoes_concluidas(root):
+@medir('metrica')
+def count_orientacoes_concluidas(metricas):
     orientacoes_concluidas = {
         'iniciacao_cientifica': 0,
         'graduacao': 0,
@@ -26,88 +46,90 @@ def count_orientacoes_concluidas(root):
     }
 
     for termo_orientacao, categoria in orientacoes_map.items():
-        orientacoes_concluidas[categoria] += len(list(root.iter(termo_orientacao)))
+        orientacoes_concluidas[categoria] += contar_itens(termo_orientacao, metricas)
 
-    for orientacao in root.iter('DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS'):
-        natureza = orientacao.attrib.get('NATUREZA', '').upper()
-        if natureza == 'INICIACAO_CIENTIFICA':
-            orientacoes_concluidas['iniciacao_cientifica'] += 1
-        elif natureza == 'TRABALHO_DE_CONCLUSAO_DE-CURSO_GRADUACAO':
-            orientacoes_concluidas['graduacao'] += 1
+    orientacoes_concluidas['iniciacao_cientifica'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'INICIACAO_CIENTIFICA', maiusculas=True)
+    orientacoes_concluidas['graduacao'] += contar_por_natureza(
+        metricas, 'DADOS-BASICOS-DE-OUTRAS-ORIENTACOES-CONCLUIDAS', 'TRABALHO_DE_CONCLUSAO_DE-CURSO_GRADUACAO', maiusculas=True)
 
     return orientacoes_concluidas
 
-def count_orientacoes_andamento(root):
+@medir('metrica')
+def count_orientacoes_andamento(metricas):
     orientacoes_andamento = {
-        'iniciacao_cientifica': 0,
-        'graduacao': 0,
-        'mestrado': 0,
-        'doutorado': 0
+        'iniciacao_cientifica': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA', 'Iniciação Científica'),
+        'graduacao': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO', 'Graduação'),
+        'mestrado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO', 'Dissertação de mestrado'),
+        'doutorado': contar_por_natureza(
+            metricas, 'DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO', 'Tese de doutorado')
     }
 
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-INICIACAO-CIENTIFICA'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Iniciação Científica':
-            orientacoes_andamento['iniciacao_cientifica'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-GRADUACAO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Graduação':
-            orientacoes_andamento['graduacao'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-MESTRADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Dissertação de mestrado':
-            orientacoes_andamento['mestrado'] += 1
-
-    for orientacao in root.iter('DADOS-BASICOS-DA-ORIENTACAO-EM-ANDAMENTO-DE-DOUTORADO'):
-        natureza = orientacao.attrib.get('NATUREZA', '')
-        if natureza == 'Tese de doutorado':
-            orientacoes_andamento['doutorado'] += 1
-
     return orientacoes_andamento
 
 def analisar_arquivo(file_path):
+    # Uma única passagem pelo arquivo preenche todas as contagens abaixo
+    try:
+        metricas = extrair_metricas(file_path)
+    except FileNotFoundError:
+        print(f"Arquivo não encontrado: {file_path}")
+        return None
+    except ErroXML:
+        print(f"Erro ao parsear o arquivo: {file_path}")
+        return None
+
+    return agrupar_contagens(metricas)
+
+# Função para montar o relatório de um arquivo com a contagem em bytes, inclusive as orientações filtradas
+# por NATUREZA
+def contar_arquivo(file_path):
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        metricas = contar_metricas(file_path, TAGS_RELATORIO, naturezas=TAGS_COM_NATUREZA)
     except FileNotFoundError:
         print(f"Arquivo não encontrado: {file_path}")
         return None
-    except ET.ParseError:
+    except ErroXML:
         print(f"Erro ao parsear o arquivo: {file_path}")
         return None
 
+    with etapa('arquivo', file_path):
+        return agrupar_contagens(metricas)
+
+# Função para montar o relatório de contagens a partir das métricas de um arquivo
+def agrupar_contagens(metricas):
     contagens = {
         "formacao_do_orientador": {
-            "graduacoes": contar_itens("GRADUACAO", root),
-            "especializacoes": contar_itens("ESPECIALIZACAO", root),
-            "mestrados": contar_itens("MESTRADO", root),
-            "doutorados": contar_itens("DOUTORADO", root),
-            "pos_doutorados": contar_itens("POS-DOUTORADO", root)
+            "graduacoes": contar_itens("GRADUACAO", metricas),
+            "especializacoes": contar_itens("ESPECIALIZACAO", metricas),
+            "mestrados": contar_itens("MESTRADO", metricas),
+            "doutorados": contar_itens("DOUTORADO", metricas),
+            "pos_doutorados": contar_itens("POS-DOUTORADO", metricas)
         },
-        "areas_de_atuacao": contar_itens("AREA-DE-ATUACAO", root),
-        "premios_titulos": contar_itens("PREMIO-TITULO", root),
-        "artigos_completos_publicados": contar_itens("ARTIGO-PUBLICADO", root),
-        "livros_publicados_ou_organizados": contar_itens("LIVROS-PUBLICADOS-OU-ORGANIZADOS", root),
-        "capitulos_livros_publicados": contar_itens("CAPITULO-DE-LIVRO-PUBLICADO", root),
-        "apresentacoes_trabalho": contar_itens("APRESENTACAO-DE-TRABALHO", root),
-        "participacao_eventos": contar_itens("PARTICIPACAO-EM-EVENTO", root),
-        "organizacao_eventos": contar_itens("ORGANIZACAO-DE-EVENTO", root),
-        "patentes": contar_itens("PATENTE", root),
-        "softwares": contar_itens("SOFTWARE", root),
-        "projetos_tecnicos": contar_itens("PROJETO-TECNICO", root),
-        "trabalhos_tecnicos": contar_itens("TRABALHO-TECNICO", root),
-        "trabalhos_artisticos": contar_itens("TRABALHO-ARTISTICO", root),
-        "linhas_de_pesquisa": contar_itens("LINHA-DE-PESQUISA", root),
-        "idiomas": contar_itens("IDIOMA", root)
+        "areas_de_atuacao": contar_itens("AREA-DE-ATUACAO", metricas),
+        "premios_titulos": contar_itens("PREMIO-TITULO", metricas),
+        "artigos_completos_publicados": contar_itens("ARTIGO-PUBLICADO", metricas),
+        "livros_publicados_ou_organizados": contar_itens("LIVROS-PUBLICADOS-OU-ORGANIZADOS", metricas),
+        "capitulos_livros_publicados": contar_itens("CAPITULO-DE-LIVRO-PUBLICADO", metricas),
+        "apresentacoes_trabalho": contar_itens("APRESENTACAO-DE-TRABALHO", metricas),
+        "participacao_eventos": contar_itens("PARTICIPACAO-EM-EVENTO", metricas),
+        "organizacao_eventos": contar_itens("ORGANIZACAO-DE-EVENTO", metricas),
+        "patentes": contar_itens("PATENTE", metricas),
+        "softwares": contar_itens("SOFTWARE", metricas),
+        "projetos_tecnicos": contar_itens("PROJETO-TECNICO", metricas),
+        "trabalhos_tecnicos": contar_itens("TRABALHO-TECNICO", metricas),
+        "trabalhos_artisticos": contar_itens("TRABALHO-ARTISTICO", metricas),
+        "linhas_de_pesquisa": contar_itens("LINHA-DE-PESQUISA", metricas),
+        "idiomas": contar_itens("IDIOMA", metricas)
     }
     
-    participacoes = extract_participations(root)
+    participacoes = extract_participations(metricas)
     contagens.update(participacoes)
 
-    orientacoes_concluidas = count_orientacoes_concluidas(root)
-    orientacoes_andamento = count_orientacoes_andamento(root)
+    orientacoes_concluidas = count_orientacoes_concluidas(metricas)
+    orientacoes_andamento = count_orientacoes_andamento(metricas)
     
     contagens.update({
         "orientacoes_concluidas": orientacoes_concluidas,
@@ -116,6 +138,7 @@ def analisar_arquivo(file_path):
 
     return contagens
 
+@medir('saida')
 def exibir_resultados(resultados):
     total_contagens = {}
     total_arquivos = len(resultados)
@@ -155,20 +178,29 @@ def exibir_resultados(resultados):
     
     print(f"\nTotal de arquivos XML analisados: {total_arquivos}")
 
-def main():
+def main(processos=None):
     folder_path = r'C:\Users\radim\Desktop\ppgmmc'
 
     resultados = {}
-    
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith(".xml"):
-            file_path = os.path.join(folder_path, file_name)
+
+    if CONTAGEM_EM_BYTES:
+        for file_path, contagens in processar_corpus(contar_arquivo, folder_path, processos):
             print(f"Analisando arquivo: {file_path}")
-            contagens = analisar_arquivo(file_path)
             if contagens:
-                resultados[file_name] = contagens
+                resultados[os.path.basename(file_path)] = contagens
+        exibir_resultados(resultados)
+        return
+    
+    # Apenas os arquivos novos ou alterados desde a última execução são extraídos novamente
+    metricas_por_arquivo, estatisticas = carregar_metricas(folder_path, processos=processos)
+    for file_path, metricas in metricas_por_arquivo.items():
+        print(f"Analisando arquivo: {file_path}")
+        if metricas:
+            with etapa('arquivo', file_path):
+                resultados[os.path.basename(file_path)] = agrupar_contagens(metricas)
 
     exibir_resultados(resultados)
+    exibir_estatisticas(estatisticas)
 
 if __name__ == "__main__":
     main()
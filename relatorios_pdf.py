@@ -0,0 +1,249 @@
+#####################################################################
+# Geração em lote de dossiês em PDF, um por orientador (currículo), com as
+# saídas de numero_eventos (participação em congressos por ano),
+# relatorio_agrupado (contagens do currículo) e, quando um currículo de
+# referência é informado, as pontuações dos seis critérios de
+# guidance_score/pontuacao_geral. Opcionalmente, todos os dossiês também
+# são reunidos em um PDF único, na ordem dos caminhos.
+#
+# Os dossiês são gerados em um pool de processos (ver executor_corpus).
+# Sem pontuações, cada tarefa extrai o seu currículo e já gera o PDF, sem
+# esperar pelo restante do corpus; com pontuações, os normalizadores do
+# corpus exigem todas as métricas antes (lidas do armazém), e os PDFs são
+# gerados em seguida a partir dos dados já prontos. O layout é o mesmo para
+# todos os documentos (LAYOUT), as métricas das fontes padrão são
+# carregadas uma vez por processo pelo FPDF, e cada seção é escrita com um
+# único `multi_cell`, em vez de uma célula por linha.
+#
+# Uso: python relatorios_pdf.py
+#####################################################################
+
+import os
+import sys
+from collections import Counter
+from fpdf import FPDF
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'guidance_score'))
+from cache_metricas import obter_metricas
+from armazem_metricas import carregar_metricas
+from executor_corpus import listar_arquivos_xml, processar_conforme_termina
+from fontes_xml import nome_curriculo, separar_caminho
+from relatorio_agrupado import agrupar_contagens
+from analisador_xml import ErroXML
+from pontuacao_geral import pontuar_metricas
+from perfil_execucao import medir
+
+# Layout comum a todos os documentos (o mesmo do relatório de numero_eventos)
+LAYOUT = {
+    'fonte': 'Arial',
+    'tamanho': 12,
+    'largura': 200,
+    'altura': 10,
+    'margem': 15
+}
+
+# Títulos das seções de contagens do relatório agrupado
+SECOES_CONTAGENS = {
+    'formacao_do_orientador': "Formação do Orientador",
+    'orientacoes_concluidas': "Orientações Concluídas",
+    'orientacoes_andamento': "Orientações em Andamento"
+}
+
+# Critérios de guidance_score, na ordem de exibição
+CRITERIOS = (
+    ('engajamento', "Engajamento"),
+    ('experiencia', "Experiência"),
+    ('producao', "Produção"),
+    ('qualidade', "Qualidade"),
+    ('reputacao', "Reputação"),
+    ('similaridade', "Similaridade")
+)
+
+# Função para montar os dados do dossiê de um orientador a partir das métricas do seu currículo
+def montar_dados(xml_file, metricas, pontuacao=None):
+    eventos_por_ano = None
+    if not metricas['eventos_sem_dados']:
+        eventos_por_ano = dict(metricas['eventos_por_ano'])
+        eventos_por_ano['Total'] = sum(metricas['eventos_por_ano'].values())
+
+    return {
+        'caminho': xml_file,
+        'nome': nome_curriculo(xml_file),
+        'identificador': metricas['identificador'],
+        'eventos_por_ano': eventos_por_ano,
+        'contagens': agrupar_contagens(metricas),
+        'pontuacao': pontuacao
+    }
+
+# Função para converter um texto para o Latin-1 das fontes padrão do FPDF (caracteres fora dele viram '?')
+def _texto(texto):
+    return str(texto).encode('latin-1', 'replace').decode('latin-1')
+
+# Função para criar um documento com o layout comum
+def novo_documento():
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=LAYOUT['margem'])
+    return pdf
+
+# Função para escrever uma seção: título em negrito e as linhas em um único bloco
+def _escrever_secao(pdf, titulo, linhas):
+    pdf.set_font(LAYOUT['fonte'], 'B', LAYOUT['tamanho'])
+    pdf.cell(LAYOUT['largura'], LAYOUT['altura'], _texto(titulo), ln=True, align="L")
+    pdf.set_font(LAYOUT['fonte'], size=LAYOUT['tamanho'])
+    if linhas:
+        pdf.multi_cell(LAYOUT['largura'], LAYOUT['altura'], _texto('\n'.join(linhas)), align="L")
+    pdf.ln(LAYOUT['altura'] / 2)
+
+# Função para escrever o dossiê de um orientador em uma nova página do documento
+def escrever_dossie(pdf, dados):
+    pdf.add_page()
+    pdf.set_font(LAYOUT['fonte'], 'B', LAYOUT['tamanho'] + 2)
+    pdf.cell(LAYOUT['largura'], LAYOUT['altura'], _texto(f"Dossiê do Orientador: {dados['nome']}"), ln=True, align="C")
+    if dados['identificador']:
+        pdf.set_font(LAYOUT['fonte'], size=LAYOUT['tamanho'])
+        pdf.cell(LAYOUT['largura'], LAYOUT['altura'], f"Identificador Lattes: {dados['identificador']}", ln=True, align="C")
+    pdf.ln(LAYOUT['altura'] / 2)
+
+    # Saída de numero_eventos
+    eventos_por_ano = dados['eventos_por_ano']
+    if eventos_por_ano is None:
+        linhas = ["Participações sem dados básicos: contagem por ano indisponível"]
+    else:
+        linhas = [f"Ano: {ano}, Quantidade de Eventos: {quantidade}"
+                  for ano, quantidade in eventos_por_ano.items() if ano != 'Total']
+        linhas.append(f"Total de Eventos: {eventos_por_ano['Total']}")
+    _escrever_secao(pdf, "Participação em Congressos por Ano", linhas)
+
+    # Saída de relatorio_agrupado
+    contagens = dados['contagens']
+    for chave, titulo in SECOES_CONTAGENS.items():
+        _escrever_secao(pdf, titulo, [f"{item}: {valor} itens" for item, valor in contagens[chave].items()])
+    _escrever_secao(pdf, "Demais Contagens", [f"{chave}: {valor} itens" for chave, valor in contagens.items()
+                                              if chave not in SECOES_CONTAGENS])
+
+    # Saída de guidance_score/pontuacao_geral
+    pontuacao = dados['pontuacao']
+    if pontuacao is not None:
+        linhas = []
+        for chave, titulo in CRITERIOS:
+            valor = pontuacao[chave]
+            if valor is None:
+                linhas.append(f"{titulo}: dados de fator de impacto indisponíveis")
+            elif chave == 'similaridade':
+                linhas.append(f"{titulo}: {valor}")
+            else:
+                linhas.append(f"{titulo}: {valor:.2f}")
+        _escrever_secao(pdf, "Pontuações por Critério", linhas)
+
+# Função para obter um nome a partir do caminho relativo à pasta: 'sub/lote.zip!cv1.xml' vira 'sub_lote_cv1'
+def _nome_relativo(caminho, pasta):
+    caminho_disco, membro = separar_caminho(caminho)
+    base = pasta if os.path.isdir(pasta) else os.path.dirname(pasta)
+    partes = os.path.relpath(caminho_disco, base).replace('\\', '/').split('/')
+    if membro is not None:
+        partes += membro.split('/')
+    return '_'.join(os.path.splitext(parte)[0] if parte.lower().endswith(('.xml', '.zip')) else parte
+                    for parte in partes if parte not in ('', '.'))
+
+# Função para obter os nomes dos PDFs dos dossiês: {caminho do XML: nome sem extensão}. O nome é o do
+# currículo; currículos com o mesmo nome (em subpastas ou em ZIPs diferentes) usam o caminho relativo à
+# pasta, e um número é acrescentado se ainda houver repetição (sem diferenciar maiúsculas, como no Windows)
+def nomes_dossies(caminhos, pasta):
+    nomes = {caminho: os.path.splitext(nome_curriculo(caminho))[0] for caminho in caminhos}
+    repeticoes = Counter(nome.lower() for nome in nomes.values())
+    for caminho, nome in nomes.items():
+        if repeticoes[nome.lower()] > 1:
+            nomes[caminho] = _nome_relativo(caminho, pasta)
+
+    usados = set()
+    for caminho in sorted(nomes):
+        nome, numero = nomes[caminho], 1
+        while nomes[caminho].lower() in usados:
+            numero += 1
+            nomes[caminho] = f"{nome}_{numero}"
+        usados.add(nomes[caminho].lower())
+    return nomes
+
+# Função para gravar o PDF do dossiê de um orientador
+@medir('saida')
+def gravar_dossie(dados, caminho_pdf):
+    pdf = novo_documento()
+    escrever_dossie(pdf, dados)
+    pdf.output(caminho_pdf)
+
+# Tarefa de um processo: (caminho do XML, caminho do PDF, dados ou None). Com os dados já prontos,
+# apenas gera o PDF; sem eles (sem pontuações), extrai o currículo e gera o PDF em seguida
+def _tarefa_dossie(tarefa):
+    xml_file, caminho_pdf, dados = tarefa
+    if dados is not None:
+        gravar_dossie(dados, caminho_pdf)
+        return dados
+
+    try:
+        metricas = obter_metricas(xml_file)
+    except (ErroXML, FileNotFoundError) as e:
+        print(f"Erro ao analisar o arquivo XML: {xml_file}, erro: {e}")
+        return None
+    dados = montar_dados(xml_file, metricas)
+    gravar_dossie(dados, caminho_pdf)
+    return dados
+
+# Função para gerar os dossiês de todos os currículos de uma pasta; com `caminho_combinado`, também o PDF único.
+# Retorna a quantidade de dossiês gerados.
+def gerar_dossies(pasta, destino='dossies', reference_xml=None, caminho_combinado=None,
+                  processos=None, recursivo=False):
+    os.makedirs(destino, exist_ok=True)
+
+    if reference_xml is None:
+        arquivos = listar_arquivos_xml(pasta, recursivo)
+        nomes = nomes_dossies([xml_file for xml_file, _ in arquivos], pasta)
+        tarefas = [((xml_file, os.path.join(destino, nomes[xml_file] + '.pdf'), None), tamanho)
+                   for xml_file, tamanho in arquivos]
+    else:
+        # Os normalizadores dos critérios dependem do corpus inteiro
+        metricas_por_arquivo, _ = carregar_metricas(pasta, processos=processos, recursivo=recursivo)
+        pontuacoes = {resultado['caminho']: resultado for resultado in pontuar_metricas(metricas_por_arquivo, reference_xml)}
+        nomes = nomes_dossies(list(metricas_por_arquivo), pasta)
+        tarefas = [((xml_file, os.path.join(destino, nomes[xml_file] + '.pdf'),
+                     montar_dados(xml_file, metricas, pontuacoes.get(xml_file))), 0)
+                   for xml_file, metricas in metricas_por_arquivo.items() if metricas is not None]
+
+    # O PDF único é escrito no processo atual, na ordem dos caminhos, enquanto os processos geram os demais
+    combinado = novo_documento() if caminho_combinado else None
+    ordem = sorted(item[0] for item, _ in tarefas)
+    prontos = {}
+    proximo = 0
+    gerados = 0
+
+    for item, dados in processar_conforme_termina(_tarefa_dossie, tarefas, processos):
+        if dados is not None:
+            gerados += 1
+        if combinado is None:
+            continue
+        # Os dossiês que chegam fora de ordem aguardam os anteriores (os que falharam são pulados)
+        prontos[item[0]] = dados
+        while proximo < len(ordem) and ordem[proximo] in prontos:
+            dados_proximo = prontos.pop(ordem[proximo])
+            if dados_proximo is not None:
+                escrever_dossie(combinado, dados_proximo)
+            proximo += 1
+
+    if combinado is not None:
+        combinado.output(caminho_combinado)
+    return gerados
+
+def main(processos=None):
+    folder_path = r'C:\Users\radim\Desktop\ppgmmc'
+    reference_xml = r'C:\Users\radim\Desktop\Miriam Ines Marchi.xml'
+    destino = 'dossies'
+    caminho_combinado = 'dossies_orientadores.pdf'
+
+    gerados = gerar_dossies(folder_path, destino, reference_xml, caminho_combinado, processos)
+    if gerados:
+        print(f"{gerados} dossiês gerados em {destino}")
+        print(f"PDF único {caminho_combinado} gerado com sucesso.")
+    else:
+        print("Nenhum arquivo XML encontrado no diretório.")
+
+if __name__ == "__main__":
+    main()
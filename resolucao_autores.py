@@ -0,0 +1,272 @@
+#####################################################################
+# Resolução dos nomes de autores dos artigos publicados. O mesmo coautor
+# aparece como "SILVA, J.", "João Silva" ou "JOAO DA SILVA"; contar os
+# nomes como texto infla a quantidade de coautores (reputação). Cada
+# menção (NOME-COMPLETO-DO-AUTOR, NOME-PARA-CITACAO, NRO-ID-CNPQ) vira uma
+# forma normalizada sem acentos, "SOBRENOME|PRENOMES" (sem partículas como
+# DA/DE/DOS e sem JUNIOR/FILHO/NETO), escolhendo o mais completo entre o
+# nome e o nome para citação.
+#
+# As formas são agrupadas em blocos (sobrenome + inicial do primeiro
+# prenome) e comparadas apenas dentro do bloco, nunca todos os pares:
+#   - menções com NRO-ID-CNPQ (16 dígitos) pertencem à pessoa do identificador, e dois
+#     identificadores diferentes nunca são unidos;
+#   - as demais formas, da mais completa para a menos completa, juntam-se
+#     à única pessoa compatível do bloco (mesmos prenomes, ou iniciais dos
+#     prenomes); com mais de uma pessoa compatível, a forma é ambígua e
+#     fica separada.
+#
+# A resolução do corpus é guardada no armazém (tabela autores_resolvidos)
+# por bloco, com uma assinatura das formas do bloco: na execução seguinte,
+# apenas os blocos com formas novas ou removidas são resolvidos de novo.
+# A resolução devolvida por `resolver_corpus` é passada explicitamente a
+# quem conta os coautores (sem estado no módulo, que poderia ser trocado por
+# outra thread). Fora do corpus resolvido (um currículo avulso), os
+# coautores são resolvidos no contexto do próprio currículo.
+#####################################################################
+
+import re
+import hashlib
+import unicodedata
+from functools import lru_cache
+from collections import defaultdict
+
+from armazem_metricas import abrir_armazem
+from perfil_execucao import medir
+
+# Partículas descartadas dos nomes (as de uma letra apenas fora da parte de iniciais das citações)
+PARTICULAS = {'DA', 'DE', 'DO', 'DAS', 'DOS', 'DI', 'DEL', 'DELLA', 'DU', 'VAN', 'VON', 'DER', 'DEN', 'LA', 'LE'}
+PARTICULAS_CURTAS = {'E', 'D', 'Y'}
+
+# Sufixos de parentesco, que não distinguem pessoas nas citações
+SUFIXOS = {'JUNIOR', 'JR', 'FILHO', 'NETO', 'SOBRINHO'}
+
+# NRO-ID-CNPQ válido: o identificador Lattes de 16 dígitos (outros valores são ignorados)
+IDENTIFICADOR_VALIDO = re.compile(r'\d{16}')
+
+# Função para remover acentos e pontuação, em maiúsculas (a vírgula das citações é mantida)
+def _limpar(texto):
+    texto = ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+    return re.sub(r'[^A-Z,]+', ' ', texto.upper())
+
+# Função para normalizar um nome completo ou para citação como "SOBRENOME|PRENOMES" (None sem nome)
+@lru_cache(maxsize=1 << 20)
+def normalizar_nome(texto):
+    # NOME-PARA-CITACAO pode trazer variações separadas por ';': vale a primeira
+    texto = _limpar(texto.split(';')[0]) if texto and texto != 'N/A' else ''
+    if ',' in texto:
+        sobrenomes, prenomes = texto.split(',', 1)
+        prenomes = [token for token in prenomes.replace(',', ' ').split() if token not in PARTICULAS]
+        sobrenomes = [token for token in sobrenomes.split() if token not in PARTICULAS and token not in PARTICULAS_CURTAS]
+    else:
+        tokens = [token for token in texto.split() if token not in PARTICULAS and token not in PARTICULAS_CURTAS]
+        sobrenomes, prenomes = tokens[-1:], tokens[:-1]
+    sobrenomes = [token for token in sobrenomes if token not in SUFIXOS]
+    if not sobrenomes:
+        # Um nome só com sufixo ("... JUNIOR") usa o último prenome como sobrenome
+        if not prenomes:
+            return None
+        sobrenomes = [prenomes.pop()]
+    prenomes = [token for token in prenomes if token not in SUFIXOS]
+    return sobrenomes[-1] + '|' + ' '.join(prenomes)
+
+# Função para medir o quanto uma forma é completa: (prenomes por extenso, prenomes)
+def _completude(forma):
+    prenomes = forma.split('|')[1].split()
+    return (sum(len(prenome) > 1 for prenome in prenomes), len(prenomes))
+
+# Função para obter a forma de uma menção: a mais completa entre o nome completo e o nome para citação
+@lru_cache(maxsize=1 << 20)
+def forma_mencao(nome, citacao=''):
+    formas = [forma for forma in (normalizar_nome(nome), normalizar_nome(citacao)) if forma]
+    return max(formas, key=_completude) if formas else None
+
+# Função para obter o bloco de uma forma: sobrenome e inicial do primeiro prenome
+def bloco(forma):
+    sobrenome, prenomes = forma.split('|')
+    return sobrenome + '|' + prenomes[:1]
+
+# Função para verificar se dois prenomes são compatíveis (iguais, ou um deles é a inicial do outro)
+def _prenome_compativel(a, b):
+    return a == b or (len(a) == 1 and b[0] == a) or (len(b) == 1 and a[0] == b)
+
+# Função para verificar se duas formas do mesmo bloco podem ser a mesma pessoa: o primeiro prenome
+# compatível e os demais prenomes da forma mais curta presentes, na ordem, na mais longa
+def compativeis(forma_a, forma_b):
+    a = forma_a.split('|')[1].split()
+    b = forma_b.split('|')[1].split()
+    if not a or not b:
+        return a == b
+    if not _prenome_compativel(a[0], b[0]):
+        return False
+    curta, longa = (a, b) if len(a) <= len(b) else (b, a)
+    restantes = iter(longa[1:])
+    return all(any(_prenome_compativel(prenome, outro) for outro in restantes) for prenome in curta[1:])
+
+# Função para obter a entrada (forma, NRO-ID-CNPQ) de um autor (None sem nome nem identificador)
+def entrada_mencao(nome, citacao='', id_cnpq=''):
+    forma = forma_mencao(nome, citacao)
+    id_cnpq = id_cnpq.strip() if IDENTIFICADOR_VALIDO.fullmatch(id_cnpq.strip()) else ''
+    if forma is None and not id_cnpq:
+        return None
+    return forma or '|', id_cnpq
+
+# Função para listar (nome, entrada) dos autores de um artigo, sem os autores sem nome nem identificador
+def autores_artigo(artigo):
+    citacoes = artigo.get('citacoes') or [''] * len(artigo['autores'])
+    ids_cnpq = artigo.get('ids_cnpq') or [''] * len(artigo['autores'])
+    for nome, citacao, id_cnpq in zip(artigo['autores'], citacoes, ids_cnpq):
+        entrada = entrada_mencao(nome, citacao, id_cnpq)
+        if entrada is not None:
+            yield nome, entrada
+
+# Função para listar as menções (forma, NRO-ID-CNPQ) dos autores de cada artigo de um currículo
+def mencoes(metricas):
+    for artigo in metricas['artigos']:
+        for _, entrada in autores_artigo(artigo):
+            yield entrada
+
+# Função para obter o primeiro prenome de uma forma ('' sem prenomes)
+def _primeiro_prenome(forma):
+    prenomes = forma.split('|')[1].split()
+    return prenomes[0] if prenomes else ''
+
+# Função para resolver as entradas (forma, NRO-ID-CNPQ) de um mesmo bloco: {entrada: chave}
+def _resolver_bloco(entradas):
+    chaves = {}
+    pessoas = []                      # [chave, forma mais completa], na ordem em que surgem
+    por_prenome = defaultdict(list)   # Primeiro prenome -> pessoas, para não comparar com o bloco inteiro
+    por_identificador = {}
+    identificadores_da_forma = defaultdict(set)
+
+    def nova_pessoa(chave, forma):
+        pessoa = [chave, forma]
+        pessoas.append(pessoa)
+        por_prenome[_primeiro_prenome(forma)].append(pessoa)
+        return pessoa
+
+    ordenadas = sorted(entradas, key=lambda entrada: (_completude(entrada[0]), entrada), reverse=True)
+
+    # Cada identificador é uma pessoa, representada pela sua forma mais completa
+    for forma, id_cnpq in ordenadas:
+        if not id_cnpq:
+            continue
+        chaves[(forma, id_cnpq)] = 'id:' + id_cnpq
+        identificadores_da_forma[forma].add(id_cnpq)
+        if id_cnpq not in por_identificador:
+            por_identificador[id_cnpq] = nova_pessoa('id:' + id_cnpq, forma)
+
+    # As formas sem identificador, da mais completa para a menos completa
+    for forma, id_cnpq in ordenadas:
+        if id_cnpq:
+            continue
+        identificadores = identificadores_da_forma.get(forma, ())
+        if len(identificadores) == 1:
+            chaves[(forma, id_cnpq)] = 'id:' + next(iter(identificadores))
+            continue
+        encontradas = []
+        if not identificadores:
+            # Um prenome por extenso só é compatível com o mesmo prenome ou com a sua inicial
+            prenome = _primeiro_prenome(forma)
+            candidatas = pessoas if len(prenome) <= 1 else por_prenome[prenome] + por_prenome[prenome[0]]
+            for pessoa in candidatas:
+                if compativeis(forma, pessoa[1]):
+                    encontradas.append(pessoa)
+                    if len(encontradas) > 1:
+                        break
+        if len(encontradas) == 1:
+            chaves[(forma, id_cnpq)] = encontradas[0][0]
+        else:
+            # Sem pessoa compatível, ou ambígua: a forma é uma pessoa à parte
+            chaves[(forma, id_cnpq)] = forma
+            nova_pessoa(forma, forma)
+    return chaves
+
+# Função para agrupar entradas (forma, NRO-ID-CNPQ) por bloco
+def agrupar_blocos(entradas):
+    blocos = defaultdict(set)
+    for entrada in entradas:
+        blocos[bloco(entrada[0])].add(entrada)
+    return blocos
+
+# Função para resolver um conjunto de entradas (forma, NRO-ID-CNPQ), bloco a bloco: {entrada: chave}
+def resolver(entradas):
+    chaves = {}
+    for entradas_bloco in agrupar_blocos(entradas).values():
+        chaves.update(_resolver_bloco(entradas_bloco))
+    return chaves
+
+# Função para calcular a assinatura das entradas de um bloco
+def _assinatura(entradas):
+    resumo = hashlib.blake2b(digest_size=16)
+    for forma, id_cnpq in sorted(entradas):
+        resumo.update(f"{forma}\t{id_cnpq}\n".encode('utf-8'))
+    return resumo.hexdigest()
+
+# Função para resolver os autores de todo o corpus ({caminho: métricas}), reaproveitando do armazém os blocos
+# que não mudaram desde a execução anterior; 'chaves' ({(forma, NRO-ID-CNPQ): chave}) é a resolução a passar
+# para `coautores_resolvidos`
+@medir('metrica')
+def resolver_corpus(metricas_por_arquivo, caminho_armazem=None):
+    entradas = set()
+    for metricas in metricas_por_arquivo.values():
+        if metricas is not None:
+            entradas.update(mencoes(metricas))
+    blocos = agrupar_blocos(entradas)
+
+    conexao = abrir_armazem(caminho_armazem)
+    conexao.execute('''
+        CREATE TABLE IF NOT EXISTS autores_resolvidos (
+            bloco TEXT NOT NULL,
+            assinatura TEXT NOT NULL,
+            forma TEXT NOT NULL,
+            id_cnpq TEXT NOT NULL,
+            chave TEXT NOT NULL
+        )''')
+    conexao.execute('CREATE INDEX IF NOT EXISTS idx_autores_bloco ON autores_resolvidos (bloco)')
+    assinaturas_armazenadas = dict(conexao.execute('SELECT DISTINCT bloco, assinatura FROM autores_resolvidos'))
+
+    chaves = {}
+    pendentes = {}
+    for nome_bloco, entradas_bloco in blocos.items():
+        assinatura = _assinatura(entradas_bloco)
+        if assinaturas_armazenadas.get(nome_bloco) == assinatura:
+            continue
+        pendentes[nome_bloco] = (assinatura, _resolver_bloco(entradas_bloco))
+
+    for forma, id_cnpq, chave in conexao.execute('SELECT forma, id_cnpq, chave FROM autores_resolvidos'):
+        chaves[(forma, id_cnpq)] = chave
+
+    with conexao:
+        # Blocos alterados são substituídos; blocos que deixaram o corpus são removidos
+        removidos = [(nome_bloco,) for nome_bloco in assinaturas_armazenadas
+                     if nome_bloco in pendentes or nome_bloco not in blocos]
+        conexao.executemany('DELETE FROM autores_resolvidos WHERE bloco = ?', removidos)
+        for nome_bloco, (assinatura, chaves_bloco) in pendentes.items():
+            conexao.executemany(
+                'INSERT INTO autores_resolvidos (bloco, assinatura, forma, id_cnpq, chave) VALUES (?, ?, ?, ?, ?)',
+                [(nome_bloco, assinatura, forma, id_cnpq, chave) for (forma, id_cnpq), chave in chaves_bloco.items()])
+            chaves.update(chaves_bloco)
+    conexao.close()
+
+    # Apenas as entradas do corpus atual (as lidas do armazém podem incluir blocos removidos)
+    resolucao = {entrada: chaves[entrada] for entrada in entradas}
+
+    return {
+        'chaves': resolucao,
+        'mencoes': len(entradas),
+        'pessoas': len(set(resolucao.values())),
+        'blocos': len(blocos),
+        'blocos_resolvidos': len(pendentes),
+        # Blocos cujas chaves podem ter mudado desde a execução anterior
+        'blocos_alterados': set(pendentes) | {nome_bloco for nome_bloco in assinaturas_armazenadas if nome_bloco not in blocos}
+    }
+
+# Função para obter o conjunto de coautores (chaves resolvidas) dos artigos de um currículo, com a resolução
+# do corpus (as 'chaves' de `resolver_corpus`); sem ela, ou com menções fora dela, as menções são resolvidas
+# no contexto do próprio currículo
+def coautores_resolvidos(metricas, chaves=None):
+    entradas = set(mencoes(metricas))
+    if chaves is not None and all(entrada in chaves for entrada in entradas):
+        return {chaves[entrada] for entrada in entradas}
+    return set(resolver(entradas).values())
@@ -0,0 +1,86 @@
+#####################################################################
+# Tabela de códigos das áreas do conhecimento. Os nomes (grande área, área,
+# sub-área e especialidade) são internados e recebem um código inteiro
+# pequeno; cada combinação distinta dos quatro nomes é um registro guardado
+# em quatro colunas `array` e identificado também por um código inteiro. As
+# áreas de um currículo passam a ser um `array` de códigos de registro, e as
+# comparações de similaridade são feitas entre inteiros.
+#
+# Os códigos valem apenas no processo que os criou: as métricas extraídas
+# (e o armazém) guardam os nomes, e a codificação é feita no processo que
+# consome as métricas.
+#####################################################################
+
+import sys
+from array import array
+
+# Campos de cada registro de área, na ordem da hierarquia
+CAMPOS = ('grande_area', 'area', 'sub_area', 'especialidade')
+
+# Nomes internados; o código 0 representa o atributo ausente (None)
+_nomes = [None]
+_codigos_nomes = {None: 0}
+
+# Registros de área: uma coluna por campo, indexada pelo código do registro
+_colunas = tuple(array('I') for _ in CAMPOS)
+_codigos_areas = {}
+_prefixos = []
+
+# Função para obter o código de um nome, internando-o na primeira ocorrência
+def codificar_nome(nome):
+    codigo = _codigos_nomes.get(nome)
+    if codigo is None:
+        codigo = len(_nomes)
+        _nomes.append(sys.intern(nome))
+        _codigos_nomes[_nomes[codigo]] = codigo
+    return codigo
+
+# Função para obter o nome de um código
+def nome(codigo):
+    return _nomes[codigo]
+
+# Função para obter o código de registro de uma área (tupla de quatro nomes)
+def codificar_area(area):
+    codigo = _codigos_areas.get(area)
+    if codigo is None:
+        campos = tuple(codificar_nome(valor) for valor in area)
+        codigo = len(_prefixos)
+        for coluna, valor in zip(_colunas, campos):
+            coluna.append(valor)
+        _prefixos.append(tuple(campos[:nivel] for nivel in range(1, 5)))
+        _codigos_areas[area] = codigo
+    return codigo
+
+# Função para codificar uma lista de áreas em um array de códigos de registro
+def codificar_areas(areas):
+    return array('I', [codificar_area(area) for area in areas])
+
+# Função para obter os códigos dos quatro campos de um registro
+def campos(codigo):
+    return tuple(coluna[codigo] for coluna in _colunas)
+
+# Função para obter os prefixos (1 a 4 níveis, em códigos) de um registro
+def prefixos(codigo):
+    return _prefixos[codigo]
+
+# Função para obter os nomes de um registro como dicionário (para exibição e JSON)
+def descrever_area(codigo):
+    return {campo: _nomes[coluna[codigo]] for campo, coluna in zip(CAMPOS, _colunas)}
+
+# Função para pontuar duas áreas pela hierarquia em comum (1, 2, 3 e 5 pontos por nível)
+def comparar_areas(codigo1, codigo2):
+    if codigo1 == codigo2:
+        return 11
+    grande_area, area, sub_area, _ = _colunas
+    score = 0
+    if grande_area[codigo1] == grande_area[codigo2]:
+        score += 1
+        if area[codigo1] == area[codigo2]:
+            score += 2
+            if sub_area[codigo1] == sub_area[codigo2]:
+                score += 3
+    return score
+
+# Função para informar o tamanho da tabela (nomes distintos e registros distintos)
+def tamanho():
+    return len(_nomes) - 1, len(_prefixos)